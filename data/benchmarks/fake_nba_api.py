@@ -0,0 +1,26 @@
+import json
+from threading import Lock
+
+
+class FakeNbaApi:
+
+    # Takes the place of CachedClient's ResponseCache so that every NBA stats API request is answered from a
+    # synthetic league without a network round trip, the responses still go through JSON and nba_data's deserializers
+    def __init__(self, league):
+        self.league = league
+        self.handlers = {
+            'players_for_season': league.get_players_for_season,
+            'player_info': league.get_player_info,
+            'games_for_season': league.get_games_for_season,
+            'games_for_date': league.get_games_for_date,
+            'traditional_box_score': league.get_traditional_box_score,
+        }
+        self.request_counts = {}
+        self.lock = Lock()
+
+    def get_or_fetch(self, endpoint, arguments, fetch, timeout=-1):
+        uri, parameters = arguments
+        with self.lock:
+            self.request_counts[endpoint] = self.request_counts.get(endpoint, 0) + 1
+
+        return json.loads(json.dumps(self.handlers[endpoint](dict(parameters))))
\ No newline at end of file
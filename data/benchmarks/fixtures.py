@@ -0,0 +1,60 @@
+from data.benchmarks.fake_nba_api import FakeNbaApi
+from data.fetchers.cached_client import CachedClient
+from data.inserters.box_score_inserter import BoxScoreInserter
+from data.inserters.daily_fantasy_sports_site_inserter import DailyFantasySportsSiteInserter
+from data.inserters.game_inserter import GameInserter
+from data.inserters.player_inserter import PlayerInserter
+from data.inserters.player_name_alias_inserter import PlayerNameAliasInserter
+from data.inserters.position_inserter import PositionInserter
+from data.inserters.season_inserter import SeasonInserter
+from data.inserters.team_inserter import TeamInserter
+from data.reference_data import reference_data_caches
+from data.translators.team_abbreviations import team_abbreviations
+
+
+# Shared by the benchmark command and the tests, which both load a synthetic league through the inserters
+
+
+def use_synthetic_league(league):
+    # Every NBA stats API request is answered from the league until CachedClient.cache is put back
+    fake_nba_api = FakeNbaApi(league=league)
+    CachedClient.cache = fake_nba_api
+    return fake_nba_api
+
+
+def clear_caches():
+    # The process wide reference data would otherwise still hold rows of the database that was swapped out
+    for cache in reference_data_caches.values():
+        cache.clear()
+
+    team_abbreviations.clear()
+
+
+def insert_reference_data():
+    PositionInserter.insert_positions()
+    SeasonInserter.insert_seasons()
+    TeamInserter.insert_teams()
+    DailyFantasySportsSiteInserter.insert_daily_fantasy_sports_sites()
+    PlayerNameAliasInserter.insert_player_name_aliases()
+
+
+def insert_players(league, fetcher=None):
+    for season in league.seasons:
+        PlayerInserter.insert_players_for_season(season=season, fetcher=fetcher)
+
+
+def insert_games(league):
+    for season in league.seasons:
+        GameInserter.insert_games_for_season(season=season)
+
+
+def insert_box_scores(fetcher=None):
+    BoxScoreInserter.insert_traditional_box_scores(fetcher=fetcher)
+
+
+def insert_league(league, fetcher=None):
+    # The league must be in use, see use_synthetic_league
+    insert_reference_data()
+    insert_players(league=league, fetcher=fetcher)
+    insert_games(league=league)
+    insert_box_scores(fetcher=fetcher)
\ No newline at end of file
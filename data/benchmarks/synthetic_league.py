@@ -0,0 +1,227 @@
+import csv
+import os
+import random
+from datetime import date, datetime, timedelta
+
+from nba_data.data.season import Season
+from nba_data.data.team import Team, team_abbreviation_to_name_map
+
+from data.inserters.team_inserter import TeamInserter
+
+FIRST_NAMES = ('Aaron', 'Brandon', 'Chris', 'Darius', 'Eric', 'Frank', 'Gordon', 'Harrison', 'Isaiah', 'Jamal', 'Kyle', 'Lance',
+               'Marcus', 'Nick', 'Otto', 'Paul', 'Quincy', 'Rajon', 'Shane', 'Tyson', 'Victor', 'Wesley')
+LAST_NAMES = ('Allen', 'Bennett', 'Carter', 'Dawson', 'Ellis', 'Fisher', 'Green', 'Harris', 'Irving', 'Johnson', 'Knight',
+              'Lopez', 'Morris', 'Nelson', 'Owens', 'Parker', 'Rivers', 'Smith', 'Turner', 'Walker', 'Young')
+POSITION_NAMES = ('Guard', 'Guard', 'Forward', 'Forward', 'Center', 'Guard-Forward', 'Forward-Center')
+
+
+class SyntheticLeague:
+
+    # A deterministic league of every NBA team over the most recent seasons with a full round robin schedule,
+    # answering the NBA stats API endpoints the inserters use and writing salary files for its game days
+    def __init__(self, season_count=2, players_per_team=15, games_per_team=82, seed=0):
+        self.seed = seed
+        self.seasons = sorted(Season, key=lambda season: season.value, reverse=True)[:season_count]
+        nba_abbreviations = {team: abbreviation for abbreviation, team in team_abbreviation_to_name_map.items()}
+        self.teams = [(team, Team.get_id(team=team), nba_abbreviations[team]) for team in Team]
+        self.players = {}
+        self.games = {}
+        for season in self.seasons:
+            self.players[season] = SyntheticLeague.create_players(teams=self.teams, players_per_team=players_per_team)
+            self.games[season] = SyntheticLeague.create_games(season=season, team_count=len(self.teams), games_per_team=games_per_team)
+
+        self.players_by_id = {player['nba_id']: player for players in self.players.values() for player in players}
+        self.games_by_id = {game['nba_id']: (season, game) for season, games in self.games.items() for game in games}
+
+    @staticmethod
+    def create_players(teams, players_per_team):
+        # Rosters, names and NBA ids stay the same between seasons, like players who stay with their team
+        players = []
+        for team_index, (team, team_id, abbreviation) in enumerate(teams):
+            for slot in range(players_per_team):
+                number = team_index * players_per_team + slot
+                players.append({
+                    'nba_id': 200000 + number,
+                    'name': '{0} {1}'.format(FIRST_NAMES[number % len(FIRST_NAMES)], LAST_NAMES[(number // len(FIRST_NAMES)) % len(LAST_NAMES)]),
+                    'team_index': team_index,
+                    'jersey_number': slot,
+                    'position_name': POSITION_NAMES[slot % len(POSITION_NAMES)],
+                })
+
+        return players
+
+    @staticmethod
+    def create_games(season, team_count, games_per_team):
+        # Circle method round robin, every team plays once per round and a round is played every other day
+        start_year = int(season.value[:4])
+        start_date = date(start_year, 10, 27)
+        rotation = list(range(team_count))
+        games = []
+        for round_index in range(games_per_team):
+            for pair_index in range(team_count // 2):
+                first, second = rotation[pair_index], rotation[team_count - 1 - pair_index]
+                home, away = (first, second) if (round_index + pair_index) % 2 == 0 else (second, first)
+                games.append({
+                    'nba_id': '002{0:02d}{1:05d}'.format(start_year % 100, len(games) + 1),
+                    'date': start_date + timedelta(days=2 * round_index),
+                    'home_team_index': home,
+                    'away_team_index': away,
+                })
+
+            rotation = [rotation[0], rotation[-1]] + rotation[1:-1]
+
+        return games
+
+    def get_game_days(self, season, day_count=None):
+        days = sorted(set(game['date'] for game in self.games[season]))
+        return days if day_count is None else days[:day_count]
+
+    def get_roster(self, season, team_index):
+        return [player for player in self.players[season] if player['team_index'] == team_index]
+
+    def get_players_for_season(self, parameters):
+        season = Season.get_season(parameters['Season'])
+        rows = []
+        for player in self.players[season]:
+            first_name, last_name = player['name'].split(' ')
+            rows.append([player['nba_id'], '{0}, {1}'.format(last_name, first_name), player['name'], 1, season.value[:4], season.value[:4],
+                         player['name'].lower().replace(' ', '_'), self.teams[player['team_index']][1]])
+
+        return {'parameters': parameters, 'resultSets': [{'name': 'CommonAllPlayers', 'rowSet': rows}]}
+
+    def get_player_info(self, parameters):
+        player = self.players_by_id[parameters['PlayerId']]
+        first_name, last_name = player['name'].split(' ')
+        row = [player['nba_id'], first_name, last_name, player['name'], '', '', '1990-01-01T00:00:00', '', 'USA', '',
+               '6-{0}'.format(player['jersey_number'] % 12), str(180 + player['jersey_number'] * 3), 5, str(player['jersey_number']),
+               player['position_name'], 'Active', self.teams[player['team_index']][1]]
+        return {'parameters': parameters, 'resultSets': [{'name': 'CommonPlayerInfo', 'rowSet': [row]}]}
+
+    def get_games_for_season(self, parameters):
+        season = Season.get_season(parameters['Season'])
+        headers = ['SEASON_ID', 'TEAM_ID', 'TEAM_ABBREVIATION', 'TEAM_NAME', 'GAME_ID', 'GAME_DATE', 'MATCHUP', 'WL']
+        rows = []
+        for game in self.games[season]:
+            home_team, home_team_id, home_abbreviation = self.teams[game['home_team_index']]
+            away_team, away_team_id, away_abbreviation = self.teams[game['away_team_index']]
+            home_team_outcome = 'W' if random.Random(game['nba_id']).random() < 0.5 else 'L'
+            rows.append(['2' + season.value[:4], home_team_id, home_abbreviation, home_team.value, game['nba_id'], game['date'].isoformat(),
+                         '{0} vs. {1}'.format(home_abbreviation, away_abbreviation), home_team_outcome])
+            rows.append(['2' + season.value[:4], away_team_id, away_abbreviation, away_team.value, game['nba_id'], game['date'].isoformat(),
+                         '{0} @ {1}'.format(away_abbreviation, home_abbreviation), 'L' if home_team_outcome == 'W' else 'W'])
+
+        return {'parameters': parameters, 'resultSets': [{'name': 'LeagueGameLog', 'headers': headers, 'rowSet': rows}]}
+
+    def get_games_for_date(self, parameters):
+        game_date = datetime.strptime(parameters['GameDate'], '%m/%d/%Y').date()
+        game_header_headers = ['GAME_DATE_EST', 'GAME_ID', 'HOME_TEAM_ID', 'VISITOR_TEAM_ID', 'SEASON']
+        line_score_headers = ['GAME_ID', 'TEAM_ID', 'TEAM_ABBREVIATION']
+        game_header_rows = []
+        line_score_rows = []
+        for season, games in self.games.items():
+            for game in games:
+                if game['date'] != game_date:
+                    continue
+
+                home_team, home_team_id, home_abbreviation = self.teams[game['home_team_index']]
+                away_team, away_team_id, away_abbreviation = self.teams[game['away_team_index']]
+                game_header_rows.append(['{0}T00:00:00'.format(game_date.isoformat()), game['nba_id'], home_team_id, away_team_id, season.value[:4]])
+                line_score_rows.append([game['nba_id'], away_team_id, away_abbreviation])
+                line_score_rows.append([game['nba_id'], home_team_id, home_abbreviation])
+
+        return {'parameters': parameters, 'resultSets': [{'name': 'GameHeader', 'headers': game_header_headers, 'rowSet': game_header_rows},
+                                                         {'name': 'LineScore', 'headers': line_score_headers, 'rowSet': line_score_rows}]}
+
+    def get_traditional_box_score(self, parameters):
+        season, game = self.games_by_id[parameters['GameId']]
+        generator = random.Random('{0}-{1}'.format(self.seed, game['nba_id']))
+        player_rows = []
+        team_rows = []
+        for team_index in (game['away_team_index'], game['home_team_index']):
+            team, team_id, abbreviation = self.teams[team_index]
+            team_totals = [0] * 9
+            for player in self.get_roster(season=season, team_index=team_index):
+                seconds = generator.randint(0, 40 * 60)
+                statistics = SyntheticLeague.create_statistics(generator=generator, seconds=seconds)
+                team_totals = [total + value for total, value in zip(team_totals, statistics[:9])]
+                field_goals, field_goal_attempts, three_point_field_goals, three_point_field_goal_attempts, free_throws, free_throw_attempts, offensive_rebounds, defensive_rebounds, assists, steals, blocks, turnovers, fouls = statistics
+                player_rows.append([game['nba_id'], team_id, abbreviation, team.value, player['nba_id'], player['name'], '', '',
+                                    '{0}:{1:02d}'.format(seconds // 60, seconds % 60),
+                                    field_goals, field_goal_attempts, None, three_point_field_goals, three_point_field_goal_attempts, None,
+                                    free_throws, free_throw_attempts, None, offensive_rebounds, defensive_rebounds, offensive_rebounds + defensive_rebounds,
+                                    assists, steals, blocks, turnovers, fouls,
+                                    2 * field_goals + three_point_field_goals + free_throws, generator.randint(-20, 20)])
+
+            team_rows.append([game['nba_id'], team_id, team.value, abbreviation, team.value, '240:00'] +
+                             team_totals[0:2] + [None] + team_totals[2:4] + [None] + team_totals[4:6] + [None] +
+                             team_totals[6:8] + [team_totals[6] + team_totals[7], team_totals[8], 0, 0, 0, 0, 0, 0])
+
+        return {'parameters': {'GameID': game['nba_id']},
+                'resultSets': [{'name': 'PlayerStats', 'rowSet': player_rows}, {'name': 'TeamStats', 'rowSet': team_rows}]}
+
+    @staticmethod
+    def create_statistics(generator, seconds):
+        minutes = seconds // 60
+        field_goal_attempts = generator.randint(0, minutes // 2)
+        three_point_field_goal_attempts = generator.randint(0, field_goal_attempts)
+        free_throw_attempts = generator.randint(0, minutes // 4)
+        return [generator.randint(0, field_goal_attempts), field_goal_attempts,
+                generator.randint(0, three_point_field_goal_attempts), three_point_field_goal_attempts,
+                generator.randint(0, free_throw_attempts), free_throw_attempts,
+                generator.randint(0, minutes // 8), generator.randint(0, minutes // 3),
+                generator.randint(0, minutes // 4), generator.randint(0, 3), generator.randint(0, 3),
+                generator.randint(0, 5), generator.randint(0, 6)]
+
+    def write_salary_files(self, directory, day_count=None):
+        # DraftKings and FanDuel files for the first game days of every season, using each site's team abbreviations
+        file_names = []
+        for season in self.seasons:
+            for day in self.get_game_days(season=season, day_count=day_count):
+                games = [game for game in self.games[season] if game['date'] == day]
+                file_names.append(self.write_draftkings_salary_file(directory=directory, season=season, day=day, games=games))
+                file_names.append(self.write_fanduel_salary_file(directory=directory, season=season, day=day, games=games))
+
+        return file_names
+
+    def write_draftkings_salary_file(self, directory, season, day, games):
+        abbreviations = self.get_site_abbreviations(site_name='DraftKings')
+        rows = [['Position', 'Name', 'Salary', 'GameInfo', 'AvgPointsPerGame', 'teamAbbrev']]
+        for game, player, salary in self.get_slate(season=season, day=day, games=games):
+            game_info = '{0}@{1} 07:30PM ET'.format(abbreviations[game['away_team_index']], abbreviations[game['home_team_index']])
+            rows.append([player['position_name'][0], player['name'], salary, game_info, '20.5', abbreviations[player['team_index']]])
+
+        return SyntheticLeague.write_csv(file_name=os.path.join(directory, 'draftkings', '{0}.csv'.format(day.strftime('%Y-%m-%d'))), rows=rows)
+
+    def write_fanduel_salary_file(self, directory, season, day, games):
+        abbreviations = self.get_site_abbreviations(site_name='FanDuel')
+        rows = [['Id', 'Position', 'First Name', 'Last Name', 'FPPG', 'Played', 'Salary', 'Game', 'Team', 'Opponent']]
+        for game, player, salary in self.get_slate(season=season, day=day, games=games):
+            first_name, last_name = player['name'].split(' ')
+            opponent_index = game['away_team_index'] if player['team_index'] == game['home_team_index'] else game['home_team_index']
+            rows.append([player['nba_id'], player['position_name'][0], first_name, last_name, '25.1', '10', salary,
+                         '{0}@{1}'.format(abbreviations[game['away_team_index']], abbreviations[game['home_team_index']]),
+                         abbreviations[player['team_index']], abbreviations[opponent_index]])
+
+        return SyntheticLeague.write_csv(file_name=os.path.join(directory, 'fanduel', '{0}.csv'.format(day.strftime('%Y-%m-%d'))), rows=rows)
+
+    def get_slate(self, season, day, games):
+        generator = random.Random('{0}-{1}'.format(self.seed, day))
+        for game in games:
+            for team_index in (game['away_team_index'], game['home_team_index']):
+                for player in self.get_roster(season=season, team_index=team_index):
+                    yield game, player, generator.randint(30, 110) * 100
+
+    def get_site_abbreviations(self, site_name):
+        site_aliases = {abbreviation: alias for alias, abbreviation in TeamInserter.abbreviation_aliases.get(site_name, {}).items()}
+        return [site_aliases.get(abbreviation, abbreviation) for team, team_id, abbreviation in self.teams]
+
+    @staticmethod
+    def write_csv(file_name, rows):
+        directory = os.path.dirname(file_name)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        with open(file_name, 'wb') as salary_file:
+            csv.writer(salary_file).writerows(rows)
+
+        return file_name
\ No newline at end of file
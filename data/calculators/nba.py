@@ -1,4 +1,14 @@
+from collections import OrderedDict
+
+from django.db import transaction
+from django.db.models import F, Q, Value, Case, When, IntegerField, BooleanField, FloatField, ExpressionWrapper
+from django.db.models.functions import Coalesce
+
 import data.validators.nba as nba_validators
+from data.calculators.scoring import ScoringRules, scoring_rules
+from data.exporters.utils import read_in_chunks
+from data.models import TraditionalBoxScore, SCORED_STATISTIC_FIELDS
+from data.objects.daily_fantasy_sports_site import DailyFantasySportsSite
 
 
 DRAFTKINGS_SCORING_VALUES = {
@@ -13,33 +23,228 @@ DRAFTKINGS_SCORING_VALUES = {
     'TURNOVER': -0.5
 }
 
+DRAFTKINGS_STATISTIC_SCORING_VALUES = OrderedDict([
+    ('points', 'POINT'),
+    ('three_point_field_goals', 'MADE_THREE_POINT_SHOT'),
+    ('total_rebounds', 'REBOUND'),
+    ('assists', 'ASSIST'),
+    ('steals', 'STEAL'),
+    ('blocks', 'BLOCK'),
+    ('turnovers', 'TURNOVER'),
+])
+
+FANDUEL_SCORING_VALUES = {
+    'POINT': 1,
+    'REBOUND': 1.2,
+    'ASSIST': 1.5,
+    'STEAL': 2,
+    'BLOCK': 2,
+    'TURNOVER': -1
+}
+
+FANDUEL_STATISTIC_SCORING_VALUES = OrderedDict([
+    ('points', 'POINT'),
+    ('total_rebounds', 'REBOUND'),
+    ('assists', 'ASSIST'),
+    ('steals', 'STEAL'),
+    ('blocks', 'BLOCK'),
+    ('turnovers', 'TURNOVER'),
+])
+
+DOUBLE_MINIMUM = 10
+
+# Register a new version of a site's rules instead of editing these so that stored fantasy points get recalculated
+scoring_rules.register(site=DailyFantasySportsSite.draft_kings,
+                       rules=ScoringRules(version=1,
+                                          statistic_values=[(statistic, DRAFTKINGS_SCORING_VALUES[scoring_value])
+                                                            for statistic, scoring_value in DRAFTKINGS_STATISTIC_SCORING_VALUES.items()],
+                                          double_bonuses=[('double_double', (2, DRAFTKINGS_SCORING_VALUES['DOUBLE_DOUBLE'])),
+                                                          ('triple_double', (3, DRAFTKINGS_SCORING_VALUES['TRIPLE_DOUBLE']))]))
+scoring_rules.register(site=DailyFantasySportsSite.fan_duel,
+                       rules=ScoringRules(version=1,
+                                          statistic_values=[(statistic, FANDUEL_SCORING_VALUES[scoring_value])
+                                                            for statistic, scoring_value in FANDUEL_STATISTIC_SCORING_VALUES.items()]))
+
+SCORING_VERSION = scoring_rules.get_version()
+
+DRAFTKINGS_CONTRIBUTIONS = ['draftkings_contribution_{0}'.format(statistic) for statistic in scoring_rules.get_scorer(site=DailyFantasySportsSite.draft_kings).statistics]
+DRAFTKINGS_CONTRIBUTIONS += ['draftkings_contribution_{0}'.format(name) for name, minimum_doubles, value in scoring_rules.get_scorer(site=DailyFantasySportsSite.draft_kings).bonuses]
+
+# Sites whose fantasy points are stored on TraditionalBoxScore, any other registered site is only scored on demand
+FANTASY_POINTS_FIELDS = OrderedDict([
+    (DailyFantasySportsSite.draft_kings, 'draftkings_points'),
+    (DailyFantasySportsSite.fan_duel, 'fanduel_points'),
+])
+
+
+def get_statistic(box_score, statistic):
+    value = getattr(box_score, statistic, None)
+    if value is None:
+        return 0
+
+    return value
+
+
+def calculate_points(box_score):
+    # Field goals include three pointers, so a made three only adds the one extra point on top of the field goal
+    return 2 * get_statistic(box_score, 'field_goals') + get_statistic(box_score, 'three_point_field_goals') + get_statistic(box_score, 'free_throws')
+
+
+def calculate_total_rebounds(box_score):
+    return get_statistic(box_score, 'offensive_rebounds') + get_statistic(box_score, 'defensive_rebounds')
+
+
+def get_statistics(box_score):
+    statistics = {}
+    for statistic in ('three_point_field_goals', 'assists', 'steals', 'blocks', 'turnovers'):
+        statistics[statistic] = get_statistic(box_score, statistic)
+
+    statistics['points'] = get_statistic(box_score, 'points') if getattr(box_score, 'points', None) is not None else calculate_points(box_score=box_score)
+    statistics['total_rebounds'] = get_statistic(box_score, 'total_rebounds') if getattr(box_score, 'total_rebounds', None) is not None else calculate_total_rebounds(box_score=box_score)
+    return statistics
+
+
+def count_doubles(statistics):
+    return len([statistic for statistic in nba_validators.double_calculation_statistical_categories
+                if statistics[statistic] >= DOUBLE_MINIMUM])
+
+
+def calculate_fantasy_points(box_score, sites=None):
+    # The statistics and the double count are read once and shared by every site's scorer
+    if sites is None:
+        sites = scoring_rules.get_sites()
+
+    statistics = get_statistics(box_score=box_score)
+    double_count = count_doubles(statistics=statistics)
+    fantasy_points = OrderedDict()
+    for site in sites:
+        fantasy_points[site] = scoring_rules.get_scorer(site=site).score(statistics=statistics, double_count=double_count)
+
+    return fantasy_points
+
+
+def calculate_draftkings_contributions(box_score):
+    statistics = get_statistics(box_score=box_score)
+    return scoring_rules.get_scorer(site=DailyFantasySportsSite.draft_kings).get_contributions(statistics=statistics,
+                                                                                             double_count=count_doubles(statistics=statistics))
+
 
 def calculate_draftkings_points(box_score):
-    score = 0
-    if nba_validators.is_double_double(box_score=box_score):
-        score += DRAFTKINGS_SCORING_VALUES['DOUBLE_DOUBLE']
-    elif nba_validators.is_triple_double(box_score=box_score):
-        score += DRAFTKINGS_SCORING_VALUES['TRIPLE_DOUBLE']
+    return calculate_fantasy_points(box_score=box_score, sites=[DailyFantasySportsSite.draft_kings])[DailyFantasySportsSite.draft_kings]
+
+
+def calculate_fanduel_points(box_score):
+    return calculate_fantasy_points(box_score=box_score, sites=[DailyFantasySportsSite.fan_duel])[DailyFantasySportsSite.fan_duel]
+
+
+def set_derived_statistics(box_score):
+    # Points and total rebounds are always rederived from the raw stats so that stale stored values are never reused
+    box_score.points = calculate_points(box_score=box_score)
+    box_score.total_rebounds = calculate_total_rebounds(box_score=box_score)
+    fantasy_points = calculate_fantasy_points(box_score=box_score, sites=FANTASY_POINTS_FIELDS.keys())
+    for site, field in FANTASY_POINTS_FIELDS.items():
+        setattr(box_score, field, fantasy_points[site])
+
+    box_score.scoring_version = SCORING_VERSION
+    return box_score
+
+
+class StatisticRow:
+
+    def __init__(self, values):
+        for field, value in zip(SCORED_STATISTIC_FIELDS, values):
+            setattr(self, field, value)
+
+
+def score_season(season_name, sites=None, chunk_size=5000):
+    # Yields (box score id, {site: fantasy points}) for every box score of a season from a single read of the raw stats
+    if sites is None:
+        sites = scoring_rules.get_sites()
+
+    queryset = TraditionalBoxScore.objects.filter(game__season__name=season_name).values_list('id', *SCORED_STATISTIC_FIELDS)
+    for chunk in read_in_chunks(queryset=queryset, chunk_size=chunk_size):
+        for row in chunk:
+            yield row[0], calculate_fantasy_points(box_score=StatisticRow(row[1:]), sites=sites)
+
+
+def get_statistic_expression(statistic):
+    return Coalesce(F(statistic), Value(0))
+
+
+def get_statistic_expressions():
+    return {
+        'points': 2 * get_statistic_expression('field_goals') + get_statistic_expression('three_point_field_goals') + get_statistic_expression('free_throws'),
+        'total_rebounds': get_statistic_expression('offensive_rebounds') + get_statistic_expression('defensive_rebounds'),
+        'three_point_field_goals': get_statistic_expression('three_point_field_goals'),
+        'assists': get_statistic_expression('assists'),
+        'steals': get_statistic_expression('steals'),
+        'blocks': get_statistic_expression('blocks'),
+        'turnovers': get_statistic_expression('turnovers'),
+    }
+
+
+def get_double_count_expression(minimum_doubles, value_if_true, value_if_false, output_field):
+    return Case(When(draftkings_double_count__gte=minimum_doubles, then=Value(value_if_true)),
+                default=Value(value_if_false),
+                output_field=output_field)
+
+
+def annotate_draftkings_points(queryset):
+    # Computes the same numbers as calculate_draftkings_contributions for every row in a single query,
+    # each contribution is annotated as draftkings_contribution_<category> and their sum as draftkings_total
+    scorer = scoring_rules.get_scorer(site=DailyFantasySportsSite.draft_kings)
+    statistics = {}
+    for statistic, expression in get_statistic_expressions().items():
+        statistics['draftkings_statistic_{0}'.format(statistic)] = ExpressionWrapper(expression, output_field=IntegerField())
+
+    queryset = queryset.annotate(**statistics)
+
+    double_count = sum(Case(When(Q(**{'draftkings_statistic_{0}__gte'.format(statistic): DOUBLE_MINIMUM}), then=Value(1)),
+                            default=Value(0),
+                            output_field=IntegerField())
+                       for statistic in nba_validators.double_calculation_statistical_categories)
+    queryset = queryset.annotate(draftkings_double_count=ExpressionWrapper(double_count, output_field=IntegerField()))
+
+    contributions = OrderedDict()
+    for statistic, weight in scorer.weighted_statistics:
+        contributions['draftkings_contribution_{0}'.format(statistic)] = ExpressionWrapper(
+            F('draftkings_statistic_{0}'.format(statistic)) * Value(weight),
+            output_field=FloatField())
+
+    for name, minimum_doubles, value in scorer.bonuses:
+        contributions['draftkings_contribution_{0}'.format(name)] = get_double_count_expression(minimum_doubles, value, 0.0, FloatField())
+
+    queryset = queryset.annotate(is_double_double=get_double_count_expression(2, True, False, BooleanField()),
+                                 is_triple_double=get_double_count_expression(3, True, False, BooleanField()),
+                                 **contributions)
+
+    return queryset.annotate(draftkings_total=ExpressionWrapper(sum(F(name) for name in contributions.keys()), output_field=FloatField()))
 
-    if hasattr(box_score, nba_validators.STATISTICAL_CATEGORIES_USED_FOR_DRAFTKINGS_CALCULATION['POINTS']):
-        score += DRAFTKINGS_SCORING_VALUES['POINT'] * float(getattr(box_score, nba_validators.STATISTICAL_CATEGORIES_USED_FOR_DRAFTKINGS_CALCULATION['POINTS']))
 
-    elif hasattr(box_score, nba_validators.STATISTICAL_CATEGORIES_USED_FOR_DRAFTKINGS_CALCULATION['THREE_POINT_FIELD_GOALS']):
-        score += DRAFTKINGS_SCORING_VALUES['MADE_THREE_POINT_SHOT'] * float(getattr(box_score, nba_validators.STATISTICAL_CATEGORIES_USED_FOR_DRAFTKINGS_CALCULATION['THREE_POINT_FIELD_GOALS']))
+def calculate_draftkings_points_for_season(season_name):
+    return annotate_draftkings_points(TraditionalBoxScore.objects.filter(game__season__name=season_name))
 
-    elif hasattr(box_score, nba_validators.STATISTICAL_CATEGORIES_USED_FOR_DRAFTKINGS_CALCULATION['TOTAL_REBOUNDS']):
-        score += DRAFTKINGS_SCORING_VALUES['REBOUND'] * float(getattr(box_score, nba_validators.STATISTICAL_CATEGORIES_USED_FOR_DRAFTKINGS_CALCULATION['TOTAL_REBOUNDS']))
 
-    elif hasattr(box_score, nba_validators.STATISTICAL_CATEGORIES_USED_FOR_DRAFTKINGS_CALCULATION['ASSISTS']):
-        score += DRAFTKINGS_SCORING_VALUES['ASSIST'] * float(getattr(box_score, nba_validators.STATISTICAL_CATEGORIES_USED_FOR_DRAFTKINGS_CALCULATION['ASSISTS']))
+def get_stored_double_count_expression():
+    return sum(Case(When(Q(**{'{0}__gte'.format(statistic): DOUBLE_MINIMUM}), then=Value(1)),
+                    default=Value(0),
+                    output_field=IntegerField())
+               for statistic in nba_validators.double_calculation_statistical_categories)
 
-    elif hasattr(box_score, nba_validators.STATISTICAL_CATEGORIES_USED_FOR_DRAFTKINGS_CALCULATION['STEALS']):
-        score += DRAFTKINGS_SCORING_VALUES['STEAL'] * float(getattr(box_score, nba_validators.STATISTICAL_CATEGORIES_USED_FOR_DRAFTKINGS_CALCULATION['STEALS']))
 
-    elif hasattr(box_score, nba_validators.STATISTICAL_CATEGORIES_USED_FOR_DRAFTKINGS_CALCULATION['BLOCKS']):
-        score += DRAFTKINGS_SCORING_VALUES['BLOCK'] * float(getattr(box_score, nba_validators.STATISTICAL_CATEGORIES_USED_FOR_DRAFTKINGS_CALCULATION['BLOCKS']))
+def recalculate_derived_statistics(queryset=None):
+    # Only rows that were never scored or were scored with an older version of the rules are touched
+    if queryset is None:
+        queryset = TraditionalBoxScore.objects.all()
 
-    elif hasattr(box_score, nba_validators.STATISTICAL_CATEGORIES_USED_FOR_DRAFTKINGS_CALCULATION['TURNOVERS']):
-        score += DRAFTKINGS_SCORING_VALUES['TURNOVER'] * float(getattr(box_score, nba_validators.STATISTICAL_CATEGORIES_USED_FOR_DRAFTKINGS_CALCULATION['TURNOVERS']))
+    queryset = queryset.filter(Q(scoring_version__isnull=True) | Q(scoring_version__lt=SCORING_VERSION))
+    with transaction.atomic():
+        statistic_expressions = get_statistic_expressions()
+        queryset.update(points=statistic_expressions['points'], total_rebounds=statistic_expressions['total_rebounds'])
 
-    return score
\ No newline at end of file
+        # The scorer expressions read the stored points and total rebounds, so they are updated after them
+        double_count = get_stored_double_count_expression()
+        fantasy_points = dict((field, scoring_rules.get_scorer(site=site).get_expression(double_count_expression=double_count))
+                              for site, field in FANTASY_POINTS_FIELDS.items())
+        fantasy_points['scoring_version'] = SCORING_VERSION
+        return queryset.update(**fantasy_points)
@@ -0,0 +1,102 @@
+from collections import OrderedDict
+
+from django.db.models import Value, FloatField, ExpressionWrapper
+from django.db.models.functions import Coalesce, Least
+from django.db.models import F
+
+
+class ScoringRules:
+
+    def __init__(self, version, statistic_values, double_bonuses=None):
+        # statistic_values maps a statistic to the fantasy points it is worth,
+        # double_bonuses maps a bonus name to the number of doubles it needs and the fantasy points it is worth
+        self.version = version
+        self.statistic_values = OrderedDict(statistic_values)
+        self.double_bonuses = OrderedDict(double_bonuses or [])
+
+    def compile(self):
+        return Scorer(rules=self)
+
+
+class Scorer:
+
+    def __init__(self, rules):
+        self.version = rules.version
+        self.statistics = tuple(rules.statistic_values.keys())
+        self.weights = tuple(float(value) for value in rules.statistic_values.values())
+        self.weighted_statistics = tuple(zip(self.statistics, self.weights))
+        self.bonuses = tuple((name, minimum_doubles, float(value)) for name, (minimum_doubles, value) in rules.double_bonuses.items())
+
+    def score(self, statistics, double_count):
+        score = 0.0
+        for statistic, weight in self.weighted_statistics:
+            score += weight * statistics[statistic]
+
+        for name, minimum_doubles, value in self.bonuses:
+            if double_count >= minimum_doubles:
+                score += value
+
+        return score
+
+    def get_contributions(self, statistics, double_count):
+        contributions = OrderedDict()
+        for statistic, weight in self.weighted_statistics:
+            contributions[statistic] = weight * statistics[statistic]
+
+        for name, minimum_doubles, value in self.bonuses:
+            contributions[name] = value if double_count >= minimum_doubles else 0.0
+
+        return contributions
+
+    def get_expression(self, double_count_expression):
+        # Expression over the stored statistic columns, integer division turns the double count into a 0 or 1 flag per bonus
+        score = sum(Coalesce(F(statistic), Value(0)) * Value(weight) for statistic, weight in self.weighted_statistics)
+        for name, minimum_doubles, value in self.bonuses:
+            score += Least(double_count_expression / Value(minimum_doubles), Value(1)) * Value(value)
+
+        return ExpressionWrapper(score, output_field=FloatField())
+
+
+class ScoringRulesRegistry:
+
+    def __init__(self):
+        self.rules = {}
+        self.scorers = {}
+
+    def register(self, site, rules):
+        site_rules = [registered_rules for registered_rules in self.rules.get(site, []) if registered_rules.version != rules.version]
+        site_rules.append(rules)
+        self.rules[site] = sorted(site_rules, key=lambda registered_rules: registered_rules.version)
+        self.scorers.pop((site, rules.version), None)
+
+    def get_sites(self):
+        return list(self.rules.keys())
+
+    def get_rules(self, site, version=None):
+        if site not in self.rules:
+            raise ValueError('No scoring rules for {0}'.format(site))
+
+        if version is None:
+            return self.rules[site][-1]
+
+        for rules in self.rules[site]:
+            if rules.version == version:
+                return rules
+
+        raise ValueError('No version {0} scoring rules for {1}'.format(version, site))
+
+    def get_scorer(self, site, version=None):
+        rules = self.get_rules(site=site, version=version)
+        scorer = self.scorers.get((site, rules.version))
+        if scorer is None:
+            scorer = rules.compile()
+            self.scorers[(site, rules.version)] = scorer
+
+        return scorer
+
+    def get_version(self):
+        # Versions only ever go up, so the sum changes whenever any site's latest rules change
+        return sum(site_rules[-1].version for site_rules in self.rules.values())
+
+
+scoring_rules = ScoringRulesRegistry()
@@ -0,0 +1,23 @@
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from data.models import DataVersion
+
+DATA_VERSION_ID = 1
+
+
+def get_data_version():
+    # Returns (version, updated at), a database that was never written to by an ingestion command is at version 0
+    data_version = DataVersion.objects.filter(id=DATA_VERSION_ID).values_list('version', 'updated_at').first()
+    if data_version is None:
+        return 0, None
+
+    return data_version
+
+
+def bump_data_version():
+    with transaction.atomic():
+        updated_count = DataVersion.objects.filter(id=DATA_VERSION_ID).update(version=F('version') + 1, updated_at=timezone.now())
+        if updated_count == 0:
+            DataVersion.objects.create(id=DATA_VERSION_ID, version=1)
\ No newline at end of file
@@ -0,0 +1,81 @@
+import csv
+import json
+from collections import OrderedDict
+
+from django.utils import six
+
+from data.exporters.utils import read_in_chunks
+from data.filters import filter_box_scores
+from data.models import TraditionalBoxScore
+
+
+class EchoBuffer:
+
+    # csv.writer needs a file-like object, returning the written line lets each row be yielded as soon as it is formatted
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def write(value):
+        return value
+
+
+class BoxScoreExporter:
+
+    chunk_size = 2000
+    content_types = {
+        'csv': 'text/csv',
+        'ndjson': 'application/x-ndjson',
+    }
+    statistic_fields = ('seconds_played', 'field_goals', 'field_goal_attempts', 'three_point_field_goals',
+                        'three_point_field_goal_attempts', 'free_throws', 'free_throw_attempts', 'offensive_rebounds',
+                        'defensive_rebounds', 'assists', 'steals', 'blocks', 'turnovers', 'fouls_committed', 'plus_minus')
+    value_fields = ('id', 'player__name', 'player__nba_id', 'player__team__name', 'game__home_team__name',
+                    'game__away_team__name', 'game__start_date', 'game__nba_id', 'game__season__name') + statistic_fields
+    columns = ('id', 'player_name', 'player_nba_id', 'team', 'opponent', 'game_date', 'game_nba_id',
+               'season') + statistic_fields
+
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def get_rows(queryset):
+        # Rows are read one chunk at a time so memory stays flat however many rows match
+        for chunk in read_in_chunks(queryset=queryset.values_list(*BoxScoreExporter.value_fields),
+                                    chunk_size=BoxScoreExporter.chunk_size):
+            for values in chunk:
+                yield BoxScoreExporter.translate_row(values=values)
+
+    @staticmethod
+    def translate_row(values):
+        box_score_id, player_name, player_nba_id, team, home_team, away_team, game_date, game_nba_id, season = values[:9]
+        opponent = None
+        if team is not None:
+            opponent = away_team if team == home_team else home_team
+
+        return (box_score_id, player_name, player_nba_id, team, opponent, game_date.isoformat(), game_nba_id,
+                season) + tuple(values[9:])
+
+    @staticmethod
+    def export(export_format, query_params=None):
+        queryset = filter_box_scores(queryset=TraditionalBoxScore.objects.all(), query_params=query_params or {})
+        rows = BoxScoreExporter.get_rows(queryset=queryset)
+        if export_format == 'csv':
+            return BoxScoreExporter.to_csv(rows=rows)
+
+        if export_format == 'ndjson':
+            return BoxScoreExporter.to_ndjson(rows=rows)
+
+        raise ValueError('Unknown export format: {0}'.format(export_format))
+
+    @staticmethod
+    def to_csv(rows):
+        writer = csv.writer(EchoBuffer())
+        yield writer.writerow(BoxScoreExporter.columns)
+        for row in rows:
+            yield writer.writerow([value.encode('utf-8') if isinstance(value, six.text_type) else value for value in row])
+
+    @staticmethod
+    def to_ndjson(rows):
+        for row in rows:
+            yield json.dumps(OrderedDict(zip(BoxScoreExporter.columns, row))) + '\n'
@@ -0,0 +1,187 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+
+from pytz import utc
+
+from data.exporters.utils import read_in_chunks
+from data.models import Game, Player, TraditionalBoxScore, PlayerSalary, Season
+
+
+class SnapshotTable:
+
+    def __init__(self, name, model, value_fields, season_field, date_field=None):
+        self.name = name
+        self.model = model
+        self.value_fields = value_fields
+        self.season_field = season_field
+        self.date_field = date_field
+
+    def get_columns(self):
+        return [value_field.replace('__', '_') for value_field in self.value_fields]
+
+    def get_field(self, value_field):
+        model = self.model
+        names = value_field.split('__')
+        for name in names[:-1]:
+            model = model._meta.get_field(name).related_model
+
+        return model._meta.get_field(names[-1])
+
+
+class SnapshotExporter:
+
+    chunk_size = 10000
+    file_extensions = {
+        'parquet': 'parquet',
+        'arrow': 'arrow',
+    }
+    tables = (
+        SnapshotTable(name='games',
+                      model=Game,
+                      value_fields=('id', 'nba_id', 'home_team__name', 'away_team__name', 'start_date', 'season__name'),
+                      season_field='season__name',
+                      date_field='start_date'),
+        SnapshotTable(name='players',
+                      model=Player,
+                      value_fields=('id', 'nba_id', 'name', 'jersey_number', 'position__name', 'team__name', 'season__name'),
+                      season_field='season__name'),
+        SnapshotTable(name='box_scores',
+                      model=TraditionalBoxScore,
+                      value_fields=('id', 'player_id', 'game_id', 'game__start_date', 'seconds_played', 'field_goals',
+                                    'field_goal_attempts', 'three_point_field_goals', 'three_point_field_goal_attempts',
+                                    'free_throws', 'free_throw_attempts', 'offensive_rebounds', 'defensive_rebounds',
+                                    'assists', 'steals', 'blocks', 'turnovers', 'fouls_committed', 'plus_minus'),
+                      season_field='game__season__name',
+                      date_field='game__start_date'),
+        SnapshotTable(name='player_salaries',
+                      model=PlayerSalary,
+                      value_fields=('id', 'site__name', 'player_id', 'game_id', 'game__start_date', 'salary'),
+                      season_field='game__season__name',
+                      date_field='game__start_date'),
+    )
+
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def export(directory, export_format='parquet', season_names=None):
+        if export_format not in SnapshotExporter.file_extensions:
+            raise ValueError('Unknown snapshot format: {0}'.format(export_format))
+
+        if season_names is None:
+            season_names = list(Season.objects.order_by('name').values_list('name', flat=True))
+
+        files = []
+        for table in SnapshotExporter.tables:
+            for season_name in season_names:
+                files.extend(SnapshotExporter.export_season(directory=directory, table=table,
+                                                            season_name=season_name, export_format=export_format))
+
+        manifest = {
+            'created_at': datetime.now(utc).isoformat(),
+            'format': export_format,
+            'files': files,
+        }
+        # A snapshot without any rows still gets its directory and manifest
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        with open(os.path.join(directory, 'manifest.json'), 'w') as manifest_file:
+            json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+
+        return manifest
+
+    @staticmethod
+    def export_season(directory, table, season_name, export_format):
+        queryset = table.model.objects.filter(**{table.season_field: season_name})
+        if table.date_field is None:
+            partitions = [(os.path.join(table.name, 'season={0}'.format(season_name)), queryset)]
+        else:
+            dates = queryset.order_by(table.date_field).values_list(table.date_field, flat=True).distinct()
+            partitions = [(os.path.join(table.name, 'season={0}'.format(season_name), 'date={0}'.format(date.isoformat())),
+                           queryset.filter(**{table.date_field: date}))
+                          for date in dates]
+
+        files = []
+        for partition, partition_queryset in partitions:
+            path = os.path.join(partition, 'part-0.{0}'.format(SnapshotExporter.file_extensions[export_format]))
+            row_count = SnapshotExporter.write_file(path=os.path.join(directory, path),
+                                                    table=table,
+                                                    queryset=partition_queryset.values_list(*table.value_fields),
+                                                    export_format=export_format)
+            if row_count == 0:
+                continue
+
+            files.append({
+                'table': table.name,
+                'season': season_name,
+                'path': path,
+                'rows': row_count,
+                'sha256': SnapshotExporter.get_checksum(path=os.path.join(directory, path)),
+            })
+
+        return files
+
+    @staticmethod
+    def write_file(path, table, queryset, export_format):
+        import pyarrow
+        import pyarrow.parquet
+
+        schema = SnapshotExporter.get_schema(table=table)
+        sink = None
+        writer = None
+        row_count = 0
+        try:
+            for chunk in read_in_chunks(queryset=queryset, chunk_size=SnapshotExporter.chunk_size):
+                if writer is None:
+                    if not os.path.isdir(os.path.dirname(path)):
+                        os.makedirs(os.path.dirname(path))
+
+                    sink = pyarrow.OSFile(path, 'wb')
+                    if export_format == 'parquet':
+                        writer = pyarrow.parquet.ParquetWriter(sink, schema)
+                    else:
+                        writer = pyarrow.RecordBatchFileWriter(sink, schema)
+
+                arrays = [pyarrow.array(list(column), type=schema.types[index]) for index, column in enumerate(zip(*chunk))]
+                batch = pyarrow.RecordBatch.from_arrays(arrays, table.get_columns())
+                if export_format == 'parquet':
+                    writer.write_table(pyarrow.Table.from_batches([batch]))
+                else:
+                    writer.write_batch(batch)
+
+                row_count += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+
+            if sink is not None:
+                sink.close()
+
+        return row_count
+
+    @staticmethod
+    def get_schema(table):
+        import pyarrow
+
+        arrow_types = {
+            'AutoField': pyarrow.int32(),
+            'ForeignKey': pyarrow.int32(),
+            'IntegerField': pyarrow.int32(),
+            'BigIntegerField': pyarrow.int64(),
+            'CharField': pyarrow.string(),
+            'DateField': pyarrow.date32(),
+        }
+        return pyarrow.schema([pyarrow.field(column, arrow_types[table.get_field(value_field).get_internal_type()])
+                               for column, value_field in zip(table.get_columns(), table.value_fields)])
+
+    @staticmethod
+    def get_checksum(path):
+        checksum = hashlib.sha256()
+        with open(path, 'rb') as snapshot_file:
+            for block in iter(lambda: snapshot_file.read(1024 * 1024), b''):
+                checksum.update(block)
+
+        return checksum.hexdigest()
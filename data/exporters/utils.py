@@ -0,0 +1,11 @@
+def read_in_chunks(queryset, chunk_size):
+    # The queryset must be a values_list whose first value is the primary key, rows are yielded in primary key order
+    queryset = queryset.order_by('id')
+    last_id = 0
+    while True:
+        chunk = list(queryset.filter(id__gt=last_id)[:chunk_size])
+        if len(chunk) == 0:
+            return
+
+        yield chunk
+        last_id = chunk[-1][0]
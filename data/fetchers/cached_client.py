@@ -0,0 +1,227 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from threading import Lock
+
+import requests
+from django.conf import settings
+from nba_data.client import Client
+from nba_data.data.current_season_only import CurrentSeasonOnly
+from nba_data.data.league import League
+from nba_data.data.season_type import SeasonType
+from nba_data.deserializers.common_all_players_deserializer import CommonAllPlayersDeserializer
+from nba_data.deserializers.common_player_info_deserializer import CommonPlayerInfoDeserializer
+from nba_data.deserializers.traditional_box_score_deserializer import TraditionalBoxScoreDeserializer
+from nba_data.nba_stats_api_utils.query_parameter_generator import QueryParameterGenerator
+from nba_data.nba_stats_api_utils.uri_generator import UriGenerator
+
+from data.fetchers.league_game_log_deserializer import LeagueGameLogDeserializer
+from data.fetchers.scoreboard_deserializer import ScoreboardDeserializer
+from data.profiling import time_fetch
+
+
+class ResponseCache:
+
+    def __init__(self, directory, max_size=None, timeouts=None, replay_only=False):
+        self.directory = directory
+        self.max_size = max_size
+        self.timeouts = timeouts or {}
+        self.replay_only = replay_only
+        self.size = None
+        self.lock = Lock()
+
+    @staticmethod
+    def from_settings(replay_only=None):
+        cache_settings = getattr(settings, 'NBA_DATA_CACHE', {})
+        if replay_only is None:
+            replay_only = cache_settings.get('REPLAY_ONLY', False)
+
+        return ResponseCache(directory=cache_settings.get('DIRECTORY'),
+                             max_size=cache_settings.get('MAX_SIZE'),
+                             timeouts=cache_settings.get('TIMEOUTS'),
+                             replay_only=replay_only)
+
+    def get_or_fetch(self, endpoint, arguments, fetch, timeout=-1):
+        # A timeout of None caches forever, the default of -1 falls back to the endpoint's configured timeout
+        if self.directory is None:
+            return fetch()
+
+        if timeout == -1:
+            timeout = self.timeouts.get(endpoint)
+
+        path = self.get_path(endpoint=endpoint, arguments=arguments)
+        response = self.read(path=path, timeout=timeout)
+        if response is not None:
+            return response
+
+        if self.replay_only:
+            raise LookupError('No cached {0} response for {1}'.format(endpoint, arguments))
+
+        response = fetch()
+        self.write(path=path, response=response)
+        return response
+
+    def get_path(self, endpoint, arguments):
+        key = hashlib.sha1(repr((endpoint, arguments)).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, endpoint, key[:2], '{0}.json'.format(key))
+
+    def read(self, path, timeout):
+        try:
+            modified_time = os.path.getmtime(path)
+            if not self.replay_only and timeout is not None and modified_time + timeout < time.time():
+                return None
+
+            with open(path, 'r') as cache_file:
+                response = json.load(cache_file)
+        except (IOError, OSError, ValueError):
+            return None
+
+        # The access time orders eviction, the modification time is kept for expiry
+        os.utime(path, (time.time(), modified_time))
+        return response
+
+    def write(self, path, response):
+        directory = os.path.dirname(path)
+        if not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                if not os.path.isdir(directory):
+                    raise
+
+        with tempfile.NamedTemporaryFile(mode='w', dir=directory, delete=False) as cache_file:
+            json.dump(response, cache_file)
+
+        os.rename(cache_file.name, path)
+        self.add_size(os.path.getsize(path))
+
+    def add_size(self, size):
+        if self.max_size is None:
+            return
+
+        with self.lock:
+            if self.size is None:
+                self.size = sum(size for path, accessed_time, size in self.get_entries())
+            else:
+                self.size += size
+
+            if self.size > self.max_size:
+                self.evict()
+
+    def evict(self):
+        # Drop the least recently used entries until there is some headroom below the limit
+        target_size = self.max_size * 0.9
+        for path, accessed_time, size in sorted(self.get_entries(), key=lambda entry: entry[1]):
+            if self.size <= target_size:
+                break
+
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+
+            self.size -= size
+
+    def get_entries(self):
+        entries = []
+        for root, directories, file_names in os.walk(self.directory):
+            for file_name in file_names:
+                path = os.path.join(root, file_name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+
+                entries.append((path, stat.st_atime, stat.st_size))
+
+        return entries
+
+
+class CachedClient:
+
+    # The raw JSON of each NBA stats API request is cached, keyed by its URI and query parameters,
+    # and then deserialized the same way nba_data's Client does it
+    cache = None
+    league_game_log_uri = UriGenerator.base_uri + 'leaguegamelog'
+    scoreboard_uri = UriGenerator.base_uri + 'scoreboardV2'
+
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def get_cache():
+        if CachedClient.cache is None:
+            CachedClient.cache = ResponseCache.from_settings()
+
+        return CachedClient.cache
+
+    @staticmethod
+    def get_json(endpoint, uri, parameters, timeout=-1):
+        def fetch():
+            response = requests.get(uri, headers=Client.headers, params=parameters)
+            response.raise_for_status()
+            return response.json()
+
+        with time_fetch():
+            return CachedClient.get_cache().get_or_fetch(endpoint=endpoint,
+                                                         arguments=(uri, sorted(parameters.items())),
+                                                         fetch=fetch,
+                                                         timeout=timeout)
+
+    @staticmethod
+    def get_players_for_season(season, league=League.nba, current_season_only=CurrentSeasonOnly.yes):
+        parameters = QueryParameterGenerator.generate_request_parameters(season=season,
+                                                                         league=league,
+                                                                         current_season_only=current_season_only)
+        players_json = CachedClient.get_json(endpoint='players_for_season',
+                                             uri=UriGenerator.generate_common_all_players_uri(),
+                                             parameters=parameters)
+        return CommonAllPlayersDeserializer.deserialize_common_all_players(players_json)
+
+    @staticmethod
+    def get_player_info(player_id):
+        assert isinstance(player_id, int)
+
+        player_info_json = CachedClient.get_json(endpoint='player_info',
+                                                 uri=UriGenerator.generate_common_player_info_uri(),
+                                                 parameters=QueryParameterGenerator.generate_request_parameters(player_id=player_id))
+        return CommonPlayerInfoDeserializer.deserialize_common_player_info(player_info_json)
+
+    @staticmethod
+    def get_games_for_season(season, season_type=SeasonType.regular_season):
+        # One league game log request covers every team's games, the team game logs list each game twice
+        parameters = QueryParameterGenerator.generate_request_parameters(season=season, season_type=season_type)
+        parameters.update({'LeagueID': '00', 'PlayerOrTeam': 'T', 'Counter': 0, 'Direction': 'ASC', 'Sorter': 'DATE', 'DateFrom': '', 'DateTo': ''})
+        games_json = CachedClient.get_json(endpoint='games_for_season',
+                                           uri=CachedClient.league_game_log_uri,
+                                           parameters=parameters)
+        return LeagueGameLogDeserializer.deserialize_league_game_log(games_json)
+
+    @staticmethod
+    def get_games_for_date(game_date):
+        # The league game log only lists games once they were played, the scoreboard lists a date's games ahead of time
+        parameters = {'GameDate': game_date.strftime('%m/%d/%Y'), 'LeagueID': '00', 'DayOffset': 0}
+        scoreboard_json = CachedClient.get_json(endpoint='games_for_date',
+                                                uri=CachedClient.scoreboard_uri,
+                                                parameters=parameters)
+        return ScoreboardDeserializer.deserialize_scoreboard(scoreboard_json)
+
+    @staticmethod
+    def get_traditional_box_score(game_id, finished=False, live=False):
+        assert isinstance(game_id, str)
+
+        # Box scores of finished games never change so they are kept until evicted, live box scores are always
+        # fetched again and the fresh response replaces the cached one
+        timeout = -1
+        if live:
+            timeout = 0
+        elif finished:
+            timeout = None
+
+        box_score_json = CachedClient.get_json(endpoint='traditional_box_score',
+                                               uri=UriGenerator.generate_traditional_box_score_uri(),
+                                               parameters=QueryParameterGenerator.generate_box_score_request_parameters(game_id=game_id),
+                                               timeout=timeout)
+        return TraditionalBoxScoreDeserializer.deserialize_traditional_box_score(traditional_box_score_json=box_score_json)
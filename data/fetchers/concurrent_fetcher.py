@@ -0,0 +1,48 @@
+import time
+from multiprocessing.pool import ThreadPool
+from threading import Lock
+
+
+class RateLimiter:
+
+    def __init__(self, requests_per_second=None):
+        self.interval = 0 if not requests_per_second else 1.0 / requests_per_second
+        self.next_request_time = 0
+        self.lock = Lock()
+
+    def wait(self):
+        if self.interval == 0:
+            return
+
+        with self.lock:
+            now = time.time()
+            wait_time = self.next_request_time - now
+            self.next_request_time = max(now, self.next_request_time) + self.interval
+
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+
+class ConcurrentFetcher:
+
+    def __init__(self, workers=1, requests_per_second=None):
+        self.workers = max(workers, 1)
+        self.rate_limiter = RateLimiter(requests_per_second=requests_per_second)
+
+    def fetch(self, fetch, arguments):
+        # Results are yielded in completion order so a single caller thread can write them as they arrive
+        def rate_limited_fetch(argument):
+            self.rate_limiter.wait()
+            return fetch(argument)
+
+        if self.workers == 1:
+            for argument in arguments:
+                yield rate_limited_fetch(argument)
+            return
+
+        pool = ThreadPool(processes=self.workers)
+        try:
+            for result in pool.imap_unordered(rate_limited_fetch, arguments):
+                yield result
+        finally:
+            pool.terminate()
@@ -0,0 +1,69 @@
+from datetime import datetime
+
+from nba_data.data.game import Game
+from nba_data.data.matchup import Matchup
+from nba_data.data.outcome import Outcome
+from nba_data.data.season import Season
+from nba_data.data.season_type import SeasonType
+
+
+class LeagueGameLogDeserializer:
+
+    # The league game log has a row per team and game, columns are looked up by header since nba_data has no deserializer for it
+    game_date_formats = ("%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%b %d, %Y")
+
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def deserialize_league_game_log(league_game_log_json):
+        result_set = league_game_log_json["resultSets"][0]
+        column_indices = {header: index for index, header in enumerate(result_set["headers"])}
+        season = Season.get_season(league_game_log_json["parameters"][Season.get_query_parameter_name()])
+        season_type = SeasonType.get_season_type(league_game_log_json["parameters"][SeasonType.get_query_parameter_name()])
+        games = {}
+        for result in result_set["rowSet"]:
+            nba_id = str(result[column_indices["GAME_ID"]])
+            matchup = result[column_indices["MATCHUP"]]
+            # Both rows of a game describe the same matchup, the home team's row carries the home team's outcome
+            is_home_row = " vs. " in matchup
+            if nba_id in games and not is_home_row:
+                continue
+
+            home_team_outcome = None
+            outcome_abbreviation = result[column_indices["WL"]]
+            if outcome_abbreviation:
+                home_team_outcome = Outcome.get_outcome_from_abbreviation(outcome_abbreviation)
+                if not is_home_row:
+                    home_team_outcome = Outcome.loss if home_team_outcome == Outcome.win else Outcome.win
+
+            games[nba_id] = Game(nba_id=nba_id,
+                                 matchup=LeagueGameLogDeserializer.parse_matchup(matchup),
+                                 date=LeagueGameLogDeserializer.parse_date(result[column_indices["GAME_DATE"]]),
+                                 season=season,
+                                 season_type=season_type,
+                                 home_team_outcome=home_team_outcome)
+
+        return [games[nba_id] for nba_id in sorted(games.keys())]
+
+    @staticmethod
+    def parse_matchup(matchup):
+        if " vs. " in matchup:
+            teams = matchup.split(" vs. ")
+            return Matchup.create(home_team_abbreviation=str(teams[0]), away_team_abbreviation=str(teams[1]))
+
+        if " @ " in matchup:
+            teams = matchup.split(" @ ")
+            return Matchup.create(home_team_abbreviation=str(teams[1]), away_team_abbreviation=str(teams[0]))
+
+        raise ValueError("Unexpected matchup: {0}".format(matchup))
+
+    @staticmethod
+    def parse_date(date_string):
+        for game_date_format in LeagueGameLogDeserializer.game_date_formats:
+            try:
+                return datetime.strptime(date_string, game_date_format).date()
+            except ValueError:
+                continue
+
+        raise ValueError("Unexpected game date: {0}".format(date_string))
\ No newline at end of file
@@ -0,0 +1,49 @@
+from datetime import datetime
+
+from nba_data.data.game import Game
+from nba_data.data.matchup import Matchup
+from nba_data.data.season import Season
+from nba_data.data.season_type import SeasonType
+
+
+class ScoreboardDeserializer:
+
+    # The scoreboard has a header row per game and a line score row per team, columns are looked up by header since
+    # nba_data has no deserializer for it. The season type is the third digit of the game id
+    season_types = {
+        "1": SeasonType.pre_season,
+        "2": SeasonType.regular_season,
+        "3": SeasonType.all_star,
+        "4": SeasonType.playoffs,
+    }
+
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def deserialize_scoreboard(scoreboard_json):
+        result_sets = {result_set["name"]: result_set for result_set in scoreboard_json["resultSets"]}
+        line_score = result_sets["LineScore"]
+        line_score_indices = {header: index for index, header in enumerate(line_score["headers"])}
+        team_abbreviations = {(str(result[line_score_indices["GAME_ID"]]), result[line_score_indices["TEAM_ID"]]): str(result[line_score_indices["TEAM_ABBREVIATION"]])
+                              for result in line_score["rowSet"]}
+
+        game_header = result_sets["GameHeader"]
+        column_indices = {header: index for index, header in enumerate(game_header["headers"])}
+        games = []
+        for result in game_header["rowSet"]:
+            nba_id = str(result[column_indices["GAME_ID"]])
+            season_type = ScoreboardDeserializer.season_types.get(nba_id[2:3])
+            if season_type is None:
+                raise ValueError("Unexpected game id: {0}".format(nba_id))
+
+            start_year = int(result[column_indices["SEASON"]])
+            games.append(Game(nba_id=nba_id,
+                              matchup=Matchup.create(home_team_abbreviation=team_abbreviations[(nba_id, result[column_indices["HOME_TEAM_ID"]])],
+                                                     away_team_abbreviation=team_abbreviations[(nba_id, result[column_indices["VISITOR_TEAM_ID"]])]),
+                              date=datetime.strptime(result[column_indices["GAME_DATE_EST"]], "%Y-%m-%dT%H:%M:%S").date(),
+                              season=Season.get_season("{0}-{1:02d}".format(start_year, (start_year + 1) % 100)),
+                              season_type=season_type,
+                              home_team_outcome=None))
+
+        return sorted(games, key=lambda game: game.nba_id)
\ No newline at end of file
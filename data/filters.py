@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from pytz import utc
+
+
+def filter_box_scores(queryset, query_params):
+    name = query_params.get('name', None)
+    team_abbreviation = query_params.get('team_abbreviation', None)
+    unix_start_time = query_params.get('unix_start_time', None)
+    unix_end_time = query_params.get('unix_end_time', None)
+    draftkings_points_min = query_params.get('draftkings_points_min', None)
+    draftkings_points_max = query_params.get('draftkings_points_max', None)
+    fanduel_points_min = query_params.get('fanduel_points_min', None)
+    fanduel_points_max = query_params.get('fanduel_points_max', None)
+
+    # Players only have a full name, the first_name and last_name parameters pointed at fields that never existed
+    if name is not None:
+        queryset = queryset.filter(player__name=name)
+
+    if team_abbreviation is not None:
+        queryset = queryset.filter(player__team__abbreviation=team_abbreviation.upper())
+
+    if unix_start_time is not None:
+        queryset = queryset.filter(game__start_date__gte=datetime.fromtimestamp(float(unix_start_time), utc).date())
+
+    if unix_end_time is not None:
+        queryset = queryset.filter(game__start_date__lte=datetime.fromtimestamp(float(unix_end_time), utc).date())
+
+    if draftkings_points_min is not None:
+        queryset = queryset.filter(draftkings_points__gte=draftkings_points_min)
+
+    if draftkings_points_max is not None:
+        queryset = queryset.filter(draftkings_points__lte=draftkings_points_max)
+
+    if fanduel_points_min is not None:
+        queryset = queryset.filter(fanduel_points__gte=fanduel_points_min)
+
+    if fanduel_points_max is not None:
+        queryset = queryset.filter(fanduel_points__lte=fanduel_points_max)
+
+    return queryset
@@ -0,0 +1,230 @@
+from datetime import timedelta
+from multiprocessing import Pool
+from multiprocessing.pool import ThreadPool
+
+from django.db import connection, connections
+from django.utils import timezone
+
+from data.calculators.nba import recalculate_derived_statistics
+from data.fetchers.cached_client import CachedClient, ResponseCache
+from data.fetchers.concurrent_fetcher import ConcurrentFetcher
+from data.inserters.box_score_inserter import BoxScoreInserter, BoxScoreLookup
+from data.inserters.game_inserter import GameInserter
+from data.inserters.player_inserter import PlayerInserter
+from data.inserters.position_inserter import PositionInserter
+from data.inserters.season_inserter import SeasonInserter
+from data.inserters.team_inserter import TeamInserter
+from data.inserters.utils import get_bulk_batch_size
+from data.models import Game, TraditionalBoxScore, IngestionRun, IngestionCheckpoint
+from data.objects.season import Season
+from data.profiling import IngestionProfiler
+from data.reference_data import warm_reference_data
+from data.translators.team_abbreviations import team_abbreviations
+
+
+class IngestionStage:
+
+    # get_units returns the unit keys of the stage, run(units, checkpoint) processes the given units and passes the keys
+    # of every unit it finished to checkpoint. Without get_units the stage is a single unit that runs on every execution
+    def __init__(self, name, run, get_units=None, dependencies=()):
+        self.name = name
+        self.run = run
+        self.get_units = get_units
+        self.dependencies = tuple(dependencies)
+
+
+class IngestionGraph:
+
+    checkpoint_batch_size = 1000
+    resume_max_age = timedelta(hours=12)
+
+    def __init__(self, stages, workers=1, profiler=None):
+        self.stages = list(stages)
+        self.workers = max(workers, 1)
+        self.profiler = profiler
+        stage_names = set(stage.name for stage in self.stages)
+        for stage in self.stages:
+            missing_dependencies = [dependency for dependency in stage.dependencies if dependency not in stage_names]
+            if missing_dependencies:
+                raise ValueError('Stage {0} depends on unknown stages {1}'.format(stage.name, ', '.join(missing_dependencies)))
+
+    @staticmethod
+    def get_run(seasons, restart=False, max_age=None):
+        # Resumes the latest run over the same seasons unless it finished or started more than max_age ago, restart abandons
+        # an unfinished run and starts a new one. The checkpoints of a run over other seasons belong to other stages
+        run_seasons = IngestionGraph.get_run_seasons(seasons=seasons)
+        run = IngestionRun.objects.filter(seasons=run_seasons).order_by('-id').first()
+        if run is None or run.finished_at is not None or restart or (max_age is not None and run.started_at < timezone.now() - max_age):
+            run = IngestionRun.objects.create(seasons=run_seasons)
+
+        return run
+
+    @staticmethod
+    def get_run_seasons(seasons):
+        season_names = sorted(season.value for season in seasons)
+        return '{0}..{1}'.format(season_names[0], season_names[-1])
+
+    def get_waves(self):
+        # Each wave holds the stages whose dependencies all ran in earlier waves, the stages of a wave run in parallel
+        waves = []
+        completed = set()
+        remaining = list(self.stages)
+        while remaining:
+            wave = [stage for stage in remaining if all(dependency in completed for dependency in stage.dependencies)]
+            if not wave:
+                raise ValueError('Stages {0} depend on each other'.format(', '.join(stage.name for stage in remaining)))
+
+            waves.append(wave)
+            completed.update(stage.name for stage in wave)
+            remaining = [stage for stage in remaining if stage.name not in completed]
+
+        return waves
+
+    def execute(self, run, finish=True):
+        for wave in self.get_waves():
+            if self.profiler is None:
+                self.execute_wave(run=run, wave=wave)
+            else:
+                with self.profiler.stage('+'.join(stage.name for stage in wave)):
+                    self.execute_wave(run=run, wave=wave)
+
+        if finish:
+            run.finished_at = timezone.now()
+            run.save(update_fields=['finished_at'])
+
+    def execute_wave(self, run, wave):
+        if self.workers == 1 or len(wave) == 1:
+            for stage in wave:
+                self.execute_stage(run=run, stage=stage)
+            return
+
+        pool = ThreadPool(processes=min(self.workers, len(wave)))
+        try:
+            pool.map(lambda stage: self.execute_stage_in_thread(run=run, stage=stage), wave)
+        finally:
+            pool.close()
+            pool.join()
+
+    def execute_stage_in_thread(self, run, stage):
+        # Every thread gets its own database connection, it is closed here since the pool threads are not request threads
+        try:
+            if self.profiler is None:
+                self.execute_stage(run=run, stage=stage)
+            else:
+                with self.profiler.track_thread():
+                    self.execute_stage(run=run, stage=stage)
+        finally:
+            connection.close()
+
+    def execute_stage(self, run, stage):
+        if stage.get_units is None:
+            # Single unit stages sync a whole table and skip what is already stored, so a resumed run runs them again and
+            # still picks up the schedule and rosters as they are now
+            stage.run()
+            return
+
+        completed_units = set(IngestionCheckpoint.objects.filter(run=run, stage=stage.name).values_list('unit', flat=True))
+        pending_units = [unit for unit in stage.get_units() if unit not in completed_units]
+        if pending_units:
+            stage.run(pending_units, lambda units: IngestionGraph.checkpoint(run=run, stage=stage, units=units))
+
+    @staticmethod
+    def checkpoint(run, stage, units):
+        checkpoints = [IngestionCheckpoint(run=run, stage=stage.name, unit=unit) for unit in units]
+        IngestionCheckpoint.objects.bulk_create(checkpoints, batch_size=get_bulk_batch_size(model=IngestionCheckpoint, objs=checkpoints,
+                                                                                            batch_size=IngestionGraph.checkpoint_batch_size))
+
+
+def get_ingestion_stages(seasons, fetcher):
+    # Reference data, then the players and the games of each season side by side, then the box scores of each season per game
+    stages = get_reference_data_stages()
+    for season in seasons:
+        stages.extend(get_season_stages(season=season, fetcher=fetcher))
+
+    return stages
+
+
+def get_reference_data_stages():
+    return [IngestionStage(name=name, run=run) for name, run in (
+        ('positions', PositionInserter.insert_positions),
+        ('seasons', SeasonInserter.insert_seasons),
+        ('teams', TeamInserter.insert_teams),
+    )]
+
+
+def get_season_stages(season, fetcher, reference_data=True):
+    # Without reference_data the stages do not wait for the reference data stages, they must have run already
+    players_stage = 'players:{0}'.format(season.value)
+    games_stage = 'games:{0}'.format(season.value)
+    box_scores_stage = 'box_scores:{0}'.format(season.value)
+    return [
+        IngestionStage(name=players_stage,
+                       run=lambda: PlayerInserter.insert_players_for_season(season=season, fetcher=fetcher),
+                       dependencies=('positions', 'seasons', 'teams') if reference_data else ()),
+        IngestionStage(name=games_stage,
+                       run=lambda: GameInserter.insert_games_for_season(season=season),
+                       dependencies=('seasons', 'teams') if reference_data else ()),
+        IngestionStage(name=box_scores_stage,
+                       run=lambda game_ids, checkpoint: insert_box_scores(season=season, game_ids=game_ids, fetcher=fetcher, checkpoint=checkpoint),
+                       get_units=lambda: list(Game.objects.filter(season__name=season.value).order_by('start_date', 'id').values_list('nba_id', flat=True)),
+                       dependencies=(players_stage, games_stage)),
+        # Scores the season's box scores that were written without derived statistics or scored with older rules
+        IngestionStage(name='derived_statistics:{0}'.format(season.value),
+                       run=lambda: recalculate_derived_statistics(queryset=TraditionalBoxScore.objects.filter(game__season__name=season.value)),
+                       dependencies=(box_scores_stage,)),
+    ]
+
+
+def insert_box_scores(season, game_ids, fetcher, checkpoint):
+    game_ids = set(game_ids)
+    games = [(nba_id, start_date)
+             for nba_id, start_date in Game.objects.filter(season__name=season.value).order_by('start_date', 'id').values_list('nba_id', 'start_date')
+             if nba_id in game_ids]
+    BoxScoreInserter.insert_traditional_box_scores_for_games(games=games, lookup=BoxScoreLookup(), fetcher=fetcher, on_written=checkpoint)
+
+
+def backfill_seasons(seasons, run, season_workers, worker_options, profiler=None):
+    # Loads the reference data once, then every season in its own process with its own database connection and NBA API
+    # response cache. The processes share nothing but the reference data, which they inherit already loaded
+    IngestionGraph(stages=get_reference_data_stages(), profiler=profiler).execute(run=run, finish=False)
+    warm_reference_data()
+    team_abbreviations.get_entries()
+
+    # Forked workers must not inherit the parent's open database connections
+    connections.close_all()
+    worker_options = dict(worker_options, run_id=run.id)
+    pool = Pool(processes=min(season_workers, len(seasons)), initializer=set_backfill_options, initargs=(worker_options,), maxtasksperchild=1)
+    try:
+        season_reports = pool.map(backfill_season, [season.value for season in seasons])
+    finally:
+        pool.close()
+        pool.join()
+
+    run.finished_at = timezone.now()
+    run.save(update_fields=['finished_at'])
+    return [stage_report for season_report in season_reports for stage_report in season_report]
+
+
+# Set in every backfill worker process by the pool initializer
+backfill_options = None
+
+
+def set_backfill_options(options):
+    global backfill_options
+    backfill_options = options
+    CachedClient.cache = ResponseCache.from_settings(replay_only=options['replay_only'] or None)
+
+
+def backfill_season(season_value):
+    options = backfill_options
+    season = Season.get_season(season_value)
+    fetcher = ConcurrentFetcher(workers=options['workers'], requests_per_second=options['requests_per_second'])
+    profiler = IngestionProfiler(profile_directory=options['profile_directory']) if options['profile'] else None
+    graph = IngestionGraph(stages=get_season_stages(season=season, fetcher=fetcher, reference_data=False),
+                           workers=options['stage_workers'], profiler=profiler)
+    try:
+        graph.execute(run=IngestionRun.objects.get(id=options['run_id']), finish=False)
+    finally:
+        connection.close()
+
+    return profiler.get_report() if profiler is not None else []
\ No newline at end of file
@@ -1,51 +1,164 @@
-from nba_data.client import Client
-from data.models import Team, Season, Game, TraditionalBoxScore, Player
+from datetime import date
+
+from django.db import transaction
+
+from data.calculators.nba import set_derived_statistics
+from data.fetchers.cached_client import CachedClient
+from data.fetchers.concurrent_fetcher import ConcurrentFetcher
+from data.inserters.utils import get_bulk_batch_size
+from data.models import Game, TraditionalBoxScore, Player
 from data.objects.season import Season as SeasonEnum
-from django.core.exceptions import ObjectDoesNotExist
+from data.profiling import record
+from data.reference_data import teams
+
+
+class BoxScoreLookup:
+
+    def __init__(self):
+        self.team_ids = {team.name: team.id for team in teams.all()}
+        self.player_ids = {(name, team_id, nba_id, season_id): player_id
+                           for name, team_id, nba_id, season_id, player_id in Player.objects.values_list('name', 'team_id', 'nba_id', 'season_id', 'id')}
+        games = Game.objects.values_list('nba_id', 'id', 'season_id')
+        self.game_ids = {nba_id: game_id for nba_id, game_id, season_id in games}
+        self.game_season_ids = {game_id: season_id for nba_id, game_id, season_id in games}
+        self.inserted_keys = set(TraditionalBoxScore.objects.values_list('player_id', 'game_id'))
+
+    def get_team_id(self, team):
+        if team is None:
+            return None
+
+        return self.team_ids.get(team.value)
+
+    def get_player_id(self, player, game_id):
+        # Players have a row per season and keep their NBA id between seasons, a box score belongs to the row of its game's season
+        return self.player_ids.get((player.name, self.get_team_id(player.team), player.id, self.game_season_ids.get(game_id)))
+
+    def get_game_id(self, game_id):
+        return self.game_ids.get(game_id)
+
+    def is_inserted(self, player_id, game_id):
+        return (player_id, game_id) in self.inserted_keys
+
+    def mark_inserted(self, player_id, game_id):
+        self.inserted_keys.add((player_id, game_id))
 
 
 class BoxScoreInserter:
+
+    batch_size = 1000
+
     def __init__(self):
         pass
 
     @staticmethod
-    def insert_traditional_box_scores():
+    def insert_traditional_box_scores(fetcher=None):
+        lookup = BoxScoreLookup()
         for season in SeasonEnum:
-            BoxScoreInserter.insert_traditional_box_scores_for_season(season=season)
+            BoxScoreInserter.insert_traditional_box_scores_for_season(season=season, lookup=lookup, fetcher=fetcher)
 
     @staticmethod
-    def insert_traditional_box_scores_for_season(season):
-        for game in Game.objects.filter(season=Season.objects.get(name=season.value)):
-            BoxScoreInserter.insert_traditional_box_scores_for_game(game_id=str(game.nba_id))
+    def insert_traditional_box_scores_for_season(season, lookup=None, fetcher=None):
+        games = Game.objects.filter(season__name=season.value).values_list('nba_id', 'start_date')
+        BoxScoreInserter.insert_traditional_box_scores_for_games(games=games, lookup=lookup, fetcher=fetcher)
 
     @staticmethod
-    def insert_traditional_box_scores_for_game(game_id):
-        box_score = Client.get_traditional_box_score(game_id=game_id)
+    def insert_traditional_box_scores_for_games(games, lookup=None, fetcher=None, on_written=None):
+        # games are (nba id, start date) pairs, on_written is called with the nba ids of the complete games in each batch
+        # inside the batch's transaction, so a game is only reported once its box scores are stored
+        if lookup is None:
+            lookup = BoxScoreLookup()
+
+        if fetcher is None:
+            fetcher = ConcurrentFetcher()
+
+        box_scores = []
+        game_ids = []
+        for box_score in fetcher.fetch(fetch=BoxScoreInserter.fetch_traditional_box_score, arguments=games):
+            box_scores.extend(BoxScoreInserter.translate_traditional_box_scores(box_score=box_score, lookup=lookup))
+            if on_written is not None and BoxScoreInserter.is_complete(box_score=box_score, lookup=lookup):
+                game_ids.append(box_score.game_id)
+
+            if len(box_scores) >= BoxScoreInserter.batch_size:
+                BoxScoreInserter.write_traditional_box_scores(box_scores=box_scores, game_ids=game_ids, on_written=on_written)
+                box_scores = []
+                game_ids = []
+
+        BoxScoreInserter.write_traditional_box_scores(box_scores=box_scores, game_ids=game_ids, on_written=on_written)
+
+    @staticmethod
+    def insert_traditional_box_scores_for_game(game_id, lookup=None):
+        if lookup is None:
+            lookup = BoxScoreLookup()
+
+        box_score = CachedClient.get_traditional_box_score(game_id=game_id)
+        BoxScoreInserter.write_traditional_box_scores(
+            box_scores=BoxScoreInserter.translate_traditional_box_scores(box_score=box_score, lookup=lookup))
+
+    @staticmethod
+    def fetch_traditional_box_score(game):
+        game_id, start_date = game
+        return CachedClient.get_traditional_box_score(game_id=str(game_id), finished=start_date < date.today())
+
+    @staticmethod
+    def is_complete(box_score, lookup):
+        # Every player of a complete game is stored, a game without player rows or with players that are not inserted
+        # yet is fetched again by the next run
+        game_id = lookup.get_game_id(box_score.game_id)
+        if game_id is None or len(box_score.player_box_scores) == 0:
+            return False
+
+        return all(lookup.get_player_id(player=player_box_score.player, game_id=game_id) is not None for player_box_score in box_score.player_box_scores)
+
+    @staticmethod
+    def translate_traditional_box_scores(box_score, lookup):
+        # Players or games that have not been inserted yet are skipped, same as the old per-row lookups did
+        game_id = lookup.get_game_id(box_score.game_id)
+        if game_id is None:
+            record(counter='box_scores_skipped', value=len(box_score.player_box_scores))
+            return []
+
+        box_scores = []
         for player_box_score in box_score.player_box_scores:
-            team = Team.objects.get(name=player_box_score.player.team.value)
-            try:
-                player = Player.objects.get(name=player_box_score.player.name,
-                                            team=team,
-                                            nba_id=player_box_score.player.id)
-                game = Game.objects.get(nba_id=box_score.game_id)
-                TraditionalBoxScore.objects.get_or_create(
-                    player=player,
-                    game=game,
-                    seconds_played=player_box_score.seconds_played,
-                    field_goals=player_box_score.field_goals_made,
-                    field_goal_attempts=player_box_score.field_goal_attempts,
-                    three_point_field_goals=player_box_score.three_point_field_goals_made,
-                    three_point_field_goal_attempts=player_box_score.three_point_field_goal_attempts,
-                    free_throws=player_box_score.free_throws_made,
-                    free_throw_attempts=player_box_score.free_throws_attempts,
-                    offensive_rebounds=player_box_score.offensive_rebounds,
-                    defensive_rebounds=player_box_score.defensive_rebounds,
-                    assists=player_box_score.assists,
-                    steals=player_box_score.steals,
-                    blocks=player_box_score.blocks,
-                    turnovers=player_box_score.turnovers,
-                    fouls_committed=player_box_score.personal_fouls,
-                    plus_minus=player_box_score.plus_minus,
-                )
-            except ObjectDoesNotExist:
+            player_id = lookup.get_player_id(player=player_box_score.player, game_id=game_id)
+            if player_id is None or lookup.is_inserted(player_id=player_id, game_id=game_id):
+                record(counter='box_scores_skipped')
                 continue
+
+            lookup.mark_inserted(player_id=player_id, game_id=game_id)
+            box_scores.append(BoxScoreInserter.build_traditional_box_score(player_box_score=player_box_score, player_id=player_id, game_id=game_id))
+
+        return box_scores
+
+    @staticmethod
+    def build_traditional_box_score(player_box_score, player_id, game_id):
+        return set_derived_statistics(box_score=TraditionalBoxScore(
+            player_id=player_id,
+            game_id=game_id,
+            seconds_played=player_box_score.seconds_played,
+            field_goals=player_box_score.field_goals_made,
+            field_goal_attempts=player_box_score.field_goal_attempts,
+            three_point_field_goals=player_box_score.three_point_field_goals_made,
+            three_point_field_goal_attempts=player_box_score.three_point_field_goal_attempts,
+            free_throws=player_box_score.free_throws_made,
+            free_throw_attempts=player_box_score.free_throws_attempts,
+            offensive_rebounds=player_box_score.offensive_rebounds,
+            defensive_rebounds=player_box_score.defensive_rebounds,
+            assists=player_box_score.assists,
+            steals=player_box_score.steals,
+            blocks=player_box_score.blocks,
+            turnovers=player_box_score.turnovers,
+            fouls_committed=player_box_score.personal_fouls,
+            plus_minus=player_box_score.plus_minus,
+        ))
+
+    @staticmethod
+    def write_traditional_box_scores(box_scores, game_ids=(), on_written=None):
+        if len(box_scores) == 0 and (on_written is None or len(game_ids) == 0):
+            return
+
+        with transaction.atomic():
+            TraditionalBoxScore.objects.bulk_create(box_scores, batch_size=get_bulk_batch_size(model=TraditionalBoxScore, objs=box_scores, batch_size=BoxScoreInserter.batch_size))
+            if on_written is not None:
+                on_written(game_ids)
+
+        record(counter='box_scores_inserted', value=len(box_scores))
\ No newline at end of file
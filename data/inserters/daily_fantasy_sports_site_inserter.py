@@ -9,5 +9,5 @@ class DailyFantasySportsSiteInserter:
 
     @staticmethod
     def insert_daily_fantasy_sports_sites():
-        for site in DailyFantasySportsSite.members:
-            DailyFantasySportsSiteModel.update_or_create(name=site.name)
\ No newline at end of file
+        for site in DailyFantasySportsSite:
+            DailyFantasySportsSiteModel.objects.get_or_create(name=site.value)
\ No newline at end of file
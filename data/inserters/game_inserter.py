@@ -1,33 +1,57 @@
-from nba_data.client import Client
-from data.models import Team, Season, Game
-from data.objects.team import Team as TeamEnum
+from django.db import transaction
+
+from data.fetchers.cached_client import CachedClient
+from data.inserters.utils import get_bulk_batch_size
+from data.models import Game
+from data.profiling import record
+from data.reference_data import teams, seasons
 
 
 class GameInserter:
 
+    batch_size = 1000
+
     def __init__(self):
         pass
 
     @staticmethod
     def insert_games_for_season(season):
-        for team in TeamEnum:
-            team_obj = Team.objects.get(name=team.value)
-            home_game_counts = Game.objects.filter(home_team=team_obj, season=Season.objects.get(name=season.value)).count()
-            away_game_counts = Game.objects.filter(away_team=team_obj, season=Season.objects.get(name=season.value)).count()
+        # Fetches the season's schedule once and writes only the games that are new or whose teams or date changed
+        return GameInserter.insert_games(games=CachedClient.get_games_for_season(season=season),
+                                         existing_games=Game.objects.filter(season=seasons.get(season.value)))
 
-            # shitty way to check things
-            if home_game_counts < 41 or away_game_counts < 41 or home_game_counts + away_game_counts < 82:
-                GameInserter.insert_games_for_team(season=season, team=team)
+    @staticmethod
+    def insert_games_for_date(game_date):
+        # The scoreboard lists the date's games before they are played, so they can be polled while they are live
+        games = CachedClient.get_games_for_date(game_date=game_date)
+        return GameInserter.insert_games(games=games, existing_games=Game.objects.filter(nba_id__in=[game.nba_id for game in games]))
 
     @staticmethod
-    def insert_games_for_team(season, team):
-        for game in Client.get_games_for_team(season=season, team=team):
-            home_team = Team.objects.get(name=game.matchup.home_team.value)
-            away_team = Team.objects.get(name=game.matchup.away_team.value)
-            Game.objects.get_or_create(
-                home_team=home_team,
-                away_team=away_team,
-                start_date=game.date,
-                season=Season.objects.get(name=season.value),
-                nba_id=game.nba_id)
+    def insert_games(games, existing_games):
+        existing_games = {nba_id: (game_id, home_team_id, away_team_id, start_date)
+                          for game_id, nba_id, home_team_id, away_team_id, start_date
+                          in existing_games.values_list('id', 'nba_id', 'home_team_id', 'away_team_id', 'start_date')}
+        new_games = []
+        changed_games = []
+        unchanged_game_count = 0
+        for game in games:
+            home_team_id = teams.get(game.matchup.home_team.value).id
+            away_team_id = teams.get(game.matchup.away_team.value).id
+            existing_game = existing_games.get(game.nba_id)
+            if existing_game is None:
+                new_games.append(Game(home_team_id=home_team_id, away_team_id=away_team_id, start_date=game.date,
+                                      season=seasons.get(game.season.value), nba_id=game.nba_id))
+            elif existing_game[1:] != (home_team_id, away_team_id, game.date):
+                changed_games.append((existing_game[0], home_team_id, away_team_id, game.date))
+            else:
+                unchanged_game_count += 1
+
+        with transaction.atomic():
+            Game.objects.bulk_create(new_games, batch_size=get_bulk_batch_size(model=Game, objs=new_games, batch_size=GameInserter.batch_size))
+            for game_id, home_team_id, away_team_id, start_date in changed_games:
+                Game.objects.filter(id=game_id).update(home_team_id=home_team_id, away_team_id=away_team_id, start_date=start_date)
 
+        record(counter='games_inserted', value=len(new_games))
+        record(counter='games_updated', value=len(changed_games))
+        record(counter='games_skipped', value=unchanged_game_count)
+        return len(new_games), len(changed_games)
@@ -0,0 +1,251 @@
+import time
+from datetime import datetime, timedelta
+
+import pytz
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from requests import RequestException
+
+from data.data_version import bump_data_version
+from data.fetchers.cached_client import CachedClient
+from data.fetchers.concurrent_fetcher import ConcurrentFetcher
+from data.inserters.box_score_inserter import BoxScoreInserter, BoxScoreLookup
+from data.inserters.game_inserter import GameInserter
+from data.inserters.utils import get_bulk_batch_size
+from data.models import Game, TraditionalBoxScore
+from data.profiling import record
+
+SCHEDULED = 'scheduled'
+LIVE = 'live'
+FINAL = 'final'
+
+# Every stored box score field but its keys, the derived statistics are compared too so a scoring change rewrites the row
+SNAPSHOT_FIELDS = [field.attname for field in TraditionalBoxScore._meta.concrete_fields if field.name not in ('id', 'player', 'game')]
+
+
+class LiveGame:
+
+    def __init__(self, game_id, nba_id):
+        self.game_id = game_id
+        self.nba_id = nba_id
+        self.state = SCHEDULED
+        self.next_poll_at = 0
+        self.interval = None
+        self.last_changed_at = None
+
+
+class LiveBoxScorePoller:
+
+    batch_size = 1000
+
+    # Polls the box scores of one date's games. The box scores of the date are kept in memory as they were last written,
+    # so every poll only writes the rows whose statistics changed. slate_date fixes the date and ignores the game window
+    def __init__(self, fetcher=None, slate_date=None, options=None):
+        self.fetcher = fetcher or ConcurrentFetcher()
+        self.options = dict(getattr(settings, 'LIVE_BOX_SCORES', {}), **(options or {}))
+        self.time_zone = pytz.timezone(self.options['TIME_ZONE'])
+        self.fixed_slate_date = slate_date
+        self.slate_date = None
+        self.schedule_loaded = False
+        self.games = {}
+        self.snapshots = {}
+        self.stale_game_ids = set()
+        self.lookup = None
+
+    def get_slate_date(self, now):
+        if self.fixed_slate_date is not None:
+            return self.fixed_slate_date
+
+        # Games that tipped off late the evening before are still being played until the window end hour
+        local_now = datetime.fromtimestamp(now, self.time_zone)
+        if local_now.hour < self.options['WINDOW_END_HOUR']:
+            return local_now.date() - timedelta(days=1)
+
+        return local_now.date()
+
+    def get_window(self, slate_date):
+        window_start = self.time_zone.localize(datetime(slate_date.year, slate_date.month, slate_date.day, self.options['WINDOW_START_HOUR']))
+        next_date = slate_date + timedelta(days=1)
+        window_end = self.time_zone.localize(datetime(next_date.year, next_date.month, next_date.day, self.options['WINDOW_END_HOUR']))
+        return LiveBoxScorePoller.to_timestamp(window_start), LiveBoxScorePoller.to_timestamp(window_end)
+
+    @staticmethod
+    def to_timestamp(value):
+        return (value - datetime(1970, 1, 1, tzinfo=pytz.utc)).total_seconds()
+
+    def load_slate(self, slate_date):
+        self.slate_date = slate_date
+        self.schedule_loaded = False
+        self.games = {}
+        self.snapshots = {}
+        self.stale_game_ids = set()
+        self.load_games()
+
+    def load_games(self):
+        # The league game logs only list games once they were played, so the date's games are inserted from the scoreboard
+        # first. Without the scoreboard the stored games are polled and the scoreboard is tried again on the next poll
+        try:
+            inserted_game_count, changed_game_count = GameInserter.insert_games_for_date(game_date=self.slate_date)
+            schedule_loaded = True
+        except (RequestException, ValueError, LookupError):
+            inserted_game_count, changed_game_count = 0, 0
+            schedule_loaded = False
+            record(counter='live_schedule_errors')
+
+        if inserted_game_count > 0 or changed_game_count > 0:
+            bump_data_version()
+
+        # One query for the date's games and one for the stored box scores of the games that are new to the slate
+        new_games = {game_id: LiveGame(game_id=game_id, nba_id=nba_id)
+                     for game_id, nba_id in Game.objects.filter(start_date=self.slate_date).values_list('id', 'nba_id')
+                     if game_id not in self.games}
+        self.load_snapshots(game_ids=new_games.keys())
+        self.games.update(new_games)
+        self.schedule_loaded = schedule_loaded
+
+        # Players are looked up again whenever games are added so that players inserted since are found, and so that
+        # the lookup knows the season of every game
+        self.lookup = BoxScoreLookup()
+
+    def load_snapshots(self, game_ids):
+        game_ids = set(game_ids)
+        for key in [key for key in self.snapshots if key[1] in game_ids]:
+            del self.snapshots[key]
+
+        for values in TraditionalBoxScore.objects.filter(game_id__in=list(game_ids)).values_list('player_id', 'game_id', *SNAPSHOT_FIELDS):
+            self.snapshots[values[:2]] = tuple(values[2:])
+
+    def is_slate_final(self):
+        return all(game.state == FINAL for game in self.games.values())
+
+    def poll(self, now=None):
+        # Polls the games that are due and returns what was written along with the seconds until the next game is due
+        if now is None:
+            now = time.time()
+
+        started_at = time.time()
+        slate_date = self.get_slate_date(now=now)
+        if slate_date != self.slate_date:
+            self.load_slate(slate_date=slate_date)
+        elif not self.schedule_loaded:
+            self.load_games()
+
+        if self.stale_game_ids:
+            self.load_snapshots(game_ids=self.stale_game_ids)
+            self.stale_game_ids = set()
+
+        result = {'date': slate_date, 'games': 0, 'inserted': 0, 'updated': 0, 'seconds': 0, 'wait': self.options['IDLE_INTERVAL']}
+        if self.fixed_slate_date is None:
+            window_start, window_end = self.get_window(slate_date=slate_date)
+            if now < window_start:
+                result['wait'] = min(window_start - now, self.options['IDLE_INTERVAL'])
+                return result
+
+            if now >= window_end:
+                for game in self.games.values():
+                    game.state = FINAL
+                return result
+
+        due_games = [game for game in self.games.values() if game.state != FINAL and game.next_poll_at <= now]
+        new_box_scores = []
+        changed_box_scores = []
+        box_scores = self.fetcher.fetch(fetch=LiveBoxScorePoller.fetch_box_score, arguments=due_games) if due_games else []
+        for game, box_score in box_scores:
+            if box_score is None:
+                # A failed request is retried at the game's current interval instead of stopping the poller
+                game.next_poll_at = now + (game.interval or self.options['SCHEDULED_INTERVAL'])
+                record(counter='live_box_score_errors')
+                continue
+
+            # The rows of a game that has not started yet hold no statistics, they are written once anyone has played
+            new_game_box_scores, changed_game_box_scores, played = self.diff(game=game, box_score=box_score)
+            if played:
+                new_box_scores.extend(new_game_box_scores)
+                changed_box_scores.extend(changed_game_box_scores)
+
+            self.update_state(game=game, now=now, played=played, changed=len(new_game_box_scores) + len(changed_game_box_scores) > 0)
+
+        try:
+            self.write(new_box_scores=new_box_scores, changed_box_scores=changed_box_scores)
+        except DatabaseError:
+            # Rows inserted by insert_data in the meantime or a lost connection leave the stored box scores of these games
+            # unknown, they are read again before the next poll and the games are fetched again right away
+            for box_score in new_box_scores + changed_box_scores:
+                self.stale_game_ids.add(box_score.game_id)
+                self.games[box_score.game_id].next_poll_at = now
+
+            raise
+
+        for box_score in new_box_scores + changed_box_scores:
+            self.snapshots[(box_score.player_id, box_score.game_id)] = LiveBoxScorePoller.get_snapshot(box_score)
+
+        pending_games = [game for game in self.games.values() if game.state != FINAL]
+        if pending_games:
+            result['wait'] = max(min(game.next_poll_at for game in pending_games) - now, 0)
+
+        result.update(games=len(due_games), inserted=len(new_box_scores), updated=len(changed_box_scores), seconds=time.time() - started_at)
+        return result
+
+    @staticmethod
+    def fetch_box_score(game):
+        try:
+            return game, CachedClient.get_traditional_box_score(game_id=str(game.nba_id), live=True)
+        except (RequestException, ValueError):
+            return game, None
+
+    @staticmethod
+    def get_snapshot(box_score):
+        return tuple(getattr(box_score, field) for field in SNAPSHOT_FIELDS)
+
+    def diff(self, game, box_score):
+        new_box_scores = []
+        changed_box_scores = []
+        played = False
+        for player_box_score in box_score.player_box_scores:
+            player_id = self.lookup.get_player_id(player=player_box_score.player, game_id=game.game_id)
+            if player_id is None:
+                record(counter='box_scores_skipped')
+                continue
+
+            played = played or bool(player_box_score.seconds_played)
+            traditional_box_score = BoxScoreInserter.build_traditional_box_score(player_box_score=player_box_score, player_id=player_id, game_id=game.game_id)
+            snapshot = self.snapshots.get((player_id, game.game_id))
+            if snapshot is None:
+                new_box_scores.append(traditional_box_score)
+            elif snapshot != LiveBoxScorePoller.get_snapshot(traditional_box_score):
+                changed_box_scores.append(traditional_box_score)
+
+        return new_box_scores, changed_box_scores, played
+
+    def update_state(self, game, now, played, changed):
+        # A game is live once anyone has played, it is polled faster after every change and slower while nothing changes,
+        # and is final once nothing changed for FINAL_AFTER seconds
+        if not played:
+            game.state = SCHEDULED
+            game.interval = self.options['SCHEDULED_INTERVAL']
+        elif changed or game.state != LIVE:
+            game.state = LIVE
+            game.interval = self.options['LIVE_INTERVAL']
+            game.last_changed_at = now
+        else:
+            game.interval = min(game.interval * 2, self.options['MAX_LIVE_INTERVAL'])
+            if now - game.last_changed_at >= self.options['FINAL_AFTER']:
+                game.state = FINAL
+
+        game.next_poll_at = now + game.interval
+
+    @staticmethod
+    def write(new_box_scores, changed_box_scores):
+        if len(new_box_scores) == 0 and len(changed_box_scores) == 0:
+            return
+
+        with transaction.atomic():
+            TraditionalBoxScore.objects.bulk_create(new_box_scores, batch_size=get_bulk_batch_size(model=TraditionalBoxScore, objs=new_box_scores,
+                                                                                                   batch_size=LiveBoxScorePoller.batch_size))
+            for box_score in changed_box_scores:
+                TraditionalBoxScore.objects.filter(player_id=box_score.player_id, game_id=box_score.game_id).update(
+                    **{field: getattr(box_score, field) for field in SNAPSHOT_FIELDS})
+
+        bump_data_version()
+        record(counter='box_scores_inserted', value=len(new_box_scores))
+        record(counter='box_scores_updated', value=len(changed_box_scores))
\ No newline at end of file
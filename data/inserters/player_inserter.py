@@ -1,31 +1,62 @@
-from nba_data.client import Client
-from data.models import Player, Team, Position, Season
+from django.db import transaction
+
+from data.fetchers.cached_client import CachedClient
+from data.fetchers.concurrent_fetcher import ConcurrentFetcher
+from data.inserters.utils import get_bulk_batch_size
+from data.models import Player
+from data.profiling import record
+from data.reference_data import teams, positions, seasons
 
 
 class PlayerInserter:
 
+    batch_size = 1000
+
     def __init__(self):
         pass
 
     @staticmethod
-    def insert_players_for_season(season):
-        for player in Client.get_players_for_season(season=season):
-            team = None
+    def insert_players_for_season(season, fetcher=None):
+        # Players are keyed by (name, team, season), only the missing ones need their details fetched
+        if fetcher is None:
+            fetcher = ConcurrentFetcher()
+
+        season_obj = seasons.get(season.value)
+        existing_keys = set(Player.objects.filter(season=season_obj).values_list('name', 'team_id', 'season_id'))
+        missing_players = {}
+        for player in CachedClient.get_players_for_season(season=season):
+            team_id = None
             if player.team is not None:
-                team = Team.objects.get(name=player.team.value)
+                team_id = teams.get(player.team.value).id
+
+            key = (player.name, team_id, season_obj.id)
+            if key in existing_keys or key in missing_players:
+                record(counter='players_skipped')
+                continue
 
-            player_count = Player.objects.filter(name=player.name, team=team, season=Season.objects.get(name=season.value)).count()
-            if player_count == 0:
-                player_details = Client.get_player_info(player_id=player.id)
+            missing_players[key] = player.id
 
-                position_name = ""
-                if player_details.position is not None:
-                    position_name = player_details.position.value.lower()
+        new_players = []
+        for key, player_details in fetcher.fetch(fetch=PlayerInserter.fetch_player_info, arguments=list(missing_players.items())):
+            name, team_id, season_id = key
+            position_name = ""
+            if player_details.position is not None:
+                position_name = player_details.position.value.lower()
 
-                Player.objects.get_or_create(name=player.name,
-                                             position=Position.objects.get(name=position_name),
-                                             team=team,
-                                             season=Season.objects.get(name=season.value),
-                                             jersey_number=player_details.jersey_number,
-                                             nba_id=player.id)
+            new_players.append(Player(name=name,
+                                      position=positions.get(position_name),
+                                      team_id=team_id,
+                                      season_id=season_id,
+                                      jersey_number=player_details.jersey_number,
+                                      nba_id=missing_players[key]))
 
+        with transaction.atomic():
+            Player.objects.bulk_create(new_players, batch_size=get_bulk_batch_size(model=Player, objs=new_players, batch_size=PlayerInserter.batch_size))
+
+        record(counter='players_inserted', value=len(new_players))
+        return len(new_players)
+
+    @staticmethod
+    def fetch_player_info(missing_player):
+        key, player_id = missing_player
+        return key, CachedClient.get_player_info(player_id=player_id)
\ No newline at end of file
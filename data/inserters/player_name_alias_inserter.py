@@ -0,0 +1,24 @@
+from data.models import PlayerNameAlias
+
+
+class PlayerNameAliasInserter:
+
+    # (source, alias, NBA name), a blank source applies to every salary source
+    aliases = (
+        ('DraftKings', 'Patty Mills', 'Patrick Mills'),
+        ('DraftKings', 'Luc Richard Mbah a Moute', 'Luc Mbah a Moute'),
+        ('DraftKings', 'Louis Amundson', 'Lou Amundson'),
+        ('FanDuel', 'Brad Beal', 'Bradley Beal'),
+        ('FanDuel', 'Jose Juan Barea', 'J.J. Barea'),
+        ('FanDuel', 'Louis Williams', 'Lou Williams'),
+        ('FanDuel', 'Ishmael Smith', 'Ish Smith'),
+        ('', 'Nene Hilario', 'Nene'),
+    )
+
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def insert_player_name_aliases():
+        for source, alias, name in PlayerNameAliasInserter.aliases:
+            PlayerNameAlias.objects.update_or_create(source=source, alias=alias, defaults={'name': name})
\ No newline at end of file
@@ -1,13 +1,38 @@
+from nba_data.data.team import team_abbreviation_to_name_map
+
 from data.objects.team import Team as TeamEnum
-from data.models import Team as TeamModel
+from data.models import Team as TeamModel, TeamAbbreviation
+from data.translators.team_abbreviations import NBA_SOURCE, BASKETBALL_REFERENCE_SOURCE
 
 
 class TeamInserter:
 
+    # Abbreviations each source uses instead of the NBA's, every other team uses the NBA abbreviation in every source
+    abbreviation_aliases = {
+        BASKETBALL_REFERENCE_SOURCE: {'BRK': 'BKN', 'CHO': 'CHA', 'PHO': 'PHX'},
+        'DraftKings': {'NY': 'NYK', 'SA': 'SAS', 'GS': 'GSW', 'NO': 'NOP', 'PHO': 'PHX'},
+        'FanDuel': {'NY': 'NYK', 'SA': 'SAS', 'GS': 'GSW', 'NO': 'NOP'},
+    }
+
     def __init__(self):
         pass
 
     @staticmethod
     def insert_teams():
-        for team_name in [team_name.value for team_name in TeamEnum]:
-            TeamModel.objects.update_or_create(name=team_name)
\ No newline at end of file
+        nba_abbreviations = {team: abbreviation for abbreviation, team in team_abbreviation_to_name_map.items()}
+        teams = {}
+        for team in TeamEnum:
+            teams[nba_abbreviations[team]], created = TeamModel.objects.update_or_create(name=team.value,
+                                                                                          defaults={'abbreviation': nba_abbreviations[team]})
+
+        TeamInserter.insert_team_abbreviations(teams=teams)
+
+    @staticmethod
+    def insert_team_abbreviations(teams):
+        for source in [NBA_SOURCE] + sorted(TeamInserter.abbreviation_aliases.keys()):
+            source_teams = teams.copy()
+            for alias, abbreviation in TeamInserter.abbreviation_aliases.get(source, {}).items():
+                source_teams[alias] = teams[abbreviation]
+
+            for abbreviation, team in source_teams.items():
+                TeamAbbreviation.objects.update_or_create(source=source, abbreviation=abbreviation, defaults={'team': team})
\ No newline at end of file
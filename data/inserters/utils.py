@@ -0,0 +1,7 @@
+from django.db import connection
+
+
+def get_bulk_batch_size(model, objs, batch_size):
+    # Django 1.9 uses an explicit batch size as is, so SQLite's own limit per INSERT has to be applied here
+    fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+    return max(min(batch_size, connection.ops.bulk_batch_size(fields, objs)), 1)
\ No newline at end of file
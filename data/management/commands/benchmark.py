@@ -0,0 +1,169 @@
+import json
+import platform
+import shutil
+import tempfile
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, reset_queries
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings, setup_test_environment, teardown_test_environment
+
+import data.validators.inserters as salary_inserters
+from data.benchmarks.fixtures import use_synthetic_league, clear_caches, insert_reference_data, insert_players, insert_games, insert_box_scores
+from data.benchmarks.synthetic_league import SyntheticLeague
+from data.fetchers.cached_client import CachedClient
+from data.fetchers.concurrent_fetcher import ConcurrentFetcher
+from data.models import Team, Position, Season, Player, Game, TraditionalBoxScore, DailyFantasySportsSite, PlayerSalary, UnmatchedSalary
+from data.profiling import IngestionProfiler
+
+
+class Command(BaseCommand):
+
+    help = 'Loads a synthetic league into a throwaway test database through the inserters and the API and writes the timings as JSON'
+    # (name, model) of every API resource, each one is timed on its list and on the detail of its first row
+    resources = (
+        ('teams', Team),
+        ('positions', Position),
+        ('seasons', Season),
+        ('players', Player),
+        ('games', Game),
+        ('box_scores', TraditionalBoxScore),
+        ('daily_fantasy_sports_sites', DailyFantasySportsSite),
+        ('player_salaries', PlayerSalary),
+    )
+    counted_models = (Player, Game, TraditionalBoxScore, PlayerSalary, UnmatchedSalary)
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seasons', type=int, default=2, help='Number of seasons in the synthetic league, counting back from the latest')
+        parser.add_argument('--players-per-team', type=int, default=15)
+        parser.add_argument('--games-per-team', type=int, default=82)
+        parser.add_argument('--salary-days', type=int, default=20, help='Number of game days per season with DraftKings and FanDuel salary files')
+        parser.add_argument('--workers', type=int, default=1, help='Workers used to fetch player details and box scores and to parse salary files')
+        parser.add_argument('--api-iterations', type=int, default=20, help='Number of timed requests per API endpoint')
+        parser.add_argument('--response-cache', action='store_true', default=False,
+                            help='Leave the API response cache on, by default every request is rendered by its view')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--profile-dir', default=None, help='Dump a cProfile file for each ingestion stage to this directory')
+        parser.add_argument('--output', default='-', help='Path of the JSON results, - writes them to stdout')
+
+    def handle(self, *args, **options):
+        league = SyntheticLeague(season_count=options['seasons'], players_per_team=options['players_per_team'],
+                                 games_per_team=options['games_per_team'], seed=options['seed'])
+        salary_directory = tempfile.mkdtemp(prefix='nba_persistence_benchmark_')
+        original_cache = CachedClient.cache
+        original_salary_directory = salary_inserters.SALARY_DIRECTORY
+        old_database_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            fake_nba_api = use_synthetic_league(league=league)
+            salary_inserters.SALARY_DIRECTORY = salary_directory
+            clear_caches()
+            salary_file_count = len(league.write_salary_files(directory=salary_directory, day_count=options['salary_days']))
+
+            profiler = IngestionProfiler(profile_directory=options['profile_dir'])
+            Command.run_ingestion(league=league, profiler=profiler, workers=options['workers'])
+            api_results = Command.run_api(iterations=options['api_iterations'], response_cache=options['response_cache'])
+            results = OrderedDict([
+                ('created_at', datetime.utcnow().isoformat()),
+                ('python', platform.python_version()),
+                ('database', connection.vendor),
+                ('options', OrderedDict((name, options[name]) for name in ('seasons', 'players_per_team', 'games_per_team', 'salary_days',
+                                                                            'workers', 'api_iterations', 'response_cache', 'seed'))),
+                ('salary_files', salary_file_count),
+                ('nba_api_requests', fake_nba_api.request_counts),
+                ('rows', OrderedDict((model.__name__, model.objects.count()) for model in Command.counted_models)),
+                ('ingestion', profiler.get_report()),
+                ('api', api_results),
+            ])
+        finally:
+            CachedClient.cache = original_cache
+            salary_inserters.SALARY_DIRECTORY = original_salary_directory
+            connection.creation.destroy_test_db(old_database_name, verbosity=0)
+            clear_caches()
+            shutil.rmtree(salary_directory, ignore_errors=True)
+
+        results_json = json.dumps(results, indent=2)
+        if options['output'] == '-':
+            self.stdout.write(results_json)
+        else:
+            with open(options['output'], 'w') as results_file:
+                results_file.write(results_json)
+
+    @staticmethod
+    def run_ingestion(league, profiler, workers):
+        # Every stage runs twice, the second run measures a load where everything is already inserted
+        with profiler.stage('static_data'):
+            insert_reference_data()
+
+        start_date = min(min(league.get_game_days(season=season)) for season in league.seasons)
+        end_date = max(max(league.get_game_days(season=season)) for season in league.seasons)
+        for suffix in ('', '_rerun'):
+            with profiler.stage('players' + suffix):
+                insert_players(league=league, fetcher=ConcurrentFetcher(workers=workers))
+
+            with profiler.stage('games' + suffix):
+                insert_games(league=league)
+
+            with profiler.stage('box_scores' + suffix):
+                insert_box_scores(fetcher=ConcurrentFetcher(workers=workers))
+
+            with profiler.stage('dfs_salaries' + suffix) as report:
+                salary_count, file_count = salary_inserters.insert_dfs_salaries(start_date=start_date, end_date=end_date, workers=workers)
+                report.record(counter='salaries_written', value=salary_count)
+                report.record(counter='salary_files_loaded', value=file_count)
+
+    @staticmethod
+    def run_api(iterations, response_cache):
+        api_response_cache = dict(getattr(settings, 'API_RESPONSE_CACHE', {}), ENABLED=response_cache)
+        results = []
+        setup_test_environment()
+        try:
+            with override_settings(API_RESPONSE_CACHE=api_response_cache):
+                client = Client()
+                for name, model in Command.resources:
+                    results.append(Command.time_requests(client=client, name='{0} list'.format(name), path='/{0}/'.format(name), iterations=iterations))
+                    first_id = model.objects.order_by('id').values_list('id', flat=True).first()
+                    if first_id is not None:
+                        results.append(Command.time_requests(client=client, name='{0} detail'.format(name),
+                                                             path='/{0}/{1}/'.format(name, first_id), iterations=iterations))
+        finally:
+            teardown_test_environment()
+
+        return results
+
+    @staticmethod
+    def time_requests(client, name, path, iterations):
+        # The first request is not timed, it counts the queries and loads anything that is cached per process.
+        # An endpoint whose view raises is reported with the error instead of timings
+        result = OrderedDict([('endpoint', name), ('path', path)])
+        # The query log is a bounded deque, once it is full CaptureQueriesContext counts no queries at all
+        reset_queries()
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(path)
+        except Exception as error:
+            result['error'] = repr(error)
+            return result
+
+        durations = []
+        for iteration in range(iterations):
+            start = time.time()
+            client.get(path)
+            durations.append(time.time() - start)
+
+        durations.sort()
+        result.update([
+            ('status', response.status_code),
+            ('bytes', len(response.content)),
+            ('queries', len(queries)),
+            ('iterations', iterations),
+            ('mean_seconds', round(sum(durations) / len(durations), 6) if durations else None),
+            ('median_seconds', round(durations[len(durations) // 2], 6) if durations else None),
+            ('p95_seconds', round(durations[min(len(durations) - 1, int(len(durations) * 0.95))], 6) if durations else None),
+            ('min_seconds', round(durations[0], 6) if durations else None),
+            ('max_seconds', round(durations[-1], 6) if durations else None),
+        ])
+        return result
\ No newline at end of file
@@ -0,0 +1,44 @@
+import csv
+import sys
+
+from django.core.management.base import BaseCommand
+
+from data.calculators.nba import calculate_draftkings_points_for_season, DRAFTKINGS_CONTRIBUTIONS
+from data.exporters.utils import read_in_chunks
+from data.models import Season
+
+
+class Command(BaseCommand):
+
+    help = 'Calculates DraftKings points, double and triple doubles and per category contributions for whole seasons'
+    chunk_size = 5000
+    value_fields = ['id', 'player_id', 'game_id', 'is_double_double', 'is_triple_double'] + DRAFTKINGS_CONTRIBUTIONS + ['draftkings_total']
+
+    def add_arguments(self, parser):
+        parser.add_argument('--season', action='append', dest='seasons', default=None,
+                            help='Season name such as 2015-16, can be repeated, defaults to every season')
+        parser.add_argument('--output', default=None, help='CSV file to write to instead of stdout')
+
+    def handle(self, *args, **options):
+        season_names = options['seasons']
+        if season_names is None:
+            season_names = list(Season.objects.order_by('name').values_list('name', flat=True))
+
+        output_file = sys.stdout if options['output'] is None else open(options['output'], 'w')
+        try:
+            writer = csv.writer(output_file)
+            writer.writerow(['season'] + Command.value_fields)
+            for season_name in season_names:
+                queryset = calculate_draftkings_points_for_season(season_name=season_name).values_list(*Command.value_fields)
+                for chunk in read_in_chunks(queryset=queryset, chunk_size=Command.chunk_size):
+                    writer.writerows([season_name] + [Command.format_value(value) for value in row] for row in chunk)
+        finally:
+            if output_file is not sys.stdout:
+                output_file.close()
+
+    @staticmethod
+    def format_value(value):
+        if isinstance(value, bool):
+            return int(value)
+
+        return value
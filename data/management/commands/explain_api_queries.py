@@ -0,0 +1,112 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from rest_framework.request import Request
+
+from data.pagination import KeysetPagination
+from data.views import GameViewSet, BoxScoreViewSet, PlayerSalaryViewSet
+
+
+class Command(BaseCommand):
+
+    help = 'Runs EXPLAIN on the canonical query of each API endpoint and reports sequential table scans and sorts of every matching row'
+    # (name, path, viewset, query parameters), each one mirrors a filter and ordering combination the API is used with
+    endpoints = (
+        ('games by home team', '/games/', GameViewSet, {'home_team_abbreviation': 'BOS', 'unix_start_time': '1445990400'}),
+        ('games by season', '/games/', GameViewSet, {'season_start_year': '2015'}),
+        ('box scores by date', '/box_scores/', BoxScoreViewSet, {}),
+        ('box scores by team', '/box_scores/', BoxScoreViewSet, {'team_abbreviation': 'BOS'}),
+        ('box scores by draftkings points', '/box_scores/', BoxScoreViewSet, {'ordering': 'draftkings_points'}),
+        ('box scores by fanduel points', '/box_scores/', BoxScoreViewSet, {'ordering': 'fanduel_points'}),
+        ('player salaries by site and salary', '/player_salaries/', PlayerSalaryViewSet, {'site_name': 'DraftKings', 'salary_min': '8000'}),
+    )
+    sequential_scan_patterns = {
+        'postgresql': re.compile(r'Seq Scan on (\w+)'),
+        'sqlite': re.compile(r'^SCAN (?:TABLE )?(\w+)\b(?! USING (?:COVERING )?INDEX)'),
+    }
+    # A sort of the whole result means the page is only cut after every matching row was read, incremental sorts
+    # and SQLite's sorts of the right part of an ORDER BY only sort the rows that share the indexed prefix
+    full_sort_patterns = {
+        'postgresql': re.compile(r'^(?:->\s*)?Sort\s'),
+        'sqlite': re.compile(r'^USE TEMP B-TREE FOR ORDER BY'),
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument('--analyze', action='store_true', default=False,
+                            help='Run ANALYZE first, the planners pick the join order from table statistics and SQLite has none until then')
+        parser.add_argument('--verbose-plans', action='store_true', default=False, help='Print the full plan of every query')
+        parser.add_argument('--fail-on-sequential-scan', action='store_true', default=False,
+                            help='Exit with an error when any query scans a table sequentially or sorts every matching row, small tables are often scanned regardless of indexes')
+
+    def handle(self, *args, **options):
+        if options['analyze']:
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+        unindexed_queries = set()
+        for name, path, viewset, query_parameters in Command.endpoints:
+            sql, parameters = Command.get_page_queryset(path=path, viewset=viewset, query_parameters=query_parameters).query.sql_with_params()
+            plan = Command.explain(sql=sql, parameters=parameters)
+            scanned_tables = Command.get_sequential_scans(plan=plan)
+            sorts_every_row = Command.has_full_sort(plan=plan)
+            problems = []
+            if scanned_tables:
+                problems.append('sequential scan on {0}'.format(', '.join(scanned_tables)))
+
+            if sorts_every_row:
+                problems.append('sorts every matching row')
+
+            if problems:
+                unindexed_queries.add(name)
+                self.stdout.write('{0}: {1}'.format(name, ', '.join(problems)))
+            else:
+                self.stdout.write('{0}: indexed'.format(name))
+
+            if options['verbose_plans']:
+                self.stdout.write('\n'.join('    {0}'.format(line) for line in plan))
+
+        if unindexed_queries and options['fail_on_sequential_scan']:
+            raise CommandError('{0} of {1} queries scan a table sequentially or sort every matching row'.format(len(unindexed_queries), len(Command.endpoints)))
+
+    @staticmethod
+    def get_page_queryset(path, viewset, query_parameters):
+        request = Request(RequestFactory().get(path, query_parameters))
+        view = viewset(request=request, format_kwarg=None, action='list')
+        queryset = view.get_queryset()
+        paginator = view.paginator
+        if isinstance(paginator, KeysetPagination):
+            return paginator.get_page_queryset(queryset=queryset, request=request)
+
+        page_size = getattr(paginator, 'page_size', None) or 10
+        return queryset[:page_size]
+
+    @staticmethod
+    def explain(sql, parameters):
+        if connection.vendor == 'postgresql':
+            explain_sql = 'EXPLAIN {0}'
+        elif connection.vendor == 'sqlite':
+            explain_sql = 'EXPLAIN QUERY PLAN {0}'
+        else:
+            raise CommandError('EXPLAIN is not supported for {0}'.format(connection.vendor))
+
+        with connection.cursor() as cursor:
+            cursor.execute(explain_sql.format(sql), parameters)
+            return [row[-1] for row in cursor.fetchall()]
+
+    @staticmethod
+    def get_sequential_scans(plan):
+        pattern = Command.sequential_scan_patterns[connection.vendor]
+        scanned_tables = []
+        for line in plan:
+            match = pattern.search(line.strip())
+            if match is not None and match.group(1) not in scanned_tables:
+                scanned_tables.append(match.group(1))
+
+        return scanned_tables
+
+    @staticmethod
+    def has_full_sort(plan):
+        pattern = Command.full_sort_patterns[connection.vendor]
+        return any(pattern.search(line.strip()) is not None for line in plan)
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from data.exporters.box_score_exporter import BoxScoreExporter
+
+
+class Command(BaseCommand):
+
+    filter_names = ('name', 'team_abbreviation', 'unix_start_time', 'unix_end_time')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=sorted(BoxScoreExporter.content_types.keys()), default='ndjson')
+        parser.add_argument('--output', default=None, help='File to write to instead of stdout')
+        for filter_name in Command.filter_names:
+            parser.add_argument('--{0}'.format(filter_name.replace('_', '-')), dest=filter_name, default=None)
+
+    def handle(self, *args, **options):
+        query_params = {filter_name: options[filter_name] for filter_name in Command.filter_names if options[filter_name] is not None}
+        lines = BoxScoreExporter.export(export_format=options['format'], query_params=query_params)
+        if options['output'] is None:
+            for line in lines:
+                self.stdout.write(line, ending='')
+        else:
+            with open(options['output'], 'w') as output_file:
+                for line in lines:
+                    output_file.write(line)
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from data.exporters.snapshot_exporter import SnapshotExporter
+
+
+class Command(BaseCommand):
+
+    help = 'Writes per season columnar snapshots of games, players, box scores and salaries along with a manifest'
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help='Directory the snapshot is written to')
+        parser.add_argument('--format', choices=sorted(SnapshotExporter.file_extensions.keys()), default='parquet')
+        parser.add_argument('--season', action='append', dest='seasons', default=None,
+                            help='Season name such as 2015-16, can be repeated, defaults to every season')
+
+    def handle(self, *args, **options):
+        try:
+            import pyarrow
+        except ImportError:
+            raise CommandError('Snapshots require the pyarrow package')
+
+        manifest = SnapshotExporter.export(directory=options['output'],
+                                           export_format=options['format'],
+                                           season_names=options['seasons'])
+        self.stdout.write('Wrote {0} files with {1} rows'.format(len(manifest['files']),
+                                                                 sum(entry['rows'] for entry in manifest['files'])))
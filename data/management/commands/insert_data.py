@@ -1,12 +1,13 @@
-from django.core.management.base import BaseCommand
-
-from data.inserters.box_score_inserter import BoxScoreInserter
-from data.inserters.game_inserter import GameInserter
-from data.inserters.player_inserter import PlayerInserter
-from data.inserters.position_inserter import PositionInserter
-from data.inserters.season_inserter import SeasonInserter
-from data.inserters.team_inserter import TeamInserter
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from data.data_version import bump_data_version
+from data.fetchers.cached_client import CachedClient, ResponseCache
+from data.fetchers.concurrent_fetcher import ConcurrentFetcher
+from data.ingestion import IngestionGraph, get_ingestion_stages, backfill_seasons
 from data.objects.season import Season
+from data.profiling import IngestionProfiler
 
 
 class Command(BaseCommand):
@@ -14,20 +15,93 @@ class Command(BaseCommand):
     def __init__(self, stdout=None, stderr=None, no_color=False):
         super(Command, self).__init__(stdout, stderr, no_color)
 
+    def add_arguments(self, parser):
+        parser.add_argument('--start-season', default=Season.season_2015.value, help='First season to load, such as 2006-07')
+        parser.add_argument('--end-season', default=Season.season_2015.value, help='Last season to load, such as 2015-16')
+        parser.add_argument('--season-workers', type=int, default=1,
+                            help='Load each season in its own process, with up to this many seasons at once')
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Number of concurrent NBA API requests used to fetch player details and box scores')
+        parser.add_argument('--requests-per-second', type=float, default=None,
+                            help='Upper bound on NBA API requests per second across all workers')
+        parser.add_argument('--replay-only', action='store_true', default=False,
+                            help='Only use cached NBA API responses and fail on a cache miss')
+        parser.add_argument('--report', default=None,
+                            help='Write a JSON timing report per stage to this path, use - to write it to stdout')
+        parser.add_argument('--profile-dir', default=None,
+                            help='Run each stage under cProfile and dump its stats to <stage>.prof in this directory')
+        parser.add_argument('--stage-workers', type=int, default=2,
+                            help='Number of independent stages run in parallel, SQLite databases should use 1')
+        parser.add_argument('--restart', action='store_true', default=False,
+                            help='Start a new run instead of resuming the checkpoints of an unfinished one over the same seasons')
+        parser.add_argument('--resume', action='store_true', default=False,
+                            help='Resume the latest unfinished run however old it is, by default only a run started in the last 12 hours is resumed')
+
     def handle(self, *args, **options):
-        Command.insert_static_data()
-        Command.insert_dynamic_data()
+        try:
+            seasons = Command.get_seasons(start_season=options['start_season'], end_season=options['end_season'])
+        except ValueError as error:
+            raise CommandError(error)
+
+        if options['replay_only']:
+            CachedClient.cache = ResponseCache.from_settings(replay_only=True)
+
+        # Profiling forces Django's debug cursor on every query, so it only runs when its results are asked for
+        profiler = None
+        if options['report'] is not None or options['profile_dir'] is not None:
+            profiler = IngestionProfiler(profile_directory=options['profile_dir'])
+
+        if options['restart'] and options['resume']:
+            raise CommandError('--restart and --resume cannot be used together')
+
+        run = IngestionGraph.get_run(seasons=seasons, restart=options['restart'], max_age=None if options['resume'] else IngestionGraph.resume_max_age)
+        try:
+            if options['season_workers'] > 1 and len(seasons) > 1:
+                # The request rate bound is split between the season processes so that it still holds across all of them
+                season_workers = min(options['season_workers'], len(seasons))
+                requests_per_second = options['requests_per_second'] / season_workers if options['requests_per_second'] else None
+                worker_options = {
+                    'workers': options['workers'],
+                    'requests_per_second': requests_per_second,
+                    'stage_workers': options['stage_workers'],
+                    'replay_only': options['replay_only'],
+                    'profile': profiler is not None,
+                    'profile_directory': options['profile_dir'],
+                }
+                season_reports = backfill_seasons(seasons=seasons, run=run, season_workers=season_workers, worker_options=worker_options, profiler=profiler)
+            else:
+                fetcher = ConcurrentFetcher(workers=options['workers'], requests_per_second=options['requests_per_second'])
+                graph = IngestionGraph(stages=get_ingestion_stages(seasons=seasons, fetcher=fetcher), workers=options['stage_workers'], profiler=profiler)
+                graph.execute(run=run)
+                season_reports = []
+        finally:
+            # A run that fails part way has still written the stages before the failure, cached responses must not outlive them
+            bump_data_version()
+
+        if options['report'] is not None:
+            Command.write_report(report=profiler.get_report() + season_reports, path=options['report'], stdout=self.stdout)
 
     @staticmethod
-    def insert_static_data():
-        PositionInserter.insert_positions()
-        SeasonInserter.insert_seasons()
-        TeamInserter.insert_teams()
+    def get_seasons(start_season, end_season):
+        # Season names sort chronologically, the range includes both ends
+        season_names = sorted(season.value for season in Season)
+        for season_name in (start_season, end_season):
+            if season_name not in season_names:
+                raise ValueError('Unknown season {0}, seasons run from {1} to {2}'.format(season_name, season_names[0], season_names[-1]))
+
+        if start_season > end_season:
+            raise ValueError('The start season {0} is after the end season {1}'.format(start_season, end_season))
+
+        return [season for season in sorted(Season, key=lambda season: season.value) if start_season <= season.value <= end_season]
 
     @staticmethod
-    def insert_dynamic_data():
-        PlayerInserter.insert_players_for_season(season=Season.season_2015)
-        GameInserter.insert_games_for_season(season=Season.season_2015)
-        BoxScoreInserter.insert_traditional_box_scores()
+    def write_report(report, path, stdout):
+        report_json = json.dumps(report, indent=2)
+        if path == '-':
+            stdout.write(report_json)
+            return
+
+        with open(path, 'w') as report_file:
+            report_file.write(report_json)
 
 
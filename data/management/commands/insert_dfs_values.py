@@ -1,15 +1,35 @@
 from datetime import datetime
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from pytz import timezone
 
-from data.inserters import insert_daily_fantasy_sports_sites, insert_dfs_salaries
+from data.data_version import bump_data_version
+from data.inserters.daily_fantasy_sports_site_inserter import DailyFantasySportsSiteInserter
+from data.inserters.player_name_alias_inserter import PlayerNameAliasInserter
+from data.validators.inserters import insert_dfs_salaries
 
 
 class Command(BaseCommand):
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Number of processes used to parse salary files, the database is only written by the main process')
+        parser.add_argument('--start-date', default='2016-01-03', help='First salary day to load as YYYY-MM-DD')
+        parser.add_argument('--end-date', default=None, help='Last salary day to load as YYYY-MM-DD, defaults to today')
+        parser.add_argument('--force', action='store_true', default=False,
+                            help='Load salary files again even if they have not changed since they were last loaded')
+
     def handle(self, *args, **options):
-        insert_daily_fantasy_sports_sites()
-        insert_dfs_salaries(
-            start_date=timezone('US/Eastern').localize(datetime(year=2016, month=01, day=03)),
-            end_date=timezone('US/Eastern').localize(datetime.now())
-        )
\ No newline at end of file
+        try:
+            start_date = datetime.strptime(options['start_date'], '%Y-%m-%d').date()
+            end_date = datetime.now(timezone('US/Eastern')).date() if options['end_date'] is None else datetime.strptime(options['end_date'], '%Y-%m-%d').date()
+        except ValueError as error:
+            raise CommandError(error)
+
+        DailyFantasySportsSiteInserter.insert_daily_fantasy_sports_sites()
+        PlayerNameAliasInserter.insert_player_name_aliases()
+        salary_count, file_count = insert_dfs_salaries(start_date=start_date, end_date=end_date, workers=options['workers'], force=options['force'])
+        if file_count > 0:
+            bump_data_version()
+
+        self.stdout.write('Loaded {0} salary files and wrote {1} salaries, unmatched rows are in the UnmatchedSalary table'.format(file_count, salary_count))
\ No newline at end of file
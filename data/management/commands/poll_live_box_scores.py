@@ -0,0 +1,57 @@
+import logging
+import time
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, close_old_connections
+
+from data.fetchers.concurrent_fetcher import ConcurrentFetcher
+from data.inserters.live_box_score_poller import LiveBoxScorePoller
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+
+    help = 'Polls the box scores of the games being played and writes the box scores that changed since the previous poll'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8, help='Number of concurrent NBA API requests, one per game being polled')
+        parser.add_argument('--requests-per-second', type=float, default=None,
+                            help='Upper bound on NBA API requests per second across all workers')
+        parser.add_argument('--date', default=None,
+                            help='Poll the games of this date as YYYY-MM-DD outside of its game window, defaults to the current slate')
+        parser.add_argument('--once', action='store_true', default=False, help='Poll the games that are due once and exit')
+        parser.add_argument('--exit-when-final', action='store_true', default=False,
+                            help='Exit once every game of the slate is final instead of waiting for the next slate')
+
+    def handle(self, *args, **options):
+        try:
+            slate_date = None if options['date'] is None else datetime.strptime(options['date'], '%Y-%m-%d').date()
+        except ValueError as error:
+            raise CommandError(error)
+
+        poller = LiveBoxScorePoller(fetcher=ConcurrentFetcher(workers=options['workers'], requests_per_second=options['requests_per_second']),
+                                    slate_date=slate_date)
+        while True:
+            # The poller runs for days, so connections that went away or outlived CONN_MAX_AGE are dropped every cycle
+            close_old_connections()
+            try:
+                result = poller.poll()
+            except DatabaseError:
+                # The poller reads the stored box scores of the failed games again, so the next poll retries them
+                logger.exception('Polling live box scores failed')
+                if options['once']:
+                    raise
+
+                time.sleep(poller.options['LIVE_INTERVAL'])
+                continue
+
+            if result['games'] > 0:
+                self.stdout.write('{0}: polled {1} games in {2:.2f}s, inserted {3} and updated {4} box scores'.format(
+                    result['date'], result['games'], result['seconds'], result['inserted'], result['updated']))
+
+            if options['once'] or (options['exit_when_final'] and poller.is_slate_final()):
+                return
+
+            time.sleep(result['wait'])
\ No newline at end of file
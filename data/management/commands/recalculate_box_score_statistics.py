@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from data.calculators.nba import recalculate_derived_statistics, SCORING_VERSION
+from data.data_version import bump_data_version
+
+
+class Command(BaseCommand):
+
+    help = 'Recalculates stored points, rebounds and fantasy points for box scores scored with an older scoring version'
+
+    def handle(self, *args, **options):
+        updated_count = recalculate_derived_statistics()
+        if updated_count > 0:
+            bump_data_version()
+
+        self.stdout.write('Recalculated {0} box scores to scoring version {1}'.format(updated_count, SCORING_VERSION))
@@ -0,0 +1,74 @@
+import threading
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+class Histogram:
+
+    # Cumulative bucket counts per label values, rendered in the Prometheus text exposition format
+    def __init__(self, name, description, buckets, label_names):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(buckets)
+        self.label_names = tuple(label_names)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def observe(self, labels, value):
+        with self.lock:
+            bucket_counts, count, total = self.values.get(labels, ([0] * len(self.buckets), 0, 0.0))
+            for index, bucket in enumerate(self.buckets):
+                if value <= bucket:
+                    bucket_counts[index] += 1
+
+            self.values[labels] = (bucket_counts, count + 1, total + value)
+
+    def render(self):
+        with self.lock:
+            values = [(labels, list(bucket_counts), count, total) for labels, (bucket_counts, count, total) in sorted(self.values.items())]
+
+        lines = ['# HELP {0} {1}'.format(self.name, self.description), '# TYPE {0} histogram'.format(self.name)]
+        for labels, bucket_counts, count, total in values:
+            label_pairs = ['{0}="{1}"'.format(name, escape_label_value(value)) for name, value in zip(self.label_names, labels)]
+            for bucket, bucket_count in zip(self.buckets, bucket_counts):
+                lines.append('{0}_bucket{{{1}}} {2}'.format(self.name, ','.join(label_pairs + ['le="{0}"'.format(bucket)]), bucket_count))
+
+            lines.append('{0}_bucket{{{1}}} {2}'.format(self.name, ','.join(label_pairs + ['le="+Inf"']), count))
+            lines.append('{0}_sum{{{1}}} {2}'.format(self.name, ','.join(label_pairs), total))
+            lines.append('{0}_count{{{1}}} {2}'.format(self.name, ','.join(label_pairs), count))
+
+        return lines
+
+
+def escape_label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+LABEL_NAMES = ('view', 'method')
+
+request_duration = Histogram(name='nba_persistence_request_duration_seconds',
+                             description='Time from the first middleware receiving the request to the response leaving it',
+                             buckets=DURATION_BUCKETS, label_names=LABEL_NAMES)
+query_count = Histogram(name='nba_persistence_request_queries',
+                        description='Number of database queries run while handling the request',
+                        buckets=QUERY_COUNT_BUCKETS, label_names=LABEL_NAMES)
+query_duration = Histogram(name='nba_persistence_request_query_duration_seconds',
+                           description='Time spent in database queries while handling the request',
+                           buckets=DURATION_BUCKETS, label_names=LABEL_NAMES)
+serialization_duration = Histogram(name='nba_persistence_request_serialization_duration_seconds',
+                                   description='Time spent turning model instances into primitive data in the serializers',
+                                   buckets=DURATION_BUCKETS, label_names=LABEL_NAMES)
+render_duration = Histogram(name='nba_persistence_request_render_duration_seconds',
+                            description='Time spent rendering the serialized data into the response body',
+                            buckets=DURATION_BUCKETS, label_names=LABEL_NAMES)
+
+histograms = (request_duration, query_count, query_duration, serialization_duration, render_duration)
+
+
+def render_metrics():
+    lines = []
+    for histogram in histograms:
+        lines.extend(histogram.render())
+
+    return '\n'.join(lines) + '\n'
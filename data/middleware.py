@@ -0,0 +1,154 @@
+import hashlib
+import json
+import logging
+import time
+from calendar import timegm
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection, reset_queries
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import http_date, parse_http_date_safe
+
+import data.metrics as metrics
+from data.data_version import get_data_version
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCacheMiddleware(object):
+
+    # Caches rendered API responses under the current data version and answers conditional GETs with a 304,
+    # the ETag only depends on the data version and the request so a 304 never touches the response cache
+    def __init__(self):
+        self.options = getattr(settings, 'API_RESPONSE_CACHE', {})
+        if not self.options.get('ENABLED', False):
+            raise MiddlewareNotUsed()
+
+        self.cache = caches[self.options.get('CACHE_ALIAS', 'default')]
+        self.timeout = self.options.get('TIMEOUT', None)
+        self.path_prefixes = tuple(self.options.get('PATH_PREFIXES', ()))
+
+    def process_request(self, request):
+        if request.method not in ('GET', 'HEAD') or not request.path.startswith(self.path_prefixes):
+            return None
+
+        version, updated_at = get_data_version()
+        digest = ResponseCacheMiddleware.get_request_digest(request=request)
+        etag = '"{0}-{1}"'.format(version, digest[:20])
+        last_modified = None if updated_at is None else timegm(updated_at.utctimetuple())
+        request.response_cache = {
+            'key': 'api_response:{0}:{1}'.format(version, digest),
+            'etag': etag,
+            'last_modified': last_modified,
+            'hit': False,
+        }
+
+        if ResponseCacheMiddleware.is_not_modified(request=request, etag=etag, last_modified=last_modified):
+            request.response_cache['hit'] = True
+            return HttpResponseNotModified()
+
+        cached_response = self.cache.get(request.response_cache['key'])
+        if cached_response is None:
+            return None
+
+        content, content_type = cached_response
+        request.response_cache['hit'] = True
+        return HttpResponse(content, content_type=content_type)
+
+    def process_response(self, request, response):
+        response_cache = getattr(request, 'response_cache', None)
+        if response_cache is None or response.status_code not in (200, 304) or response.streaming:
+            return response
+
+        if not response_cache['hit']:
+            self.cache.set(response_cache['key'], (response.content, response['Content-Type']), self.timeout)
+
+        response['ETag'] = response_cache['etag']
+        if response_cache['last_modified'] is not None:
+            response['Last-Modified'] = http_date(response_cache['last_modified'])
+
+        return response
+
+    @staticmethod
+    def get_request_digest(request):
+        # The renderer is picked from the Accept header, so it is part of the key along with the sorted query parameters.
+        # The pagination links are absolute, so the scheme and host are part of it too
+        query_parameters = sorted((key, sorted(values)) for key, values in request.GET.lists())
+        return hashlib.sha1(json.dumps([request.scheme, request.get_host(), request.path, query_parameters,
+                                        request.META.get('HTTP_ACCEPT', '')]).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def is_not_modified(request, etag, last_modified):
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match is not None:
+            return if_none_match.strip() == '*' or etag in [value.strip() for value in if_none_match.split(',')]
+
+        if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+        return last_modified is not None and if_modified_since is not None and last_modified <= if_modified_since
+
+
+class InstrumentationMiddleware(object):
+
+    # Records latency, query count, query time, serialization time and render time per view, raises MiddlewareNotUsed when disabled
+    # so that it costs nothing then. Queries are counted with Django's debug cursor, which is only forced on while
+    # a request is being handled
+    def __init__(self):
+        self.options = getattr(settings, 'INSTRUMENTATION', {})
+        if not self.options.get('ENABLED', False):
+            raise MiddlewareNotUsed()
+
+        self.slow_request_seconds = self.options.get('SLOW_REQUEST_SECONDS', None)
+        self.excluded_paths = tuple(self.options.get('EXCLUDED_PATHS', ()))
+
+    def process_request(self, request):
+        if request.path.startswith(self.excluded_paths):
+            return None
+
+        request.instrumentation = {
+            'start': time.time(),
+            'render_start': None,
+            'serialization_duration': None,
+            'force_debug_cursor': connection.force_debug_cursor,
+        }
+        connection.force_debug_cursor = True
+        reset_queries()
+        return None
+
+    def process_template_response(self, request, response):
+        instrumentation = getattr(request, 'instrumentation', None)
+        if instrumentation is not None:
+            instrumentation['render_start'] = time.time()
+
+        return response
+
+    def process_response(self, request, response):
+        instrumentation = getattr(request, 'instrumentation', None)
+        if instrumentation is None:
+            return response
+
+        end = time.time()
+        queries = list(connection.queries)
+        connection.force_debug_cursor = instrumentation['force_debug_cursor']
+        del request.instrumentation
+
+        resolver_match = getattr(request, 'resolver_match', None)
+        labels = (resolver_match.view_name if resolver_match is not None else 'unresolved', request.method)
+        duration = end - instrumentation['start']
+        query_duration = sum(float(query['time']) for query in queries)
+        metrics.request_duration.observe(labels=labels, value=duration)
+        metrics.query_count.observe(labels=labels, value=len(queries))
+        metrics.query_duration.observe(labels=labels, value=query_duration)
+        if instrumentation['serialization_duration'] is not None:
+            metrics.serialization_duration.observe(labels=labels, value=instrumentation['serialization_duration'])
+
+        if instrumentation['render_start'] is not None:
+            metrics.render_duration.observe(labels=labels, value=end - instrumentation['render_start'])
+
+        if self.slow_request_seconds is not None and duration >= self.slow_request_seconds:
+            logger.warning('Slow request %s %s took %.3fs with %d queries taking %.3fs\n%s',
+                           request.method, request.get_full_path(), duration, len(queries), query_duration,
+                           '\n'.join('{0}s {1}'.format(query['time'], query['sql']) for query in queries))
+
+        return response
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9 on 2026-10-17 19:38
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data', '0003_auto_20160923_0109'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='traditionalboxscore',
+            name='draftkings_points',
+            field=models.FloatField(db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='traditionalboxscore',
+            name='fanduel_points',
+            field=models.FloatField(db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='traditionalboxscore',
+            name='points',
+            field=models.IntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='traditionalboxscore',
+            name='scoring_version',
+            field=models.IntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='traditionalboxscore',
+            name='total_rebounds',
+            field=models.IntegerField(null=True),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9 on 2026-10-17 19:43
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data', '0004_auto_20261017_1938'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LoadedSalaryFile',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('checksum', models.CharField(max_length=64)),
+                ('loaded_at', models.DateTimeField(auto_now=True)),
+                ('site', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='data.DailyFantasySportsSite')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='loadedsalaryfile',
+            unique_together=set([('site', 'day')]),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9 on 2026-10-17 19:44
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data', '0005_auto_20261017_1943'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerNameAlias',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(blank=True, max_length=50)),
+                ('alias', models.CharField(max_length=250)),
+                ('name', models.CharField(max_length=250)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='UnmatchedSalary',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('name', models.CharField(max_length=250)),
+                ('team_abbreviation', models.CharField(max_length=10)),
+                ('home_team_abbreviation', models.CharField(max_length=10)),
+                ('away_team_abbreviation', models.CharField(max_length=10)),
+                ('salary', models.IntegerField()),
+                ('candidates', models.TextField(default='[]')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('site', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='data.DailyFantasySportsSite')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='playernamealias',
+            unique_together=set([('source', 'alias')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='unmatchedsalary',
+            index_together=set([('site', 'day')]),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9 on 2026-10-17 19:45
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data', '0006_auto_20261017_1944'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamAbbreviation',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=50)),
+                ('abbreviation', models.CharField(max_length=10)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='abbreviation',
+            field=models.CharField(max_length=10, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='teamabbreviation',
+            name='team',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='data.Team'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='teamabbreviation',
+            unique_together=set([('source', 'abbreviation')]),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9 on 2026-10-17 19:49
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data', '0008_dataversion'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='traditionalboxscore',
+            name='draftkings_points',
+            field=models.FloatField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='traditionalboxscore',
+            name='fanduel_points',
+            field=models.FloatField(null=True),
+        ),
+        migrations.AlterIndexTogether(
+            name='game',
+            index_together=set([('season', 'start_date'), ('home_team', 'start_date'), ('start_date', 'id'), ('away_team', 'start_date')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='playersalary',
+            index_together=set([('site', 'salary')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='traditionalboxscore',
+            index_together=set([('fanduel_points', 'id'), ('draftkings_points', 'id')]),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9 on 2026-10-17 20:16
+from __future__ import unicode_literals
+
+from django.db import migrations
+from django.db.models import Count, Max
+
+
+def remove_duplicate_salaries(apps, schema_editor):
+    # Salaries were unique per salary value, so a player could have several salaries for a game on a site.
+    # The latest one is kept, it comes from the salary file that was loaded last
+    PlayerSalary = apps.get_model('data', 'PlayerSalary')
+    duplicates = (PlayerSalary.objects.values('site', 'game', 'player')
+                  .annotate(latest_id=Max('id'), salary_count=Count('id'))
+                  .filter(salary_count__gt=1))
+    for duplicate in duplicates:
+        (PlayerSalary.objects.filter(site=duplicate['site'], game=duplicate['game'], player=duplicate['player'])
+         .exclude(id=duplicate['latest_id'])
+         .delete())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data', '0010_auto_20261017_2000'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_salaries, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='playersalary',
+            unique_together=set([('site', 'game', 'player')]),
+        ),
+    ]
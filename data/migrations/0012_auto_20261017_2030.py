@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9 on 2026-10-17 20:30
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data', '0011_auto_20261017_2016'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='player',
+            unique_together=set([('name', 'team', 'jersey_number', 'nba_id', 'season')]),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9 on 2026-10-17 20:45
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+from data.calculators.nba import recalculate_derived_statistics
+
+
+def backfill_derived_statistics(apps, schema_editor):
+    # The derived statistics columns were added empty, rows loaded before them are scored once here and later
+    # versions of the scoring rules are applied by the derived_statistics ingestion stages
+    TraditionalBoxScore = apps.get_model('data', 'TraditionalBoxScore')
+    recalculate_derived_statistics(queryset=TraditionalBoxScore.objects.all())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data', '0012_auto_20261017_2030'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_derived_statistics, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9 on 2026-10-17 20:50
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data', '0013_auto_20261017_2045'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='traditionalboxscore',
+            name='draftkings_points',
+            field=models.FloatField(),
+        ),
+        migrations.AlterField(
+            model_name='traditionalboxscore',
+            name='fanduel_points',
+            field=models.FloatField(),
+        ),
+    ]
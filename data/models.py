@@ -1,6 +1,6 @@
 from __future__ import unicode_literals
 
-from django.db.models import Model, IntegerField, CharField, DateField, ForeignKey, BigIntegerField, CASCADE
+from django.db.models import Model, QuerySet, IntegerField, CharField, DateField, DateTimeField, ForeignKey, BigIntegerField, FloatField, TextField, CASCADE
 
 
 class Position(Model):
@@ -14,11 +14,26 @@ class Position(Model):
 class Team(Model):
 
     name = CharField(max_length=200, unique=True)
+    abbreviation = CharField(max_length=10, unique=True, null=True)
 
     def __unicode__(self):
         return '{0}'.format(self.name)
 
 
+class TeamAbbreviation(Model):
+
+    # Every source has its own row for each of its abbreviations, including the ones that match the NBA's
+    source = CharField(max_length=50)
+    abbreviation = CharField(max_length=10)
+    team = ForeignKey(Team, on_delete=CASCADE)
+
+    class Meta:
+        unique_together = ('source', 'abbreviation')
+
+    def __unicode__(self):
+        return '{0} - {1} - {2}'.format(self.source, self.abbreviation, self.team)
+
+
 class Season(Model):
 
     name = CharField(max_length=50, unique=True)
@@ -37,6 +52,13 @@ class Game(Model):
 
     class Meta:
         unique_together = ('home_team', 'away_team', 'start_date', 'season')
+        # The games endpoint orders by start date and filters on either team or the season together with a date range
+        index_together = [
+            ('start_date', 'id'),
+            ('home_team', 'start_date'),
+            ('away_team', 'start_date'),
+            ('season', 'start_date'),
+        ]
 
     def __unicode__(self):
         return '{0} - {1} - {2} - {3}'.format(self.home_team.name, self.away_team.name, self.start_date, self.season)
@@ -52,7 +74,7 @@ class Player(Model):
     nba_id = BigIntegerField()
 
     class Meta:
-        unique_together = ('name', 'team', 'jersey_number', 'nba_id')
+        unique_together = ('name', 'team', 'jersey_number', 'nba_id', 'season')
 
     def __unicode__(self):
         return '{0} - {1} - {2} - {3} - {4} - {5}'.format(self.name, self.position, self.team, self.season, self.jersey_number)
@@ -74,12 +96,117 @@ class PlayerSalary(Model):
     salary = IntegerField()
 
     class Meta:
-        unique_together = ('site', 'game', 'player', 'salary')
+        unique_together = ('site', 'game', 'player')
+        # The salaries endpoint filters on site and salary ranges, the salary loader reads a site's salaries per game
+        # through the unique index
+        index_together = [
+            ('site', 'salary'),
+        ]
 
     def __unicode__(self):
         return '{0} - {1} - {2} - {3}'.format(self.site, self.game, self.player, self.salary)
 
 
+class LoadedSalaryFile(Model):
+
+    site = ForeignKey(DailyFantasySportsSite, on_delete=CASCADE)
+    day = DateField()
+    checksum = CharField(max_length=64)
+    loaded_at = DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('site', 'day')
+
+    def __unicode__(self):
+        return '{0} - {1} - {2}'.format(self.site, self.day, self.checksum)
+
+
+class PlayerNameAlias(Model):
+
+    # A blank source applies to every salary source
+    source = CharField(max_length=50, blank=True)
+    alias = CharField(max_length=250)
+    name = CharField(max_length=250)
+
+    class Meta:
+        unique_together = ('source', 'alias')
+
+    def __unicode__(self):
+        return '{0} - {1} - {2}'.format(self.source, self.alias, self.name)
+
+
+class UnmatchedSalary(Model):
+
+    site = ForeignKey(DailyFantasySportsSite, on_delete=CASCADE)
+    day = DateField()
+    name = CharField(max_length=250)
+    team_abbreviation = CharField(max_length=10)
+    home_team_abbreviation = CharField(max_length=10)
+    away_team_abbreviation = CharField(max_length=10)
+    salary = IntegerField()
+    # JSON list of the closest players as {"player_id", "name", "similarity"} objects
+    candidates = TextField(default='[]')
+    created_at = DateTimeField(auto_now_add=True)
+
+    class Meta:
+        index_together = ('site', 'day')
+
+    def __unicode__(self):
+        return '{0} - {1} - {2} - {3}'.format(self.site, self.day, self.name, self.team_abbreviation)
+
+
+class DataVersion(Model):
+
+    # A single row bumped by the ingestion commands, API responses cached under an older version are stale
+    version = BigIntegerField(default=0)
+    updated_at = DateTimeField(auto_now=True)
+
+    def __unicode__(self):
+        return '{0} - {1}'.format(self.version, self.updated_at)
+
+
+class IngestionRun(Model):
+
+    # An insert_data run, a run that has not finished is resumed by the next one over the same seasons instead of starting over.
+    # The seasons are stored as 'first season..last season'
+    seasons = CharField(max_length=100, default='')
+    started_at = DateTimeField(auto_now_add=True)
+    finished_at = DateTimeField(null=True)
+
+    def __unicode__(self):
+        return '{0} - {1}'.format(self.started_at, self.finished_at)
+
+
+class IngestionCheckpoint(Model):
+
+    run = ForeignKey(IngestionRun, on_delete=CASCADE)
+    stage = CharField(max_length=100)
+    unit = CharField(max_length=100)
+    completed_at = DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('run', 'stage', 'unit')
+
+    def __unicode__(self):
+        return '{0} - {1} - {2}'.format(self.run_id, self.stage, self.unit)
+
+
+# The raw statistics the points, total rebounds and fantasy points of a box score are derived from
+SCORED_STATISTIC_FIELDS = ('field_goals', 'three_point_field_goals', 'free_throws', 'offensive_rebounds', 'defensive_rebounds',
+                           'assists', 'steals', 'blocks', 'turnovers')
+
+
+class TraditionalBoxScoreQuerySet(QuerySet):
+
+    # Rows without a scoring version get their derived statistics recalculated, so an update of the raw statistics clears it
+    # unless the update writes the scoring version itself
+    def update(self, **kwargs):
+        if 'scoring_version' not in kwargs and any(field in SCORED_STATISTIC_FIELDS for field in kwargs):
+            kwargs['scoring_version'] = None
+
+        return super(TraditionalBoxScoreQuerySet, self).update(**kwargs)
+
+
 class TraditionalBoxScore(Model):
 
     player = ForeignKey(Player, on_delete=CASCADE)
@@ -99,9 +226,22 @@ class TraditionalBoxScore(Model):
     turnovers = IntegerField(null=True)
     fouls_committed = IntegerField(null=True)
     plus_minus = IntegerField(null=True)
+    points = IntegerField(null=True)
+    total_rebounds = IntegerField(null=True)
+    # Never null so that keyset pages ordered by fantasy points reach every row, set_derived_statistics fills them in
+    draftkings_points = FloatField()
+    fanduel_points = FloatField()
+    scoring_version = IntegerField(null=True)
+
+    objects = TraditionalBoxScoreQuerySet.as_manager()
 
     class Meta:
         unique_together = ('player', 'game')
+        # Keyset pagination orders by (fantasy points, id) and filters on that same pair
+        index_together = [
+            ('draftkings_points', 'id'),
+            ('fanduel_points', 'id'),
+        ]
 
     def __unicode__(self):
         return '{0} - {1}'.format(self.player, self.game)
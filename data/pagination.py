@@ -0,0 +1,152 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+
+    # Pages are filtered on the position of the last row of the previous page instead of using an OFFSET,
+    # so the last field of every ordering must be unique and no ordering field may be null
+    ordering = ('-id',)
+    orderings = {}
+    ordering_query_param = 'ordering'
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        results = list(self.get_page_queryset(queryset=queryset, request=request))
+        self.page = results[:self.page_size]
+        self.has_next = len(results) > self.page_size
+        return self.page
+
+    def get_page_queryset(self, queryset, request):
+        # The unevaluated query for one page plus one row, which tells whether there is a next page
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request)
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request=request, model=queryset.model)
+        if position is not None:
+            queryset = self.filter_after_position(queryset=queryset, position=position)
+
+        return queryset[:self.page_size + 1]
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        if page_size < 1:
+            return self.page_size
+
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, request):
+        ordering_name = request.query_params.get(self.ordering_query_param)
+        if ordering_name is None:
+            return self.ordering
+
+        if ordering_name not in self.orderings:
+            raise NotFound('Unknown ordering: {0}'.format(ordering_name))
+
+        return self.orderings[ordering_name]
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+
+        return replace_query_param(self.base_url, self.cursor_query_param, self.encode_cursor(self.get_position(self.page[-1])))
+
+    def filter_after_position(self, queryset, position):
+        # Builds (a < x) OR (a = x AND b < y) OR ... and bounds the leading field on its own so that it can use an index
+        leading_field = self.ordering[0].lstrip('-')
+        leading_lookup = '__lte' if self.ordering[0].startswith('-') else '__gte'
+        position_filter = Q()
+        equal_filter = Q()
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip('-')
+            lookup = '__lt' if field.startswith('-') else '__gt'
+            position_filter |= equal_filter & Q(**{name + lookup: value})
+            equal_filter &= Q(**{name: value})
+
+        return queryset.filter(**{leading_field + leading_lookup: position[0]}).filter(position_filter)
+
+    def get_position(self, instance):
+        position = []
+        for field in self.ordering:
+            value = instance
+            for attribute in field.lstrip('-').split('__'):
+                value = getattr(value, attribute)
+
+            position.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+
+        return position
+
+    def encode_cursor(self, position):
+        return urlsafe_b64encode(json.dumps(position).encode('utf-8')).decode('ascii')
+
+    def get_ordering_fields(self, model):
+        fields = []
+        for ordering_field in self.ordering:
+            field_model = model
+            names = ordering_field.lstrip('-').split('__')
+            for name in names[:-1]:
+                field_model = field_model._meta.get_field(name).related_model
+
+            field = field_model._meta.get_field(names[-1])
+            fields.append(field.target_field if field.is_relation else field)
+
+        return fields
+
+    def decode_cursor(self, request, model):
+        # Every value is converted by its ordering field, so a tampered cursor is a 404 instead of an error in the query
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            position = json.loads(urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            if not isinstance(position, list) or len(position) != len(self.ordering):
+                raise NotFound(self.invalid_cursor_message)
+
+            position = [field.to_python(value) for field, value in zip(self.get_ordering_fields(model=model), position)]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if any(value is None for value in position):
+            raise NotFound(self.invalid_cursor_message)
+
+        return position
+
+
+class GameStartDatePagination(KeysetPagination):
+
+    # The game id between the date and the row id lets the (start_date, id) index of games order everything but the rows of each game
+    ordering = ('-game__start_date', '-game_id', '-id')
+
+
+class BoxScorePagination(GameStartDatePagination):
+
+    orderings = {
+        'game_date': ('-game__start_date', '-game_id', '-id'),
+        'draftkings_points': ('-draftkings_points', '-id'),
+        'fanduel_points': ('-fanduel_points', '-id'),
+    }
@@ -0,0 +1,152 @@
+import cProfile
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.db import connection
+
+# Set while IngestionProfiler.stage runs so that the inserters and the client can report into the current stage
+active_profiler = None
+
+
+class QueryStats:
+
+    # Stands in for the connection's queries_log while a stage runs, Django's debug cursor appends every query to it.
+    # Savepoint and other transaction statements are neither reads nor writes and are left out
+    read_verbs = ('SELECT',)
+    write_verbs = ('INSERT', 'UPDATE', 'DELETE')
+
+    def __init__(self):
+        self.read_count = 0
+        self.read_seconds = 0.0
+        self.write_count = 0
+        self.write_seconds = 0.0
+        self.lock = threading.Lock()
+
+    def append(self, query):
+        # executemany queries are logged as "<times> times: <sql>"
+        sql = query['sql'].split(' times: ', 1)[-1].lstrip().upper()
+        with self.lock:
+            if sql.startswith(QueryStats.write_verbs):
+                self.write_count += 1
+                self.write_seconds += float(query['time'])
+            elif sql.startswith(QueryStats.read_verbs):
+                self.read_count += 1
+                self.read_seconds += float(query['time'])
+
+    def __len__(self):
+        return self.read_count + self.write_count
+
+
+class StageReport:
+
+    def __init__(self, name):
+        self.name = name
+        self.seconds = 0.0
+        self.fetch_count = 0
+        self.fetch_seconds = 0.0
+        self.query_stats = QueryStats()
+        self.counters = OrderedDict()
+        self.profile_path = None
+        self.lock = threading.Lock()
+
+    def record_fetch(self, seconds):
+        with self.lock:
+            self.fetch_count += 1
+            self.fetch_seconds += seconds
+
+    def record(self, counter, value):
+        with self.lock:
+            self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def to_dict(self):
+        return OrderedDict([
+            ('stage', self.name),
+            ('seconds', round(self.seconds, 3)),
+            ('fetch_count', self.fetch_count),
+            ('fetch_seconds', round(self.fetch_seconds, 3)),
+            ('db_read_count', self.query_stats.read_count),
+            ('db_read_seconds', round(self.query_stats.read_seconds, 3)),
+            ('db_write_count', self.query_stats.write_count),
+            ('db_write_seconds', round(self.query_stats.write_seconds, 3)),
+            ('rows', self.counters),
+            ('profile', self.profile_path),
+        ])
+
+
+class IngestionProfiler:
+
+    def __init__(self, profile_directory=None):
+        self.profile_directory = profile_directory
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name):
+        # Fetch times are summed over every worker thread, database times only cover the calling thread's connection
+        # and those of threads run under track_thread. cProfile only sees the calling thread
+        global active_profiler
+        report = StageReport(name=name)
+        self.stages.append(report)
+        profile = cProfile.Profile() if self.profile_directory is not None else None
+        active_profiler = self
+        start = time.time()
+        if profile is not None:
+            profile.enable()
+
+        try:
+            with self.track_thread():
+                yield report
+        finally:
+            if profile is not None:
+                profile.disable()
+
+            report.seconds = time.time() - start
+            active_profiler = None
+            if profile is not None:
+                if not os.path.isdir(self.profile_directory):
+                    os.makedirs(self.profile_directory)
+
+                report.profile_path = os.path.join(self.profile_directory, '{0}.prof'.format(name))
+                profile.dump_stats(report.profile_path)
+
+    @contextmanager
+    def track_thread(self):
+        # Counts the queries of the current thread's own connection into the current stage
+        query_stats = self.get_current_stage().query_stats
+        queries_log = connection.queries_log
+        force_debug_cursor = connection.force_debug_cursor
+        connection.queries_log = query_stats
+        connection.force_debug_cursor = True
+        try:
+            yield
+        finally:
+            connection.queries_log = queries_log
+            connection.force_debug_cursor = force_debug_cursor
+
+    def get_current_stage(self):
+        return self.stages[-1] if self.stages else None
+
+    def get_report(self):
+        return [stage.to_dict() for stage in self.stages]
+
+
+def record(counter, value=1):
+    profiler = active_profiler
+    if profiler is not None:
+        profiler.get_current_stage().record(counter=counter, value=value)
+
+
+@contextmanager
+def time_fetch():
+    profiler = active_profiler
+    if profiler is None:
+        yield
+        return
+
+    start = time.time()
+    try:
+        yield
+    finally:
+        profiler.get_current_stage().record_fetch(seconds=time.time() - start)
\ No newline at end of file
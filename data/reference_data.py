@@ -0,0 +1,79 @@
+from django.db import DatabaseError
+
+from data.models import Team, Position, Season, DailyFantasySportsSite
+
+
+class ReferenceDataCache:
+
+    # Holds every row of a small reference table in process, the rows by key and by id are swapped in together
+    # and the cache is cleared by the model's save and delete signals so that the next read reloads it
+    def __init__(self, model, key_field='name'):
+        self.model = model
+        self.key_field = key_field
+        self.entries = None
+
+    def __deepcopy__(self, memo):
+        # Serializer fields deep copy their arguments, copies of a cache would never be cleared by the signals
+        return self
+
+    def load(self):
+        instances = list(self.model.objects.all())
+        self.entries = ({getattr(instance, self.key_field): instance for instance in instances},
+                        {instance.id: instance for instance in instances})
+        return self.entries
+
+    def clear(self):
+        self.entries = None
+
+    def get_entries(self):
+        entries = self.entries
+        if entries is None:
+            entries = self.load()
+
+        return entries
+
+    def find(self, index, key):
+        # A miss reloads the table once, the rows may have been inserted by another process whose signals never reach this one
+        entries = self.entries
+        if entries is not None and key not in entries[index]:
+            entries = None
+
+        if entries is None:
+            entries = self.load()
+
+        return entries[index].get(key)
+
+    def get(self, key):
+        instance = self.find(index=0, key=key)
+        if instance is None:
+            raise self.model.DoesNotExist('{0} matching {1}={2} does not exist'.format(self.model.__name__, self.key_field, key))
+
+        return instance
+
+    def get_by_id(self, instance_id):
+        instance = self.find(index=1, key=instance_id)
+        if instance is None:
+            raise self.model.DoesNotExist('{0} matching id={1} does not exist'.format(self.model.__name__, instance_id))
+
+        return instance
+
+    def all(self):
+        return list(self.get_entries()[1].values())
+
+
+teams = ReferenceDataCache(model=Team)
+positions = ReferenceDataCache(model=Position)
+seasons = ReferenceDataCache(model=Season)
+daily_fantasy_sports_sites = ReferenceDataCache(model=DailyFantasySportsSite)
+
+reference_data_caches = {cache.model: cache for cache in (teams, positions, seasons, daily_fantasy_sports_sites)}
+
+
+def warm_reference_data():
+    # The tables do not exist yet before the first migrate, the caches then load on first use instead
+    try:
+        for cache in reference_data_caches.values():
+            cache.load()
+    except DatabaseError:
+        for cache in reference_data_caches.values():
+            cache.clear()
@@ -1,43 +1,60 @@
-from rest_framework.serializers import ModelSerializer
+from rest_framework.serializers import ModelSerializer, Field
 
 from data.models import Team, Position, Season, Game, Player, TraditionalBoxScore, PlayerSalary, DailyFantasySportsSite
+from data.reference_data import teams, positions, seasons, daily_fantasy_sports_sites
+
+
+class ReferenceDataField(Field):
+
+    # Serializes a foreign key to a reference table from the process cache, so querysets do not have to join the table
+    def __init__(self, cache, serializer_class, **kwargs):
+        kwargs['read_only'] = True
+        super(ReferenceDataField, self).__init__(**kwargs)
+        self.cache = cache
+        self.serializer_class = serializer_class
+
+    def get_attribute(self, instance):
+        return getattr(instance, '{0}_id'.format(self.source))
+
+    def to_representation(self, value):
+        return self.serializer_class(self.cache.get_by_id(value)).data
 
 
 class PositionSerializer(ModelSerializer):
     class Meta:
-        model = Position()
-        fields = ('name', 'abbreviation')
+        model = Position
+        fields = ('name',)
 
 
 class TeamSerializer(ModelSerializer):
     class Meta:
-        model = Team()
+        model = Team
         fields = ('name', 'abbreviation')
 
 
 class SeasonSerializer(ModelSerializer):
     class Meta:
-        model = Season()
-        fields = ('start_year',)
+        model = Season
+        fields = ('name',)
 
 
 class GameSerializer(ModelSerializer):
-    home_team = TeamSerializer()
-    away_team = TeamSerializer()
-    season = SeasonSerializer()
+    home_team = ReferenceDataField(cache=teams, serializer_class=TeamSerializer)
+    away_team = ReferenceDataField(cache=teams, serializer_class=TeamSerializer)
+    season = ReferenceDataField(cache=seasons, serializer_class=SeasonSerializer)
 
     class Meta:
-        model = Game()
-        fields = ('home_team', 'away_team', 'start_time', 'season')
+        model = Game
+        fields = ('home_team', 'away_team', 'start_date', 'season')
 
 
 class PlayerSerializer(ModelSerializer):
-    team = TeamSerializer()
-    position = PositionSerializer()
+    team = ReferenceDataField(cache=teams, serializer_class=TeamSerializer)
+    position = ReferenceDataField(cache=positions, serializer_class=PositionSerializer)
 
     class Meta:
-        model = Player()
-        fields = ('first_name', 'last_name', 'team', 'position')
+        model = Player
+        fields = ('name', 'team', 'position')
 
 
 class BoxScoreSerializer(ModelSerializer):
@@ -49,7 +66,7 @@ class BoxScoreSerializer(ModelSerializer):
         fields = ('player', 'game', 'seconds_played', 'field_goals', 'field_goal_attempts', 'three_point_field_goals',
                   'three_point_field_goal_attempts', 'free_throws', 'free_throw_attempts', 'offensive_rebounds',
                   'defensive_rebounds', 'total_rebounds', 'assists', 'steals', 'blocks', 'turnovers', 'fouls_committed',
-                  'points', 'draftkings_points')
+                  'points', 'draftkings_points', 'fanduel_points')
 
 
 class DailyFantasySportsSiteSerializer(ModelSerializer):
@@ -59,7 +76,7 @@ class DailyFantasySportsSiteSerializer(ModelSerializer):
 
 
 class PlayerSalarySerializer(ModelSerializer):
-    site = DailyFantasySportsSiteSerializer()
+    site = ReferenceDataField(cache=daily_fantasy_sports_sites, serializer_class=DailyFantasySportsSiteSerializer)
     game = GameSerializer()
     player = PlayerSerializer()
 
@@ -0,0 +1,34 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from data.calculators.nba import set_derived_statistics
+from data.models import TraditionalBoxScore, Team, TeamAbbreviation, Position, Season, DailyFantasySportsSite
+from data.reference_data import reference_data_caches
+from data.translators.team_abbreviations import team_abbreviations
+
+
+# Recomputes the derived statistics on every save, they are cheap to calculate. bulk_create and update() do not send
+# the signal, so the inserters and the live poller call set_derived_statistics themselves
+@receiver(pre_save, sender=TraditionalBoxScore)
+def update_derived_statistics(sender, instance, **kwargs):
+    set_derived_statistics(box_score=instance)
+
+
+@receiver(post_save, sender=Team)
+@receiver(post_delete, sender=Team)
+@receiver(post_save, sender=TeamAbbreviation)
+@receiver(post_delete, sender=TeamAbbreviation)
+def clear_team_abbreviations(sender, **kwargs):
+    team_abbreviations.clear()
+
+
+@receiver(post_save, sender=Team)
+@receiver(post_delete, sender=Team)
+@receiver(post_save, sender=Position)
+@receiver(post_delete, sender=Position)
+@receiver(post_save, sender=Season)
+@receiver(post_delete, sender=Season)
+@receiver(post_save, sender=DailyFantasySportsSite)
+@receiver(post_delete, sender=DailyFantasySportsSite)
+def clear_reference_data(sender, **kwargs):
+    reference_data_caches[sender].clear()
@@ -0,0 +1,108 @@
+from datetime import date
+
+from django.test import TestCase
+
+from data.calculators.nba import recalculate_derived_statistics, calculate_draftkings_points, calculate_fanduel_points, SCORING_VERSION, \
+    annotate_draftkings_points, calculate_draftkings_contributions, get_statistics, count_doubles, calculate_points, calculate_total_rebounds
+from data.ingestion import get_season_stages
+from data.models import Team, Position, Season, Game, Player, TraditionalBoxScore
+from data.objects.season import Season as SeasonObject
+
+
+class DerivedStatisticsTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        position = Position.objects.create(name='guard')
+        home_team = Team.objects.create(name='Boston Celtics', abbreviation='BOS')
+        away_team = Team.objects.create(name='New York Knicks', abbreviation='NYK')
+        for season_index, season_name in enumerate(('2014-15', '2015-16')):
+            season = Season.objects.create(name=season_name)
+            player = Player.objects.create(name='Player 1', position=position, team=home_team, season=season, jersey_number=1, nba_id=1)
+            game = Game.objects.create(home_team=home_team, away_team=away_team, start_date=date(2014 + season_index, 10, 27), season=season,
+                                       nba_id='0021{0}00001'.format(4 + season_index))
+            TraditionalBoxScore.objects.create(player=player, game=game, field_goals=4, three_point_field_goals=1, free_throws=2,
+                                               offensive_rebounds=1, defensive_rebounds=3, assists=2, steals=1, blocks=0, turnovers=1)
+
+    def assert_scored(self, box_score):
+        self.assertEqual(box_score.scoring_version, SCORING_VERSION)
+        self.assertEqual(box_score.points, 2 * box_score.field_goals + box_score.three_point_field_goals + box_score.free_throws)
+        self.assertEqual(box_score.total_rebounds, box_score.offensive_rebounds + box_score.defensive_rebounds)
+        self.assertAlmostEqual(box_score.draftkings_points, calculate_draftkings_points(box_score=box_score))
+        self.assertAlmostEqual(box_score.fanduel_points, calculate_fanduel_points(box_score=box_score))
+
+    def test_raw_statistic_update_clears_scoring_version(self):
+        TraditionalBoxScore.objects.update(field_goals=7)
+        self.assertEqual(set(TraditionalBoxScore.objects.values_list('scoring_version', flat=True)), {None})
+
+        self.assertEqual(recalculate_derived_statistics(), 2)
+        for box_score in TraditionalBoxScore.objects.all():
+            self.assert_scored(box_score=box_score)
+
+    def test_update_keeps_a_written_scoring_version(self):
+        TraditionalBoxScore.objects.update(seconds_played=600)
+        TraditionalBoxScore.objects.update(steals=3, scoring_version=SCORING_VERSION)
+        self.assertEqual(set(TraditionalBoxScore.objects.values_list('scoring_version', flat=True)), {SCORING_VERSION})
+
+    def test_derived_statistics_stage_scores_its_season(self):
+        TraditionalBoxScore.objects.update(points=None, total_rebounds=None, draftkings_points=0, fanduel_points=0, scoring_version=None)
+        stage = next(stage for stage in get_season_stages(season=SeasonObject.season_2015, fetcher=None, reference_data=False)
+                     if stage.name == 'derived_statistics:2015-16')
+        self.assertEqual(stage.dependencies, ('box_scores:2015-16',))
+        stage.run()
+
+        self.assert_scored(box_score=TraditionalBoxScore.objects.get(game__season__name='2015-16'))
+        self.assertIsNone(TraditionalBoxScore.objects.get(game__season__name='2014-15').scoring_version)
+
+
+class BatchScoringTest(TestCase):
+
+    # Raw statistics of each row, the double counting categories sit right at and right below the double minimum of 10
+    statistics = (
+        dict(field_goals=5, three_point_field_goals=0, free_throws=0, offensive_rebounds=1, defensive_rebounds=2, assists=3, steals=1, blocks=0, turnovers=2),
+        dict(field_goals=4, three_point_field_goals=0, free_throws=1, offensive_rebounds=4, defensive_rebounds=5, assists=9, steals=0, blocks=1, turnovers=0),
+        dict(field_goals=5, three_point_field_goals=1, free_throws=0, offensive_rebounds=4, defensive_rebounds=6, assists=2, steals=0, blocks=0, turnovers=1),
+        dict(field_goals=4, three_point_field_goals=2, free_throws=0, offensive_rebounds=0, defensive_rebounds=10, assists=10, steals=2, blocks=1, turnovers=3),
+        dict(field_goals=3, three_point_field_goals=0, free_throws=4, offensive_rebounds=5, defensive_rebounds=5, assists=10, steals=10, blocks=10, turnovers=4),
+        dict(field_goals=5, three_point_field_goals=None, free_throws=None, offensive_rebounds=None, defensive_rebounds=10, assists=None, steals=None,
+             blocks=None, turnovers=None),
+        dict(),
+    )
+
+    @classmethod
+    def setUpTestData(cls):
+        position = Position.objects.create(name='guard')
+        season = Season.objects.create(name='2015-16')
+        home_team = Team.objects.create(name='Boston Celtics', abbreviation='BOS')
+        away_team = Team.objects.create(name='New York Knicks', abbreviation='NYK')
+        game = Game.objects.create(home_team=home_team, away_team=away_team, start_date=date(2015, 10, 27), season=season, nba_id='0021500001')
+        for index, statistics in enumerate(BatchScoringTest.statistics):
+            player = Player.objects.create(name='Player {0}'.format(index), position=position, team=home_team, season=season, jersey_number=index,
+                                           nba_id=index)
+            TraditionalBoxScore.objects.create(player=player, game=game, **statistics)
+
+    def test_rows_cover_every_double_count(self):
+        double_counts = [count_doubles(statistics=get_statistics(box_score=box_score)) for box_score in TraditionalBoxScore.objects.all()]
+        self.assertEqual(set(double_counts), {0, 1, 2, 3, 5})
+
+    def test_annotations_match_the_scalar_calculation(self):
+        for box_score in annotate_draftkings_points(TraditionalBoxScore.objects.order_by('id')):
+            contributions = calculate_draftkings_contributions(box_score=box_score)
+            double_count = count_doubles(statistics=get_statistics(box_score=box_score))
+            for name, contribution in contributions.items():
+                self.assertAlmostEqual(getattr(box_score, 'draftkings_contribution_{0}'.format(name)), contribution, msg=name)
+
+            self.assertAlmostEqual(box_score.draftkings_total, sum(contributions.values()))
+            self.assertAlmostEqual(box_score.draftkings_total, calculate_draftkings_points(box_score=box_score))
+            self.assertEqual(bool(box_score.is_double_double), double_count >= 2)
+            self.assertEqual(bool(box_score.is_triple_double), double_count >= 3)
+
+    def test_recalculation_matches_the_scalar_calculation(self):
+        TraditionalBoxScore.objects.update(points=0, total_rebounds=0, draftkings_points=0, fanduel_points=0, scoring_version=None)
+        self.assertEqual(recalculate_derived_statistics(), len(BatchScoringTest.statistics))
+        for box_score in TraditionalBoxScore.objects.order_by('id'):
+            self.assertEqual(box_score.scoring_version, SCORING_VERSION)
+            self.assertEqual(box_score.points, calculate_points(box_score=box_score))
+            self.assertEqual(box_score.total_rebounds, calculate_total_rebounds(box_score=box_score))
+            self.assertAlmostEqual(box_score.draftkings_points, sum(calculate_draftkings_contributions(box_score=box_score).values()))
+            self.assertAlmostEqual(box_score.fanduel_points, calculate_fanduel_points(box_score=box_score))
\ No newline at end of file
@@ -0,0 +1,67 @@
+from datetime import timedelta
+
+from django.test import TestCase
+
+from data.benchmarks.fixtures import use_synthetic_league, clear_caches, insert_reference_data
+from data.benchmarks.synthetic_league import SyntheticLeague
+from data.fetchers.cached_client import CachedClient
+from data.inserters.game_inserter import GameInserter
+from data.models import Game
+
+
+class GameInserterTest(TestCase):
+
+    def setUp(self):
+        self.original_cache = CachedClient.cache
+        clear_caches()
+        self.league = SyntheticLeague(season_count=1, players_per_team=1, games_per_team=3)
+        self.fake_nba_api = use_synthetic_league(league=self.league)
+        self.season = self.league.seasons[0]
+        self.games = self.league.games[self.season]
+        insert_reference_data()
+
+    def tearDown(self):
+        CachedClient.cache = self.original_cache
+        clear_caches()
+
+    def get_games(self):
+        return {nba_id: (game_id, home_team, away_team, start_date)
+                for game_id, nba_id, home_team, away_team, start_date
+                in Game.objects.values_list('id', 'nba_id', 'home_team__name', 'away_team__name', 'start_date')}
+
+    def get_league_games(self):
+        return {game['nba_id']: (self.league.teams[game['home_team_index']][0].value, self.league.teams[game['away_team_index']][0].value, game['date'])
+                for game in self.games}
+
+    def test_the_schedule_is_fetched_once_and_inserted(self):
+        self.assertEqual(GameInserter.insert_games_for_season(season=self.season), (len(self.games), 0))
+        self.assertEqual(self.fake_nba_api.request_counts, {'games_for_season': 1})
+        self.assertEqual({nba_id: game[1:] for nba_id, game in self.get_games().items()}, self.get_league_games())
+
+    def test_unchanged_games_are_skipped(self):
+        GameInserter.insert_games_for_season(season=self.season)
+        games = self.get_games()
+        self.assertEqual(GameInserter.insert_games_for_season(season=self.season), (0, 0))
+        self.assertEqual(self.get_games(), games)
+
+    def test_only_new_and_changed_games_are_written(self):
+        GameInserter.insert_games_for_season(season=self.season)
+        game_ids = dict((nba_id, game[0]) for nba_id, game in self.get_games().items())
+
+        # A postponed game, a game whose home and away teams were swapped and a game added to the schedule
+        self.games[0]['date'] += timedelta(days=1)
+        self.games[1]['home_team_index'], self.games[1]['away_team_index'] = self.games[1]['away_team_index'], self.games[1]['home_team_index']
+        self.games.append(dict(self.games[2], nba_id='{0}{1:05d}'.format(self.games[2]['nba_id'][:5], len(self.games) + 1),
+                               date=self.games[-1]['date'] + timedelta(days=2)))
+
+        self.assertEqual(GameInserter.insert_games_for_season(season=self.season), (1, 2))
+        games = self.get_games()
+        self.assertEqual({nba_id: game[1:] for nba_id, game in games.items()}, self.get_league_games())
+        self.assertEqual(dict((nba_id, games[nba_id][0]) for nba_id in game_ids), game_ids)
+
+    def test_games_of_a_date_are_inserted_before_the_schedule(self):
+        game_date = self.games[0]['date']
+        date_game_count = len([game for game in self.games if game['date'] == game_date])
+        self.assertEqual(GameInserter.insert_games_for_date(game_date=game_date), (date_game_count, 0))
+        self.assertEqual(GameInserter.insert_games_for_date(game_date=game_date), (0, 0))
+        self.assertEqual(GameInserter.insert_games_for_season(season=self.season), (len(self.games) - date_game_count, 0))
\ No newline at end of file
@@ -0,0 +1,115 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from data.benchmarks.fixtures import use_synthetic_league, clear_caches
+from data.benchmarks.synthetic_league import SyntheticLeague
+from data.fetchers.cached_client import CachedClient
+from data.ingestion import IngestionStage, IngestionGraph, get_ingestion_stages
+from data.models import IngestionRun, IngestionCheckpoint, TraditionalBoxScore
+from data.objects.season import Season
+
+
+class StageFailure(Exception):
+    pass
+
+
+class IngestionGraphTest(TestCase):
+
+    seasons = [Season.season_2014, Season.season_2015]
+
+    def setUp(self):
+        self.calls = []
+        self.failing_unit = None
+
+    def run_units(self, units, checkpoint):
+        for unit in units:
+            if unit == self.failing_unit:
+                raise StageFailure(unit)
+
+            self.calls.append(('units', unit))
+            checkpoint([unit])
+
+    def get_graph(self):
+        return IngestionGraph(stages=[
+            IngestionStage(name='reference', run=lambda: self.calls.append(('reference', None))),
+            IngestionStage(name='units', run=self.run_units, get_units=lambda: ['a', 'b', 'c'], dependencies=('reference',)),
+        ])
+
+    def test_checkpointed_units_are_skipped_when_a_run_is_resumed(self):
+        run = IngestionGraph.get_run(seasons=IngestionGraphTest.seasons)
+        self.failing_unit = 'b'
+        with self.assertRaises(StageFailure):
+            self.get_graph().execute(run=run)
+
+        self.assertEqual(self.calls, [('reference', None), ('units', 'a')])
+        self.assertIsNone(IngestionRun.objects.get().finished_at)
+
+        self.calls = []
+        self.failing_unit = None
+        resumed_run = IngestionGraph.get_run(seasons=IngestionGraphTest.seasons)
+        self.assertEqual(resumed_run, run)
+        self.get_graph().execute(run=resumed_run)
+
+        # Single unit stages run on every execution, unit stages only get the units that were not checkpointed
+        self.assertEqual(self.calls, [('reference', None), ('units', 'b'), ('units', 'c')])
+        self.assertEqual(sorted(IngestionCheckpoint.objects.filter(run=run).values_list('unit', flat=True)), ['a', 'b', 'c'])
+        self.assertIsNotNone(IngestionRun.objects.get().finished_at)
+
+    def test_only_unfinished_runs_over_the_same_seasons_are_resumed(self):
+        run = IngestionGraph.get_run(seasons=IngestionGraphTest.seasons)
+        self.assertEqual(run.seasons, '2014-15..2015-16')
+        self.assertEqual(IngestionGraph.get_run(seasons=list(reversed(IngestionGraphTest.seasons))), run)
+
+        other_run = IngestionGraph.get_run(seasons=[Season.season_2015])
+        self.assertNotEqual(other_run, run)
+        self.assertEqual(IngestionGraph.get_run(seasons=IngestionGraphTest.seasons), run)
+        self.assertEqual(IngestionGraph.get_run(seasons=[Season.season_2015]), other_run)
+
+        self.assertNotEqual(IngestionGraph.get_run(seasons=IngestionGraphTest.seasons, restart=True), run)
+
+    def test_finished_and_old_runs_are_not_resumed(self):
+        run = IngestionGraph.get_run(seasons=IngestionGraphTest.seasons)
+        IngestionRun.objects.filter(id=run.id).update(started_at=timezone.now() - timedelta(days=1))
+        self.assertEqual(IngestionGraph.get_run(seasons=IngestionGraphTest.seasons), run)
+        old_run_replacement = IngestionGraph.get_run(seasons=IngestionGraphTest.seasons, max_age=IngestionGraph.resume_max_age)
+        self.assertNotEqual(old_run_replacement, run)
+
+        IngestionRun.objects.filter(id=old_run_replacement.id).update(finished_at=timezone.now())
+        self.assertNotIn(IngestionGraph.get_run(seasons=IngestionGraphTest.seasons).id, (run.id, old_run_replacement.id))
+
+    def test_dependency_cycles_and_unknown_dependencies_are_rejected(self):
+        with self.assertRaises(ValueError):
+            IngestionGraph(stages=[IngestionStage(name='units', run=self.run_units, dependencies=('missing',))])
+
+        with self.assertRaises(ValueError):
+            IngestionGraph(stages=[IngestionStage(name='first', run=lambda: None, dependencies=('second',)),
+                                   IngestionStage(name='second', run=lambda: None, dependencies=('first',))]).get_waves()
+
+
+class IngestionResumeTest(TestCase):
+
+    def setUp(self):
+        self.original_cache = CachedClient.cache
+        clear_caches()
+        self.league = SyntheticLeague(season_count=1, players_per_team=1, games_per_team=2)
+        self.fake_nba_api = use_synthetic_league(league=self.league)
+
+    def tearDown(self):
+        CachedClient.cache = self.original_cache
+        clear_caches()
+
+    def test_resumed_run_fetches_no_checkpointed_box_scores(self):
+        run = IngestionGraph.get_run(seasons=self.league.seasons)
+        stages = get_ingestion_stages(seasons=self.league.seasons, fetcher=None)
+        IngestionGraph(stages=stages).execute(run=run, finish=False)
+        game_count = len(self.league.games[self.league.seasons[0]])
+        self.assertEqual(self.fake_nba_api.request_counts['traditional_box_score'], game_count)
+        self.assertEqual(IngestionCheckpoint.objects.filter(run=run).count(), game_count)
+        box_score_count = TraditionalBoxScore.objects.count()
+
+        IngestionGraph(stages=stages).execute(run=IngestionGraph.get_run(seasons=self.league.seasons))
+        self.assertEqual(self.fake_nba_api.request_counts['traditional_box_score'], game_count)
+        self.assertEqual(TraditionalBoxScore.objects.count(), box_score_count)
+        self.assertIsNotNone(IngestionRun.objects.get(id=run.id).finished_at)
\ No newline at end of file
@@ -0,0 +1,125 @@
+from django.db import IntegrityError
+from django.test import TestCase
+
+from data.benchmarks.fixtures import use_synthetic_league, clear_caches, insert_reference_data, insert_players
+from data.benchmarks.synthetic_league import SyntheticLeague
+from data.fetchers.cached_client import CachedClient
+from data.fetchers.concurrent_fetcher import ConcurrentFetcher
+from data.inserters.box_score_inserter import BoxScoreInserter, BoxScoreLookup
+from data.inserters.live_box_score_poller import LiveBoxScorePoller, SNAPSHOT_FIELDS, LIVE, FINAL
+from data.models import Game, TraditionalBoxScore
+
+
+class LiveBoxScorePollerTest(TestCase):
+
+    options = {'LIVE_INTERVAL': 10, 'MAX_LIVE_INTERVAL': 40, 'SCHEDULED_INTERVAL': 60, 'FINAL_AFTER': 100, 'IDLE_INTERVAL': 300}
+
+    def setUp(self):
+        self.original_cache = CachedClient.cache
+        clear_caches()
+        self.league = SyntheticLeague(season_count=1, players_per_team=2, games_per_team=2)
+        self.fake_nba_api = use_synthetic_league(league=self.league)
+        insert_reference_data()
+        insert_players(league=self.league)
+        self.slate_date = self.league.get_game_days(season=self.league.seasons[0])[0]
+        self.game_count = len([game for game in self.league.games[self.league.seasons[0]] if game['date'] == self.slate_date])
+        # Every game has two players on each team
+        self.box_score_count = self.game_count * 4
+        self.poller = LiveBoxScorePoller(fetcher=ConcurrentFetcher(workers=1), slate_date=self.slate_date, options=LiveBoxScorePollerTest.options)
+
+    def tearDown(self):
+        CachedClient.cache = self.original_cache
+        clear_caches()
+
+    def get_stored_box_scores(self):
+        return {values[:2]: tuple(values[2:]) for values in TraditionalBoxScore.objects.values_list('player_id', 'game_id', *SNAPSHOT_FIELDS)}
+
+    def get_box_score_ids(self):
+        return {(player_id, game_id): box_score_id for box_score_id, player_id, game_id in TraditionalBoxScore.objects.values_list('id', 'player_id', 'game_id')}
+
+    def test_the_slate_is_loaded_from_the_scoreboard(self):
+        result = self.poller.poll(now=0)
+        self.assertTrue(self.poller.schedule_loaded)
+        self.assertEqual(Game.objects.filter(start_date=self.slate_date).count(), self.game_count)
+        self.assertEqual((result['games'], result['inserted'], result['updated']), (self.game_count, self.box_score_count, 0))
+        self.assertEqual(self.get_stored_box_scores(), self.poller.snapshots)
+
+    def test_unchanged_games_write_nothing_and_back_off_until_final(self):
+        self.poller.poll(now=0)
+        result = self.poller.poll(now=10)
+        self.assertEqual((result['games'], result['inserted'], result['updated']), (self.game_count, 0, 0))
+        self.assertEqual(set(game.interval for game in self.poller.games.values()), {20})
+        self.assertEqual(result['wait'], 20)
+
+        self.assertEqual(self.poller.poll(now=20)['games'], 0)
+        for now in (30, 70, 110):
+            self.poller.poll(now=now)
+
+        self.assertEqual(set(game.interval for game in self.poller.games.values()), {40})
+        self.assertEqual(set(game.state for game in self.poller.games.values()), {FINAL})
+        self.assertTrue(self.poller.is_slate_final())
+        self.assertEqual(self.poller.poll(now=150)['wait'], LiveBoxScorePollerTest.options['IDLE_INTERVAL'])
+
+    def test_only_changed_rows_are_updated(self):
+        self.poller.poll(now=0)
+        box_score_ids = self.get_box_score_ids()
+        stored_box_scores = self.get_stored_box_scores()
+
+        # Another seed gives every player other statistics, as the next minutes of the games would
+        self.league.seed = 1
+        result = self.poller.poll(now=10)
+        self.assertEqual(result['inserted'], 0)
+        self.assertEqual(result['updated'], len([key for key, snapshot in self.get_stored_box_scores().items() if snapshot != stored_box_scores[key]]))
+        self.assertGreater(result['updated'], 0)
+        self.assertEqual(self.get_stored_box_scores(), self.poller.snapshots)
+        self.assertEqual(self.get_box_score_ids(), box_score_ids)
+        self.assertEqual(set(game.state for game in self.poller.games.values()), {LIVE})
+
+    def test_failed_requests_are_retried_at_the_game_interval(self):
+        handler = self.fake_nba_api.handlers['traditional_box_score']
+
+        def fail(parameters):
+            raise ValueError(parameters['GameId'])
+
+        self.fake_nba_api.handlers['traditional_box_score'] = fail
+        result = self.poller.poll(now=0)
+        self.assertEqual((result['inserted'], result['wait']), (0, LiveBoxScorePollerTest.options['SCHEDULED_INTERVAL']))
+
+        self.fake_nba_api.handlers['traditional_box_score'] = handler
+        self.assertEqual(self.poller.poll(now=30)['games'], 0)
+        self.assertEqual(self.poller.poll(now=60)['inserted'], self.box_score_count)
+
+    def test_a_failed_scoreboard_is_loaded_again_on_the_next_poll(self):
+        handler = self.fake_nba_api.handlers['games_for_date']
+
+        def fail(parameters):
+            raise ValueError(parameters['GameDate'])
+
+        self.fake_nba_api.handlers['games_for_date'] = fail
+        result = self.poller.poll(now=0)
+        self.assertFalse(self.poller.schedule_loaded)
+        self.assertEqual(result['games'], 0)
+
+        self.fake_nba_api.handlers['games_for_date'] = handler
+        result = self.poller.poll(now=10)
+        self.assertTrue(self.poller.schedule_loaded)
+        self.assertEqual((result['games'], result['inserted']), (self.game_count, self.box_score_count))
+
+    def test_rows_written_elsewhere_are_read_again_after_a_database_error(self):
+        self.poller.load_slate(slate_date=self.slate_date)
+
+        # insert_data writes the box scores of one game after the poller read the stored ones
+        game = Game.objects.filter(start_date=self.slate_date).order_by('id').first()
+        BoxScoreInserter.insert_traditional_box_scores_for_games(games=[(game.nba_id, self.slate_date)], lookup=BoxScoreLookup())
+        with self.assertRaises(IntegrityError):
+            self.poller.poll(now=10)
+
+        self.assertFalse(TraditionalBoxScore.objects.exclude(game=game).exists())
+        self.assertIn(game.id, self.poller.stale_game_ids)
+        self.assertEqual(self.poller.games[game.id].next_poll_at, 10)
+
+        result = self.poller.poll(now=11)
+        self.assertEqual(self.poller.stale_game_ids, set())
+        self.assertEqual((result['inserted'], result['updated']), (self.box_score_count - 4, 0))
+        self.assertEqual(TraditionalBoxScore.objects.count(), self.box_score_count)
+        self.assertEqual(self.get_stored_box_scores(), self.poller.snapshots)
\ No newline at end of file
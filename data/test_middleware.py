@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.test import TestCase
+from django.test.utils import override_settings
+
+import data.metrics as metrics
+from data.models import Team
+
+
+@override_settings(API_RESPONSE_CACHE=dict(getattr(settings, 'API_RESPONSE_CACHE', {}), ENABLED=False),
+                   INSTRUMENTATION=dict(getattr(settings, 'INSTRUMENTATION', {}), ENABLED=True, SLOW_REQUEST_SECONDS=None))
+class InstrumentationMiddlewareTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Team.objects.create(name='Boston Celtics', abbreviation='BOS')
+
+    def setUp(self):
+        for histogram in metrics.histograms:
+            histogram.values.clear()
+
+    def get_count(self, histogram, view):
+        return sum(count for (view_name, method), (bucket_counts, count, total) in histogram.values.items() if view_name == view)
+
+    def test_serialization_and_rendering_are_recorded_apart(self):
+        self.assertEqual(self.client.get('/teams/').status_code, 200)
+        self.assertEqual(self.client.get('/teams/{0}/'.format(Team.objects.get().id)).status_code, 200)
+        for view in ('team-list', 'team-detail'):
+            for histogram in (metrics.request_duration, metrics.query_count, metrics.serialization_duration, metrics.render_duration):
+                self.assertEqual(self.get_count(histogram=histogram, view=view), 1, (histogram.name, view))
+
+    def test_views_without_a_serializer_record_no_serialization(self):
+        self.assertEqual(self.client.get('/box_scores/export/').status_code, 200)
+        self.assertEqual(self.get_count(histogram=metrics.request_duration, view='boxscore-export'), 1)
+        self.assertEqual(metrics.serialization_duration.values, {})
+
+    def test_metrics_list_the_serialization_histogram(self):
+        self.client.get('/teams/')
+        self.assertIn('nba_persistence_request_serialization_duration_seconds_count{view="team-list",method="GET"} 1', self.client.get('/metrics/').content.decode('utf-8'))
\ No newline at end of file
@@ -0,0 +1,51 @@
+from datetime import date
+
+from django.conf import settings
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from data.models import Team, Position, Season, Game, Player, TraditionalBoxScore
+
+
+@override_settings(API_RESPONSE_CACHE=dict(getattr(settings, 'API_RESPONSE_CACHE', {}), ENABLED=False))
+class KeysetPaginationTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        position = Position.objects.create(name='guard')
+        season = Season.objects.create(name='2015-16')
+        home_team = Team.objects.create(name='Boston Celtics', abbreviation='BOS')
+        away_team = Team.objects.create(name='New York Knicks', abbreviation='NYK')
+        games = [Game.objects.create(home_team=home_team, away_team=away_team, start_date=date(2015, 10, 27 + index), season=season,
+                                     nba_id='00215{0:05d}'.format(index))
+                 for index in range(2)]
+        for index in range(5):
+            player = Player.objects.create(name='Player {0}'.format(index), position=position, team=home_team, season=season,
+                                           jersey_number=index, nba_id=index)
+            for game in games:
+                # Players that did not play have no statistics at all, several rows share the same fantasy points
+                statistics = dict(field_goals=index % 3, assists=index % 2) if index % 2 == 0 else {}
+                TraditionalBoxScore.objects.create(player=player, game=game, **statistics)
+
+    def get_all_pages(self, path):
+        # The box scores are told apart by player and game date, the API does not return their ids
+        keys = []
+        while path is not None:
+            response = self.client.get(path)
+            self.assertEqual(response.status_code, 200)
+            keys += [(box_score['player']['name'], str(box_score['game']['start_date'])) for box_score in response.data['results']]
+            path = response.data['next']
+
+        return keys
+
+    def test_every_ordering_reaches_every_row(self):
+        box_score_keys = sorted((name, str(start_date)) for name, start_date in TraditionalBoxScore.objects.values_list('player__name', 'game__start_date'))
+        for ordering in ('game_date', 'draftkings_points', 'fanduel_points'):
+            keys = self.get_all_pages(path='/box_scores/?ordering={0}&page_size=3'.format(ordering))
+            self.assertEqual(len(keys), len(box_score_keys), ordering)
+            self.assertEqual(sorted(keys), box_score_keys, ordering)
+
+    def test_fantasy_points_ordering(self):
+        keys = self.get_all_pages(path='/box_scores/?ordering=draftkings_points&page_size=4')
+        self.assertEqual(keys, [(name, str(start_date)) for name, start_date in TraditionalBoxScore.objects.order_by('-draftkings_points', '-id')
+                                .values_list('player__name', 'game__start_date')])
\ No newline at end of file
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.test import SimpleTestCase
+
+from data.translators.player_names import PlayerNameIndex, normalize_player_name
+
+
+class PlayerNameIndexTest(SimpleTestCase):
+
+    # (id, name, team id, season id), team 1 and team 2 play in season 10, the first player also has a row in season 11
+    players = (
+        (1, 'Nenê', 1, 10),
+        (2, 'Larry Nance Jr.', 1, 10),
+        (3, 'Karl-Anthony Towns', 1, 10),
+        (4, 'Luc Mbah a Moute', 1, 10),
+        (5, 'Marcus Morris', 2, 10),
+        (6, 'Markieff Morris', 2, 10),
+        (7, 'Kelly Oubre', 2, 10),
+        (8, 'Nenê', 2, 11),
+    )
+    aliases = (
+        ('DraftKings', 'Luc Richard Mbah a Moute', 'Luc Mbah a Moute'),
+        ('', 'Kelly Oubre Jr.', 'Kelly Oubre'),
+        ('FanDuel', 'Nene Hilario', 'Nene'),
+    )
+
+    def setUp(self):
+        self.index = PlayerNameIndex(players=PlayerNameIndexTest.players, aliases=PlayerNameIndexTest.aliases)
+
+    def test_names_are_normalized(self):
+        self.assertEqual(normalize_player_name('Nenê'), 'nene')
+        self.assertEqual(normalize_player_name(b'Larry Nance Jr.'), 'larry nance')
+        self.assertEqual(normalize_player_name('Karl-Anthony  Towns'), 'karl anthony towns')
+        self.assertEqual(normalize_player_name('Jr.'), 'jr')
+
+    def test_exact_names_resolve_on_the_team_and_season(self):
+        self.assertEqual(self.index.resolve(name='Nene', team_id=1, season_id=10), (1, []))
+        self.assertEqual(self.index.resolve(name='NENE', team_id=2, season_id=11), (8, []))
+        self.assertEqual(self.index.resolve(name='Larry Nance', team_id=1, season_id=10), (2, []))
+        self.assertEqual(self.index.resolve(name='Karl Anthony Towns', team_id=1, season_id=10), (3, []))
+
+    def test_aliases_apply_to_their_source_or_to_every_source(self):
+        self.assertEqual(self.index.resolve(name='Luc Richard Mbah a Moute', team_id=1, season_id=10, source='DraftKings'), (4, []))
+        self.assertEqual(self.index.resolve(name='Kelly Oubre Jr.', team_id=2, season_id=10, source='FanDuel'), (7, []))
+        self.assertEqual(self.index.resolve(name='Nene Hilario', team_id=1, season_id=10, source='FanDuel'), (1, []))
+        self.assertEqual(self.index.resolve(name='Nene Hilario', team_id=1, season_id=10, source='DraftKings')[0], None)
+
+    def test_traded_players_resolve_by_name_within_the_season(self):
+        self.assertEqual(self.index.resolve(name='Karl-Anthony Towns', team_id=2, season_id=10), (3, []))
+        self.assertEqual(self.index.resolve(name='Karl-Anthony Towns', team_id=2, season_id=11)[0], None)
+
+    def test_misspelled_names_resolve_to_the_closest_roster_player(self):
+        self.assertEqual(self.index.resolve(name='Karl Anthony Town', team_id=1, season_id=10), (3, []))
+        self.assertEqual(self.index.resolve(name='Kelly Oubr', team_id=2, season_id=10), (7, []))
+        # Exactly at the minimum similarity of 0.5 to Marcus Morris, which is closer than Markieff Morris
+        self.assertEqual(self.index.resolve(name='Morris', team_id=2, season_id=10), (5, []))
+
+    def test_unmatched_names_return_the_closest_candidates(self):
+        player_id, candidates = self.index.resolve(name='M Morris', team_id=2, season_id=10)
+        self.assertIsNone(player_id)
+        self.assertEqual([candidate['player_id'] for candidate in candidates], [5, 6])
+        self.assertGreater(candidates[0]['similarity'], candidates[1]['similarity'])
+
+        self.assertEqual(self.index.resolve(name='Somebody Else', team_id=1, season_id=10), (None, []))
\ No newline at end of file
@@ -0,0 +1,37 @@
+from django.db.models import Count, F
+from django.test import TestCase
+
+from data.benchmarks.fixtures import use_synthetic_league, clear_caches, insert_league, insert_players
+from data.benchmarks.synthetic_league import SyntheticLeague
+from data.fetchers.cached_client import CachedClient
+from data.models import Player, TraditionalBoxScore
+
+
+class SeasonBackfillTest(TestCase):
+
+    def setUp(self):
+        self.original_cache = CachedClient.cache
+        clear_caches()
+        # Every player of the league returns for the second season with the same team, jersey number and NBA id
+        self.league = SyntheticLeague(season_count=2, players_per_team=2, games_per_team=2)
+        use_synthetic_league(league=self.league)
+
+    def tearDown(self):
+        CachedClient.cache = self.original_cache
+        clear_caches()
+
+    def test_returning_players_get_a_row_per_season(self):
+        insert_league(league=self.league)
+        player_count = len(self.league.players[self.league.seasons[0]])
+        self.assertEqual(Player.objects.count(), 2 * player_count)
+        self.assertEqual(set(Player.objects.values('nba_id').annotate(seasons=Count('season', distinct=True)).values_list('seasons', flat=True)), {2})
+
+        # Each game has a row for every player of both teams, which belongs to the player row of the game's season
+        self.assertEqual(TraditionalBoxScore.objects.count(), sum(len(games) for games in self.league.games.values()) * 2 * 2)
+        self.assertFalse(TraditionalBoxScore.objects.exclude(player__season=F('game__season')).exists())
+
+    def test_rerun_inserts_no_players(self):
+        insert_league(league=self.league)
+        player_count = Player.objects.count()
+        insert_players(league=self.league)
+        self.assertEqual(Player.objects.count(), player_count)
\ No newline at end of file
@@ -0,0 +1,165 @@
+import csv
+import shutil
+import tempfile
+from datetime import date
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+
+import data.validators.inserters as salary_inserters
+from data.benchmarks.fixtures import use_synthetic_league, clear_caches, insert_league
+from data.benchmarks.synthetic_league import SyntheticLeague
+from data.fetchers.cached_client import CachedClient
+from data.models import Team, Position, Season, Game, Player, PlayerSalary, DailyFantasySportsSite, LoadedSalaryFile
+from data.validators.inserters import write_salaries, insert_dfs_salaries
+
+
+class WriteSalariesTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        position = Position.objects.create(name='guard')
+        season = Season.objects.create(name='2015-16')
+        home_team = Team.objects.create(name='Boston Celtics', abbreviation='BOS')
+        away_team = Team.objects.create(name='New York Knicks', abbreviation='NYK')
+        DailyFantasySportsSite.objects.create(name='DraftKings')
+        Game.objects.create(home_team=home_team, away_team=away_team, start_date=date(2015, 10, 27), season=season, nba_id='0021500001')
+        for index in range(3):
+            Player.objects.create(name='Player {0}'.format(index), position=position, team=home_team, season=season, jersey_number=index, nba_id=index)
+
+    def setUp(self):
+        self.site_id = DailyFantasySportsSite.objects.get().id
+        self.game_id = Game.objects.get().id
+        self.player_ids = list(Player.objects.order_by('id').values_list('id', flat=True))
+
+    def get_salaries(self):
+        return dict(PlayerSalary.objects.values_list('player_id', 'salary'))
+
+    def test_new_salaries_are_created(self):
+        salaries = [(self.game_id, player_id, 3000 + index * 100) for index, player_id in enumerate(self.player_ids)]
+        self.assertEqual(write_salaries(site_id=self.site_id, salaries=salaries), 3)
+        self.assertEqual(self.get_salaries(), {player_id: salary for game_id, player_id, salary in salaries})
+
+    def test_reloading_the_same_salaries_writes_nothing(self):
+        salaries = [(self.game_id, player_id, 3000) for player_id in self.player_ids]
+        write_salaries(site_id=self.site_id, salaries=salaries)
+        salary_ids = sorted(PlayerSalary.objects.values_list('id', flat=True))
+        self.assertEqual(write_salaries(site_id=self.site_id, salaries=salaries), 0)
+        self.assertEqual(sorted(PlayerSalary.objects.values_list('id', flat=True)), salary_ids)
+
+    def test_changed_salaries_are_updated_in_place(self):
+        write_salaries(site_id=self.site_id, salaries=[(self.game_id, player_id, 3000) for player_id in self.player_ids])
+        salary_ids = dict(PlayerSalary.objects.values_list('player_id', 'id'))
+        # Two players change to the same salary, which one of them already had before the unique constraint left out the salary
+        self.assertEqual(write_salaries(site_id=self.site_id, salaries=[(self.game_id, self.player_ids[0], 3500), (self.game_id, self.player_ids[1], 3500),
+                                                                        (self.game_id, self.player_ids[2], 3000)]), 2)
+        self.assertEqual(self.get_salaries(), {self.player_ids[0]: 3500, self.player_ids[1]: 3500, self.player_ids[2]: 3000})
+        self.assertEqual(dict(PlayerSalary.objects.values_list('player_id', 'id')), salary_ids)
+
+    def test_the_last_salary_of_a_player_in_a_file_wins(self):
+        self.assertEqual(write_salaries(site_id=self.site_id, salaries=[(self.game_id, self.player_ids[0], 3000), (self.game_id, self.player_ids[0], 4000)]), 1)
+        self.assertEqual(self.get_salaries(), {self.player_ids[0]: 4000})
+
+
+class RemoveDuplicateSalariesTest(TransactionTestCase):
+
+    # Migrates back to before the salary was dropped from the unique constraint, where a player can have several salaries
+    # for a game on a site, and forward again
+    migrate_from = [('data', '0010_auto_20261017_2000')]
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        self.migrate_to = executor.loader.graph.leaf_nodes()
+        executor.migrate(self.migrate_from)
+        self.apps = executor.loader.project_state(self.migrate_from).apps
+
+    def tearDown(self):
+        MigrationExecutor(connection).migrate(self.migrate_to)
+
+    def test_the_latest_salary_of_each_player_is_kept(self):
+        Position = self.apps.get_model('data', 'Position')
+        Season = self.apps.get_model('data', 'Season')
+        Team = self.apps.get_model('data', 'Team')
+        Game = self.apps.get_model('data', 'Game')
+        Player = self.apps.get_model('data', 'Player')
+        Site = self.apps.get_model('data', 'DailyFantasySportsSite')
+        Salary = self.apps.get_model('data', 'PlayerSalary')
+
+        position = Position.objects.create(name='guard')
+        season = Season.objects.create(name='2015-16')
+        home_team = Team.objects.create(name='Boston Celtics', abbreviation='BOS')
+        away_team = Team.objects.create(name='New York Knicks', abbreviation='NYK')
+        game = Game.objects.create(home_team=home_team, away_team=away_team, start_date=date(2015, 10, 27), season=season, nba_id='0021500001')
+        sites = [Site.objects.create(name=name) for name in ('DraftKings', 'FanDuel')]
+        players = [Player.objects.create(name='Player {0}'.format(index), position=position, team=home_team, season=season, jersey_number=index,
+                                         nba_id=index)
+                   for index in range(2)]
+        for salary in (3000, 3500, 3200):
+            Salary.objects.create(site=sites[0], game=game, player=players[0], salary=salary)
+
+        Salary.objects.create(site=sites[1], game=game, player=players[0], salary=5000)
+        Salary.objects.create(site=sites[0], game=game, player=players[1], salary=4000)
+
+        MigrationExecutor(connection).migrate(self.migrate_to)
+        self.assertEqual(sorted(PlayerSalary.objects.values_list('site__name', 'player__name', 'salary')),
+                         [('DraftKings', 'Player 0', 3200), ('DraftKings', 'Player 1', 4000), ('FanDuel', 'Player 0', 5000)])
+
+
+class SalaryFileLoadingTest(TransactionTestCase):
+
+    # The worker pool forks, so the rows it reads must be committed
+    def setUp(self):
+        self.original_cache = CachedClient.cache
+        self.original_salary_directory = salary_inserters.SALARY_DIRECTORY
+        clear_caches()
+        self.league = SyntheticLeague(season_count=1, players_per_team=2, games_per_team=2)
+        use_synthetic_league(league=self.league)
+        insert_league(league=self.league)
+        salary_inserters.SALARY_DIRECTORY = tempfile.mkdtemp(prefix='nba_persistence_test_')
+        self.file_names = self.league.write_salary_files(directory=salary_inserters.SALARY_DIRECTORY, day_count=2)
+        days = self.league.get_game_days(season=self.league.seasons[0], day_count=2)
+        self.start_date, self.end_date = days[0], days[-1]
+
+    def tearDown(self):
+        shutil.rmtree(salary_inserters.SALARY_DIRECTORY, ignore_errors=True)
+        CachedClient.cache = self.original_cache
+        salary_inserters.SALARY_DIRECTORY = self.original_salary_directory
+        clear_caches()
+
+    def insert_salaries(self, workers=1, force=False):
+        return insert_dfs_salaries(start_date=self.start_date, end_date=self.end_date, workers=workers, force=force)
+
+    def get_salaries(self):
+        return sorted(PlayerSalary.objects.values_list('site__name', 'game__nba_id', 'player__nba_id', 'salary'))
+
+    def test_unchanged_files_are_skipped(self):
+        salary_count, file_count = self.insert_salaries()
+        self.assertEqual(file_count, len(self.file_names))
+        self.assertEqual(salary_count, PlayerSalary.objects.count())
+        self.assertEqual(LoadedSalaryFile.objects.count(), len(self.file_names))
+
+        self.assertEqual(self.insert_salaries(), (0, 0))
+        self.assertEqual(self.insert_salaries(force=True), (0, len(self.file_names)))
+
+    def test_changed_files_are_loaded_again(self):
+        self.insert_salaries()
+        with open(self.file_names[0], 'rb') as salary_file:
+            rows = list(csv.reader(salary_file))
+
+        rows[1][2] = str(int(rows[1][2]) + 100)
+        with open(self.file_names[0], 'wb') as salary_file:
+            csv.writer(salary_file).writerows(rows)
+
+        self.assertEqual(self.insert_salaries(), (1, 1))
+        self.assertEqual(PlayerSalary.objects.get(player__name=rows[1][1], site__name='DraftKings', game__start_date=self.start_date).salary, int(rows[1][2]))
+
+    def test_worker_pool_loads_the_same_salaries(self):
+        self.assertEqual(self.insert_salaries(workers=2)[1], len(self.file_names))
+        salaries = self.get_salaries()
+        self.assertNotEqual(salaries, [])
+
+        PlayerSalary.objects.all().delete()
+        LoadedSalaryFile.objects.all().delete()
+        self.insert_salaries()
+        self.assertEqual(self.get_salaries(), salaries)
\ No newline at end of file
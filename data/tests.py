@@ -0,0 +1,125 @@
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from data.models import Team, Position, Season, Game, Player, TraditionalBoxScore, DailyFantasySportsSite, PlayerSalary
+from data.reference_data import reference_data_caches, warm_reference_data
+
+
+# Every request is rendered by its view, a cached response would not run any query at all
+@override_settings(API_RESPONSE_CACHE=dict(getattr(settings, 'API_RESPONSE_CACHE', {}), ENABLED=False))
+class EndpointQueryCountTest(TestCase):
+
+    # (path, queries) of every list endpoint and its filters, the count must not grow with the number of rows or the page size.
+    # Page number lists count their rows before reading the page, keyset pages read one more row than they return and
+    # exports read chunks until one comes back short. The reference tables are read from the process cache
+    list_endpoints = (
+        ('/teams/', 2),
+        ('/teams/?abbreviation=bos', 2),
+        ('/positions/', 2),
+        ('/positions/?name=guard', 2),
+        ('/seasons/', 2),
+        ('/daily_fantasy_sports_sites/', 2),
+        ('/daily_fantasy_sports_sites/?name=DraftKings', 2),
+        ('/players/', 2),
+        ('/players/?name=Player+1&team_abbreviation=nyk&position_name=forward', 2),
+        ('/games/', 2),
+        ('/games/?home_team_abbreviation=bos&away_team_abbreviation=nyk&unix_start_time=1445904000&season_start_year=2015', 2),
+        ('/box_scores/', 1),
+        ('/box_scores/?ordering=draftkings_points', 1),
+        ('/box_scores/?name=Player+1&team_abbreviation=nyk&unix_start_time=1445904000&draftkings_points_min=0', 1),
+        ('/box_scores/export/?name=Player+1&team_abbreviation=nyk', 2),
+        ('/box_scores/export/?format=csv', 2),
+        ('/player_salaries/', 1),
+        ('/player_salaries/?site_name=DraftKings&salary_min=3000&unix_start_time=1445904000&position_name=guard', 1),
+    )
+    # Every detail endpoint reads its row in one query, whatever the row references
+    detail_models = (
+        ('teams', Team),
+        ('positions', Position),
+        ('seasons', Season),
+        ('daily_fantasy_sports_sites', DailyFantasySportsSite),
+        ('players', Player),
+        ('games', Game),
+        ('box_scores', TraditionalBoxScore),
+        ('player_salaries', PlayerSalary),
+    )
+    page_sizes = (1, 50)
+
+    @classmethod
+    def setUpTestData(cls):
+        Position.objects.create(name='guard')
+        Position.objects.create(name='forward')
+        Season.objects.create(name='2015-16')
+        Team.objects.create(name='Boston Celtics', abbreviation='BOS')
+        Team.objects.create(name='New York Knicks', abbreviation='NYK')
+        DailyFantasySportsSite.objects.create(name='DraftKings')
+        EndpointQueryCountTest.create_rows(player_count=6, game_count=3)
+
+    @staticmethod
+    def create_rows(player_count, game_count):
+        # Adds players and games, then a box score and a salary of every player in every game that does not have them yet
+        positions = list(Position.objects.order_by('id'))
+        season = Season.objects.get()
+        teams = list(Team.objects.order_by('id'))
+        site = DailyFantasySportsSite.objects.get()
+        first_player_index = Player.objects.count()
+        for index in range(first_player_index, first_player_index + player_count):
+            Player.objects.create(name='Player {0}'.format(index), position=positions[index % 2], team=teams[index % 2],
+                                  season=season, jersey_number=index, nba_id=index)
+
+        first_game_index = Game.objects.count()
+        for index in range(first_game_index, first_game_index + game_count):
+            Game.objects.create(home_team=teams[index % 2], away_team=teams[(index + 1) % 2], start_date=date(2015, 10, 27) + timedelta(days=index),
+                                season=season, nba_id='00215{0:05d}'.format(index))
+
+        existing_keys = set(TraditionalBoxScore.objects.values_list('player_id', 'game_id'))
+        for game in Game.objects.all():
+            for player in Player.objects.all():
+                if (player.id, game.id) in existing_keys:
+                    continue
+
+                TraditionalBoxScore.objects.create(player=player, game=game, seconds_played=60 * (player.id % 40), field_goals=player.id % 5,
+                                                   field_goal_attempts=5, points=2 * (player.id % 5))
+                PlayerSalary.objects.create(site=site, game=game, player=player, salary=3000 + 100 * player.id)
+
+    def setUp(self):
+        # The caches outlive the rolled back rows of other tests
+        for cache in reference_data_caches.values():
+            cache.clear()
+
+        warm_reference_data()
+
+    def assert_query_count(self, path, queries):
+        with self.assertNumQueries(queries):
+            response = self.client.get(path)
+            if response.streaming:
+                b''.join(response.streaming_content)
+
+        self.assertEqual(response.status_code, 200, path)
+
+    def assert_list_query_counts(self):
+        for path, queries in EndpointQueryCountTest.list_endpoints:
+            self.assert_query_count(path=path, queries=queries)
+
+    def assert_detail_query_counts(self):
+        for name, model in EndpointQueryCountTest.detail_models:
+            for instance_id in model.objects.order_by('id').values_list('id', flat=True)[:2]:
+                self.assert_query_count(path='/{0}/{1}/'.format(name, instance_id), queries=1)
+
+    def test_list_endpoints(self):
+        self.assert_list_query_counts()
+        EndpointQueryCountTest.create_rows(player_count=24, game_count=12)
+        self.assert_list_query_counts()
+
+    def test_list_endpoint_page_sizes(self):
+        for page_size in EndpointQueryCountTest.page_sizes:
+            for path, queries in EndpointQueryCountTest.list_endpoints:
+                self.assert_query_count(path='{0}{1}page_size={2}'.format(path, '&' if '?' in path else '?', page_size), queries=queries)
+
+    def test_detail_endpoints(self):
+        self.assert_detail_query_counts()
+        EndpointQueryCountTest.create_rows(player_count=24, game_count=12)
+        self.assert_detail_query_counts()
\ No newline at end of file
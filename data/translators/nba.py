@@ -6,13 +6,7 @@
 # import data.translators.util as util_translators
 # from data.models import Position, Team, Season, Game, Player
 
-from nba_data.client import Client
-from nba_data.data.season import Season
-
-def test():
-    print Client.get_players_for_season(season=Season.season_2015)
-
-test()
+from data.translators.team_abbreviations import team_abbreviations, BASKETBALL_REFERENCE_SOURCE
 
 
 def translate_position(position):
@@ -29,7 +23,7 @@ def translate_position(position):
 def translate_players(season_start_year):
     filtered_players = []
     for player in return_all_player_season_statistics(season_start_year=season_start_year):
-        team = Team.objects.get(abbreviation=player.team)
+        team = team_abbreviations.get_team(source=BASKETBALL_REFERENCE_SOURCE, abbreviation=player.team)
         position = Position.objects.get(abbreviation=translate_position(player.position))
         filtered_players.append({
             'position': position,
@@ -47,8 +41,8 @@ def translate_box_score(box_score):
     day_end_utc = util_translators.translate_day_end_from_est_to_utc(year=box_score.date.year,
                                                                      month=box_score.date.month,
                                                                      day=box_score.date.day)
-    team = Team.objects.get(abbreviation=box_score.team)
-    opponent = Team.objects.get(abbreviation=box_score.opponent)
+    team = team_abbreviations.get_team(source=BASKETBALL_REFERENCE_SOURCE, abbreviation=box_score.team)
+    opponent = team_abbreviations.get_team(source=BASKETBALL_REFERENCE_SOURCE, abbreviation=box_score.opponent)
     player = Player.objects.filter(first_name=box_score.first_name).filter(last_name=box_score.last_name).get(team=team)
     game = Game.objects.filter((Q(home_team=team) & Q(away_team=opponent)) | (Q(home_team=opponent) & Q(away_team=team)))\
                        .filter(start_time__gte=day_start_utc)\
@@ -0,0 +1,83 @@
+import re
+import unicodedata
+
+NAME_SUFFIXES = ('jr', 'sr', 'ii', 'iii', 'iv', 'v')
+
+FUZZY_MATCH_MINIMUM_SIMILARITY = 0.5
+FUZZY_MATCH_CANDIDATE_COUNT = 3
+
+
+def normalize_player_name(name):
+    if isinstance(name, bytes):
+        name = name.decode('utf-8', 'ignore')
+
+    name = ''.join(character for character in unicodedata.normalize('NFKD', name) if not unicodedata.combining(character))
+    tokens = re.sub(r"[^a-z0-9 ]", '', re.sub(r"[-_]", ' ', name.lower())).split()
+    while len(tokens) > 1 and tokens[-1] in NAME_SUFFIXES:
+        tokens.pop()
+
+    return ' '.join(tokens)
+
+
+def get_trigrams(normalized_name):
+    padded_name = '  {0} '.format(normalized_name)
+    return frozenset(padded_name[index:index + 3] for index in range(len(padded_name) - 2))
+
+
+def get_similarity(trigrams, other_trigrams):
+    if not trigrams or not other_trigrams:
+        return 0.0
+
+    return float(len(trigrams & other_trigrams)) / len(trigrams | other_trigrams)
+
+
+class PlayerNameIndex:
+
+    def __init__(self, players, aliases=()):
+        # players are (id, name, team id, season id) rows and aliases are (source, alias, name) rows
+        self.player_ids = {}
+        self.season_player_ids = {}
+        self.rosters = {}
+        for player_id, name, team_id, season_id in players:
+            normalized_name = normalize_player_name(name)
+            self.player_ids[(season_id, normalized_name, team_id)] = player_id
+            self.season_player_ids.setdefault((season_id, normalized_name), set()).add(player_id)
+            self.rosters.setdefault((season_id, team_id), []).append((player_id, name, get_trigrams(normalized_name)))
+
+        self.aliases = {}
+        for source, alias, name in aliases:
+            self.aliases[(source, normalize_player_name(alias))] = normalize_player_name(name)
+
+    def get_alias(self, source, normalized_name):
+        return self.aliases.get((source, normalized_name), self.aliases.get(('', normalized_name)))
+
+    def resolve(self, name, team_id, season_id, source=''):
+        # Returns (player id, candidates), the candidates are only filled in when no player could be matched
+        normalized_name = normalize_player_name(name)
+        normalized_names = [normalized_name]
+        alias = self.get_alias(source=source, normalized_name=normalized_name)
+        if alias is not None:
+            normalized_names.insert(0, alias)
+
+        for candidate_name in normalized_names:
+            player_id = self.player_ids.get((season_id, candidate_name, team_id))
+            if player_id is not None:
+                return player_id, []
+
+        # Players traded after the salaries were published are listed under their old team
+        for candidate_name in normalized_names:
+            player_ids = self.season_player_ids.get((season_id, candidate_name), ())
+            if len(player_ids) == 1:
+                return next(iter(player_ids)), []
+
+        # The fuzzy match only compares against the team's roster for that season, so it is bounded by the roster size
+        trigrams = get_trigrams(normalized_names[0])
+        candidates = sorted(((get_similarity(trigrams, roster_trigrams), player_id, roster_name)
+                             for player_id, roster_name, roster_trigrams in self.rosters.get((season_id, team_id), ())
+                             if not roster_trigrams.isdisjoint(trigrams)),
+                            reverse=True)[:FUZZY_MATCH_CANDIDATE_COUNT]
+        if candidates and candidates[0][0] >= FUZZY_MATCH_MINIMUM_SIMILARITY and (len(candidates) == 1 or candidates[1][0] < candidates[0][0]):
+            return candidates[0][1], []
+
+        return None, [{'player_id': player_id, 'name': roster_name, 'similarity': round(similarity, 3)}
+                      for similarity, player_id, roster_name in candidates]
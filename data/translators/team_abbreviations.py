@@ -0,0 +1,39 @@
+from data.models import Team, TeamAbbreviation
+
+NBA_SOURCE = 'nba'
+BASKETBALL_REFERENCE_SOURCE = 'basketball_reference'
+
+
+class TeamAbbreviationCache:
+
+    # Loaded on first use and cleared by the Team and TeamAbbreviation save and delete signals,
+    # the team ids and teams are swapped in together so that a concurrent clear never leaves one without the other
+    def __init__(self):
+        self.entries = None
+
+    def load(self):
+        teams = {team.id: team for team in Team.objects.all()}
+        team_ids = {(source, abbreviation.upper()): team_id
+                    for source, abbreviation, team_id in TeamAbbreviation.objects.values_list('source', 'abbreviation', 'team_id')}
+        self.entries = (team_ids, teams)
+        return self.entries
+
+    def clear(self):
+        self.entries = None
+
+    def get_entries(self):
+        entries = self.entries
+        if entries is None:
+            entries = self.load()
+
+        return entries
+
+    def get_team_id(self, source, abbreviation):
+        return self.get_entries()[0].get((source, abbreviation.upper()))
+
+    def get_team(self, source, abbreviation):
+        team_ids, teams = self.get_entries()
+        return teams.get(team_ids.get((source, abbreviation.upper())))
+
+
+team_abbreviations = TeamAbbreviationCache()
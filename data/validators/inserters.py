@@ -1,105 +1,264 @@
 import csv
+import hashlib
+import json
 import os
 from datetime import datetime, timedelta
+from multiprocessing import Pool
 
-import data.validators.util as util_validators
-from django.core.exceptions import ObjectDoesNotExist
-from pytz import timezone, utc
-
-from data.models import Game, Player, DailyFantasySportsSite, PlayerSalary
-from data.translators.utils import draftkings_salary_team_abbreviation_converter, fanduel_salary_team_abbreviation_converter, draftkings_player_name_converter, fanduel_player_name_converter
-
-
-def insert_games(games):
-    for game in games:
-        if not util_validators.is_valid_game(game=game):
-            raise ValueError('invalid game')
-        else:
-            Game.objects.update_or_create(home_team=game['home_team'],
-                                          away_team=game['away_team'],
-                                          start_time=game['start_time'],
-                                          season=game['season'])
-
-
-def insert_players(players):
-    for player in players:
-        if not util_validators.is_valid_player(player=player):
-            raise ValueError('player is missing team, position, first name, or last name')
-        else:
-            Player.objects.update_or_create(name=player['first_name'] + player['last_name'],
-                                            team=player['team'],
-                                            position=player['position'])
-
-
-def insert_draftkings_salaries(day):
-    draftkings_file_name = os.path.join(os.path.dirname(__file__), "static/salaries/draftkings/{0}.csv".format(day.strftime("%Y-%m-%d")))
-    draftkings_log_file_name = os.path.join(os.path.dirname(__file__), "static/salaries/draftkings.log")
-    if os.path.isfile(draftkings_file_name):
-        log_file = open(draftkings_log_file_name, "a+")
-        with open(draftkings_file_name) as file:
-            reader = csv.reader(file)
-            salaries = list(reader)[1:]
-            site = DailyFantasySportsSite.objects.get(name="DraftKings")
-            for salary in salaries:
-                names_list = salary[1].split(" ")
-                first_name = names_list[0]
-                last_name = names_list[1]
-                converted_names = draftkings_player_name_converter(first_name, last_name)
-                first_name = converted_names['first_name']
-                last_name = converted_names['last_name']
-                game_info_list = salary[3].split(" ")
-                team_abbreviation_list = game_info_list[0].split("@")
-                away_team_abbreviation = draftkings_salary_team_abbreviation_converter(team_abbreviation_list[0])
-                home_team_abbreviation = draftkings_salary_team_abbreviation_converter(team_abbreviation_list[1])
-                start_time = game_info_list[1]
-                utc_start_time = timezone("US/Eastern").localize(datetime.strptime("{0}-{1}-{2}-{3}".format(day.year, day.month, day.day, start_time), "%Y-%m-%d-%I:%M%p")).astimezone(utc)
-                player_team_abbreviation = draftkings_salary_team_abbreviation_converter(salary[5].upper())
-                try:
-                    player = Player.objects.get(first_name=first_name, last_name=last_name, team__abbreviation=player_team_abbreviation)
-                    game = Game.objects.get(home_team__abbreviation=home_team_abbreviation, away_team__abbreviation=away_team_abbreviation, start_time=utc_start_time)
-                    salary_value = salary[2]
-                    PlayerSalary.objects.update_or_create(site=site, player=player, game=game, salary=salary_value)
-                except ObjectDoesNotExist:
-                    log_message = "{0} - {1} - {2} - {3}\n".format(first_name, last_name, player_team_abbreviation, utc_start_time)
-                    log_file.write(log_message)
-        log_file.close()
-
-
-def insert_fanduel_salaries(day):
-    fanduel_file_name = os.path.join(os.path.dirname(__file__), "static/salaries/fanduel/{0}.csv".format(day.strftime("%Y-%m-%d")))
-    fanduel_log_file_name = os.path.join(os.path.dirname(__file__), "static/salaries/fanduel.log")
-    if os.path.isfile(fanduel_file_name):
-        log_file = open(fanduel_log_file_name, "a+")
-        with open(fanduel_file_name) as file:
-            reader = csv.reader(file)
-            salaries = list(reader)[1:]
-            site = DailyFantasySportsSite.objects.get(name="FanDuel")
-            for salary in salaries:
-                first_name = salary[2]
-                last_name = salary[3]
-                converted_names = fanduel_player_name_converter(first_name, last_name)
-                first_name = converted_names['first_name']
-                last_name = converted_names['last_name']
-                game_info_list = salary[7].split("@")
-                away_team_abbreviation = fanduel_salary_team_abbreviation_converter(game_info_list[0])
-                home_team_abbreviation = fanduel_salary_team_abbreviation_converter(game_info_list[1])
-                player_team_abbreviation = fanduel_salary_team_abbreviation_converter(salary[8].upper())
-                day_start_est = timezone('US/Eastern').localize(datetime(year=day.year, month=day.month, day=day.day, hour=0, minute=0, second=0, microsecond=0))
-                day_end_est = day_start_est + timedelta(hours=24)
-                try:
-                    player = Player.objects.get(first_name=first_name, last_name=last_name, team__abbreviation=player_team_abbreviation)
-                    game = Game.objects.get(home_team__abbreviation=home_team_abbreviation, away_team__abbreviation=away_team_abbreviation, start_time__gte=day_start_est, start_time__lte=day_end_est)
-                    salary_value = salary[6]
-                    PlayerSalary.objects.update_or_create(site=site, player=player, game=game, salary=salary_value)
-                except ObjectDoesNotExist:
-                    log_message = "{0} - {1} - {2} - {3} - {4}\n".format(first_name, last_name, player_team_abbreviation, day_start_est, day_end_est)
-                    log_file.write(log_message)
-        log_file.close()
-
-
-def insert_dfs_salaries(start_date, end_date):
+from django.db import transaction, connections
+
+from data.inserters.utils import get_bulk_batch_size
+from data.models import Game, Player, PlayerSalary, LoadedSalaryFile, PlayerNameAlias, UnmatchedSalary
+from data.reference_data import daily_fantasy_sports_sites
+from data.translators.player_names import PlayerNameIndex
+from data.translators.team_abbreviations import team_abbreviations
+
+
+SALARY_BATCH_SIZE = 1000
+SALARY_DIRECTORY = os.path.join(os.path.dirname(__file__), 'static/salaries')
+
+
+class SalaryLookup:
+
+    def __init__(self):
+        self.games = {(home_team_id, away_team_id, start_date): (game_id, season_id)
+                      for game_id, home_team_id, away_team_id, start_date, season_id
+                      in Game.objects.values_list('id', 'home_team_id', 'away_team_id', 'start_date', 'season_id')}
+        self.player_names = PlayerNameIndex(players=Player.objects.order_by('id').values_list('id', 'name', 'team_id', 'season_id'),
+                                            aliases=PlayerNameAlias.objects.values_list('source', 'alias', 'name'))
+        self.site_ids = {site.name: site.id for site in daily_fantasy_sports_sites.all()}
+        # Loaded here so that forked salary file workers inherit it instead of querying the database
+        team_abbreviations.get_entries()
+
+    def get_game(self, site_name, home_team_abbreviation, away_team_abbreviation, day):
+        return self.games.get((team_abbreviations.get_team_id(source=site_name, abbreviation=home_team_abbreviation),
+                               team_abbreviations.get_team_id(source=site_name, abbreviation=away_team_abbreviation),
+                               day))
+
+    def get_player_id(self, site_name, season_id, name, team_abbreviation):
+        # Returns (player id, candidates) where the candidates are the closest players when there is no match
+        return self.player_names.resolve(name=name, team_id=team_abbreviations.get_team_id(source=site_name, abbreviation=team_abbreviation), season_id=season_id, source=site_name)
+
+    def get_site_id(self, site_name):
+        return self.site_ids[site_name]
+
+
+def read_draftkings_salary(salary):
+    # Name, salary, "AWY@HOM 07:30PM ET" and the player's team are columns 1, 2, 3 and 5
+    team_abbreviation_list = salary[3].split(' ')[0].split('@')
+    return {
+        'name': salary[1].strip(),
+        'salary': int(salary[2]),
+        'away_team_abbreviation': team_abbreviation_list[0],
+        'home_team_abbreviation': team_abbreviation_list[1],
+        'player_team_abbreviation': salary[5],
+    }
+
+
+def read_fanduel_salary(salary):
+    # First name, last name, salary, "AWY@HOM" and the player's team are columns 2, 3, 6, 7 and 8
+    team_abbreviation_list = salary[7].split('@')
+    return {
+        'name': '{0} {1}'.format(salary[2].strip(), salary[3].strip()),
+        'salary': int(salary[6]),
+        'away_team_abbreviation': team_abbreviation_list[0],
+        'home_team_abbreviation': team_abbreviation_list[1],
+        'player_team_abbreviation': salary[8],
+    }
+
+
+SALARY_SOURCES = {
+    'DraftKings': ('draftkings', read_draftkings_salary),
+    'FanDuel': ('fanduel', read_fanduel_salary),
+}
+
+
+def get_salary_file_name(site_name, day):
+    return os.path.join(SALARY_DIRECTORY, SALARY_SOURCES[site_name][0], '{0}.csv'.format(day.strftime('%Y-%m-%d')))
+
+
+def read_salaries(site_name, day, file_name, lookup, unmatched):
+    # Streams the file and yields (game id, player id, salary), rows that cannot be resolved are added to unmatched
+    read_salary = SALARY_SOURCES[site_name][1]
+    with open(file_name) as salary_file:
+        reader = csv.reader(salary_file)
+        next(reader, None)
+        for row in reader:
+            if not row:
+                continue
+
+            salary = read_salary(row)
+            game = lookup.get_game(site_name=site_name,
+                                   home_team_abbreviation=salary['home_team_abbreviation'],
+                                   away_team_abbreviation=salary['away_team_abbreviation'],
+                                   day=day)
+            player_id = None
+            candidates = []
+            if game is not None:
+                player_id, candidates = lookup.get_player_id(site_name=site_name, season_id=game[1], name=salary['name'],
+                                                             team_abbreviation=salary['player_team_abbreviation'])
+
+            if player_id is None:
+                unmatched.append({
+                    'day': day,
+                    'name': salary['name'],
+                    'team_abbreviation': salary['player_team_abbreviation'],
+                    'home_team_abbreviation': salary['home_team_abbreviation'],
+                    'away_team_abbreviation': salary['away_team_abbreviation'],
+                    'salary': salary['salary'],
+                    'candidates': json.dumps(candidates),
+                })
+                continue
+
+            yield game[0], player_id, salary['salary']
+
+
+def write_salaries(site_id, salaries):
+    # Upserts on (site, game, player), which is unique: new salaries are bulk created and changed ones are updated one query per salary value
+    salaries = {(game_id, player_id): salary for game_id, player_id, salary in salaries}
+    if not salaries:
+        return 0
+
+    game_ids = set(game_id for game_id, player_id in salaries.keys())
+    existing = {(game_id, player_id): (salary_id, salary)
+                for salary_id, game_id, player_id, salary
+                in PlayerSalary.objects.filter(site_id=site_id, game_id__in=game_ids).values_list('id', 'game_id', 'player_id', 'salary')}
+
+    new_salaries = []
+    changed_salary_ids = {}
+    for key, salary in salaries.items():
+        if key not in existing:
+            new_salaries.append(PlayerSalary(site_id=site_id, game_id=key[0], player_id=key[1], salary=salary))
+        elif existing[key][1] != salary:
+            changed_salary_ids.setdefault(salary, []).append(existing[key][0])
+
+    with transaction.atomic():
+        PlayerSalary.objects.bulk_create(new_salaries, batch_size=get_bulk_batch_size(model=PlayerSalary, objs=new_salaries, batch_size=SALARY_BATCH_SIZE))
+        for salary, salary_ids in changed_salary_ids.items():
+            PlayerSalary.objects.filter(id__in=salary_ids).update(salary=salary)
+
+    return len(new_salaries) + sum(len(salary_ids) for salary_ids in changed_salary_ids.values())
+
+
+def insert_salaries(site_name, day, lookup=None):
+    file_name = get_salary_file_name(site_name=site_name, day=day)
+    if not os.path.isfile(file_name):
+        return 0
+
+    if lookup is None:
+        lookup = SalaryLookup()
+
+    # Games are stored by start date, so the time and timezone of the day are not needed to find them
+    if isinstance(day, datetime):
+        day = day.date()
+
+    unmatched = []
+    salaries = list(read_salaries(site_name=site_name, day=day, file_name=file_name, lookup=lookup, unmatched=unmatched))
+    site_id = lookup.get_site_id(site_name)
+    with transaction.atomic():
+        salary_count = write_salaries(site_id=site_id, salaries=salaries)
+        write_unmatched_salaries(site_id=site_id, day=day, unmatched=unmatched)
+
+    return salary_count
+
+
+def write_unmatched_salaries(site_id, day, unmatched):
+    # Replaces the unmatched rows of an earlier load of the same file
+    UnmatchedSalary.objects.filter(site_id=site_id, day=day).delete()
+    unmatched_salaries = [UnmatchedSalary(site_id=site_id, **unmatched_salary) for unmatched_salary in unmatched]
+    UnmatchedSalary.objects.bulk_create(unmatched_salaries,
+                                        batch_size=get_bulk_batch_size(model=UnmatchedSalary, objs=unmatched_salaries, batch_size=SALARY_BATCH_SIZE))
+
+
+def insert_draftkings_salaries(day, lookup=None):
+    return insert_salaries(site_name='DraftKings', day=day, lookup=lookup)
+
+
+def insert_fanduel_salaries(day, lookup=None):
+    return insert_salaries(site_name='FanDuel', day=day, lookup=lookup)
+
+
+def get_file_checksum(file_name):
+    checksum = hashlib.sha256()
+    with open(file_name, 'rb') as checked_file:
+        for block in iter(lambda: checked_file.read(1024 * 1024), b''):
+            checksum.update(block)
+
+    return checksum.hexdigest()
+
+
+def get_salary_file_tasks(start_date, end_date, lookup, force=False):
+    # A file is only loaded again when its checksum differs from the one recorded the last time it was loaded
+    loaded_checksums = {(site_id, day): checksum
+                        for site_id, day, checksum
+                        in LoadedSalaryFile.objects.filter(day__gte=start_date, day__lte=end_date).values_list('site_id', 'day', 'checksum')}
+    tasks = []
     day = start_date
     while day <= end_date:
-        insert_draftkings_salaries(day)
-        insert_fanduel_salaries(day)
-        day = day + timedelta(days=1)
\ No newline at end of file
+        for site_name in sorted(SALARY_SOURCES.keys()):
+            file_name = get_salary_file_name(site_name=site_name, day=day)
+            if not os.path.isfile(file_name):
+                continue
+
+            checksum = get_file_checksum(file_name=file_name)
+            if force or loaded_checksums.get((lookup.get_site_id(site_name), day)) != checksum:
+                tasks.append((site_name, day, file_name, checksum))
+
+        day = day + timedelta(days=1)
+
+    return tasks
+
+
+# Set in every worker process by the pool initializer so that the lookup is only sent to each worker once
+salary_file_lookup = None
+
+
+def set_salary_file_lookup(lookup):
+    global salary_file_lookup
+    salary_file_lookup = lookup
+
+
+def load_salary_file(task):
+    # Runs in the worker processes and never touches the database, the parsed salaries are written by the parent
+    site_name, day, file_name, checksum = task
+    unmatched = []
+    salaries = list(read_salaries(site_name=site_name, day=day, file_name=file_name, lookup=salary_file_lookup, unmatched=unmatched))
+    return site_name, day, checksum, salaries, unmatched
+
+
+def write_salary_file(lookup, site_name, day, checksum, salaries, unmatched):
+    site_id = lookup.get_site_id(site_name)
+    with transaction.atomic():
+        salary_count = write_salaries(site_id=site_id, salaries=salaries)
+        write_unmatched_salaries(site_id=site_id, day=day, unmatched=unmatched)
+        LoadedSalaryFile.objects.update_or_create(site_id=site_id, day=day, defaults={'checksum': checksum})
+
+    return salary_count
+
+
+def insert_dfs_salaries(start_date, end_date, workers=1, force=False):
+    if isinstance(start_date, datetime):
+        start_date = start_date.date()
+
+    if isinstance(end_date, datetime):
+        end_date = end_date.date()
+
+    lookup = SalaryLookup()
+    tasks = get_salary_file_tasks(start_date=start_date, end_date=end_date, lookup=lookup, force=force)
+    if workers <= 1 or len(tasks) <= 1:
+        set_salary_file_lookup(lookup)
+        results = (load_salary_file(task) for task in tasks)
+        return sum(write_salary_file(lookup, *result) for result in results), len(tasks)
+
+    # Forked workers must not inherit the parent's open database connections
+    connections.close_all()
+    pool = Pool(processes=workers, initializer=set_salary_file_lookup, initargs=(lookup,))
+    try:
+        salary_count = 0
+        for result in pool.imap_unordered(load_salary_file, tasks):
+            salary_count += write_salary_file(lookup, *result)
+    finally:
+        pool.close()
+        pool.join()
+
+    return salary_count, len(tasks)
@@ -1,132 +1,131 @@
+import time
 from datetime import datetime
 
+from django.conf import settings
+from django.http import StreamingHttpResponse, HttpResponseBadRequest, HttpResponse, Http404
 from pytz import utc
 from rest_framework.viewsets import ReadOnlyModelViewSet
 
+from data.exporters.box_score_exporter import BoxScoreExporter
+from data.filters import filter_box_scores
+from data.metrics import render_metrics
 from data.models import Team, Position, Season, Game, Player, TraditionalBoxScore, PlayerSalary, DailyFantasySportsSite
+from data.pagination import GameStartDatePagination, BoxScorePagination
 from data.serializers import TeamSerializer, PositionSerializer, SeasonSerializer, GameSerializer, PlayerSerializer, BoxScoreSerializer, PlayerSalarySerializer, DailyFantasySportsSiteSerializer
 
 
 # Create your views here.
 
 
-class TeamViewSet(ReadOnlyModelViewSet):
+class SerializationTimingMixin(object):
+
+    # Reads the serializer's data as soon as it is built so that InstrumentationMiddleware can record the time spent
+    # serializing apart from rendering, the views read the same cached data right after
+    def get_serializer(self, *args, **kwargs):
+        serializer = super(SerializationTimingMixin, self).get_serializer(*args, **kwargs)
+        instrumentation = getattr(self.request, 'instrumentation', None)
+        if instrumentation is not None and serializer.instance is not None:
+            start = time.time()
+            serializer.data
+            instrumentation['serialization_duration'] = (instrumentation['serialization_duration'] or 0) + time.time() - start
+
+        return serializer
+
+
+class TeamViewSet(SerializationTimingMixin, ReadOnlyModelViewSet):
     serializer_class = TeamSerializer
 
     def get_queryset(self):
         queryset = Team.objects.all().order_by('name')
         abbreviation = self.request.query_params.get('abbreviation', None)
         if abbreviation is not None:
-            queryset = queryset.filter(abbreviation=abbreviation)
+            queryset = queryset.filter(abbreviation=abbreviation.upper())
 
         return queryset
 
 
-class PositionViewSet(ReadOnlyModelViewSet):
+class PositionViewSet(SerializationTimingMixin, ReadOnlyModelViewSet):
     serializer_class = PositionSerializer
 
     def get_queryset(self):
         queryset = Position.objects.all().order_by('name')
-        abbreviation = self.request.query_params.get('abbreviation', None)
-        if abbreviation is not None:
-            queryset = queryset.filter(abbreviation=abbreviation)
+        name = self.request.query_params.get('name', None)
+        if name is not None:
+            queryset = queryset.filter(name=name)
         return queryset
 
 
-class SeasonViewSet(ReadOnlyModelViewSet):
-    queryset = Season.objects.all().order_by('-start_year')
+class SeasonViewSet(SerializationTimingMixin, ReadOnlyModelViewSet):
+    queryset = Season.objects.all().order_by('-name')
     serializer_class = SeasonSerializer
 
 
-class GameViewSet(ReadOnlyModelViewSet):
+class GameViewSet(SerializationTimingMixin, ReadOnlyModelViewSet):
     serializer_class = GameSerializer
 
     def get_queryset(self):
-        queryset = Game.objects.all().order_by('start_time')
+        queryset = Game.objects.order_by('start_date', 'id')
         home_team_abbreviation = self.request.query_params.get('home_team_abbreviation', None)
         away_team_abbreviation = self.request.query_params.get('away_team_abbreviation', None)
         unix_start_time = self.request.query_params.get('unix_start_time', None)
         unix_end_time = self.request.query_params.get('unix_end_time', None)
         season_start_year = self.request.query_params.get('season_start_year', None)
         if home_team_abbreviation is not None:
-            queryset = queryset.filter(home_team__abbreviation=home_team_abbreviation)
+            queryset = queryset.filter(home_team__abbreviation=home_team_abbreviation.upper())
 
         if away_team_abbreviation is not None:
-            queryset = queryset.filter(away_team__abbreviation=away_team_abbreviation)
+            queryset = queryset.filter(away_team__abbreviation=away_team_abbreviation.upper())
 
         if unix_start_time is not None:
-            queryset = queryset.filter(start_time__gte=datetime.fromtimestamp(float(unix_start_time), utc))
+            queryset = queryset.filter(start_date__gte=datetime.fromtimestamp(float(unix_start_time), utc).date())
 
         if unix_end_time is not None:
-            queryset = queryset.filter(start_time__lte=datetime.fromtimestamp(float(unix_end_time), utc))
+            queryset = queryset.filter(start_date__lte=datetime.fromtimestamp(float(unix_end_time), utc).date())
 
         if season_start_year is not None:
-            queryset = queryset.filter(season__start_year=season_start_year)
+            queryset = queryset.filter(season__name__startswith='{0}-'.format(season_start_year))
 
         return queryset
 
 
-class PlayerViewSet(ReadOnlyModelViewSet):
+class PlayerViewSet(SerializationTimingMixin, ReadOnlyModelViewSet):
     serializer_class = PlayerSerializer
 
     def get_queryset(self):
-        queryset = Player.objects.all().order_by('first_name').order_by('last_name')
-        first_name = self.request.query_params.get('first_name', None)
-        last_name = self.request.query_params.get('last_name', None)
+        queryset = Player.objects.order_by('name', 'id')
+        name = self.request.query_params.get('name', None)
         team_abbreviation = self.request.query_params.get('team_abbreviation', None)
-        position_abbreviation = self.request.query_params.get('position_abbreviation', None)
-        if first_name is not None:
-            queryset = queryset.filter(first_name=first_name)
-
-        if last_name is not None:
-            queryset = queryset.filter(last_name=last_name)
+        position_name = self.request.query_params.get('position_name', None)
+        if name is not None:
+            queryset = queryset.filter(name=name)
 
         if team_abbreviation is not None:
-            queryset = queryset.filter(team__abbreviation=team_abbreviation)
+            queryset = queryset.filter(team__abbreviation=team_abbreviation.upper())
 
-        if position_abbreviation is not None:
-            queryset = queryset.filter(position__abbreviation=position_abbreviation)
+        if position_name is not None:
+            queryset = queryset.filter(position__name=position_name)
 
         return queryset
 
 
-class BoxScoreViewSet(ReadOnlyModelViewSet):
+class BoxScoreViewSet(SerializationTimingMixin, ReadOnlyModelViewSet):
     serializer_class = BoxScoreSerializer
+    pagination_class = BoxScorePagination
 
     def get_queryset(self):
-        queryset = TraditionalBoxScore.objects.all().order_by('player__last_name').order_by('player__first_name').order_by('-game__start_time')
-        first_name = self.request.query_params.get('first_name', None)
-        last_name = self.request.query_params.get('last_name', None)
-        team_abbreviation = self.request.query_params.get('team_abbreviation', None)
-        unix_start_time = self.request.query_params.get('unix_start_time', None)
-        unix_end_time = self.request.query_params.get('unix_end_time', None)
-
-        if first_name is not None:
-            queryset = queryset.filter(player__first_name=first_name)
+        queryset = TraditionalBoxScore.objects.select_related('player', 'game').order_by('-game__start_date', '-game_id', '-id')
+        return filter_box_scores(queryset=queryset, query_params=self.request.query_params)
 
-        if last_name is not None:
-            queryset = queryset.filter(player__last_name=last_name)
 
-        if team_abbreviation is not None:
-            queryset = queryset.filter(team__abbreviation=team_abbreviation)
-
-        if unix_start_time is not None:
-            queryset = queryset.filter(game__start_time__gte=datetime.fromtimestamp(float(unix_start_time), utc))
-
-        if unix_end_time is not None:
-            queryset = queryset.filter(game__start_time__lte=datetime.fromtimestamp(float(unix_end_time), utc))
-
-        return queryset
-
-
-class PlayerSalaryViewSet(ReadOnlyModelViewSet):
+class PlayerSalaryViewSet(SerializationTimingMixin, ReadOnlyModelViewSet):
     serializer_class = PlayerSalarySerializer
+    pagination_class = GameStartDatePagination
 
     def get_queryset(self):
-        queryset = PlayerSalary.objects.all().order_by('site__name').order_by('-salary').order_by('-game__start_time')
+        queryset = PlayerSalary.objects.select_related('player', 'game').order_by('-game__start_date', '-game_id', '-id')
         salary_min = self.request.query_params.get('salary_min', None)
         salary_max = self.request.query_params.get('salary_max', None)
-        position_abbreviation = self.request.query_params.get('position_abbreviation', None)
+        position_name = self.request.query_params.get('position_name', None)
         site_name = self.request.query_params.get('site_name', None)
         unix_start_time = self.request.query_params.get('unix_start_time', None)
         unix_end_time = self.request.query_params.get('unix_end_time', None)
@@ -137,22 +136,22 @@ class PlayerSalaryViewSet(ReadOnlyModelViewSet):
         if salary_max is not None:
             queryset = queryset.filter(salary__lte=salary_max)
 
-        if position_abbreviation is not None:
-            queryset = queryset.filter(player__position__abbreviation=position_abbreviation)
+        if position_name is not None:
+            queryset = queryset.filter(player__position__name=position_name)
 
         if site_name is not None:
             queryset = queryset.filter(site__name=site_name)
 
         if unix_start_time is not None:
-            queryset = queryset.filter(game__start_time__gte=datetime.fromtimestamp(float(unix_start_time), utc))
+            queryset = queryset.filter(game__start_date__gte=datetime.fromtimestamp(float(unix_start_time), utc).date())
 
         if unix_end_time is not None:
-            queryset = queryset.filter(game__start_time__lte=datetime.fromtimestamp(float(unix_end_time), utc))
+            queryset = queryset.filter(game__start_date__lte=datetime.fromtimestamp(float(unix_end_time), utc).date())
 
         return queryset
 
 
-class DailyFantasySportsSiteViewSet(ReadOnlyModelViewSet):
+class DailyFantasySportsSiteViewSet(SerializationTimingMixin, ReadOnlyModelViewSet):
     serializer_class = DailyFantasySportsSiteSerializer
 
     def get_queryset(self):
@@ -162,4 +161,22 @@ class DailyFantasySportsSiteViewSet(ReadOnlyModelViewSet):
         if name is not None:
             queryset = queryset.filter(name=name)
 
-        return queryset
\ No newline at end of file
+        return queryset
+
+
+def export_box_scores(request):
+    export_format = request.GET.get('format', 'ndjson')
+    if export_format not in BoxScoreExporter.content_types:
+        return HttpResponseBadRequest('Unknown export format: {0}'.format(export_format))
+
+    response = StreamingHttpResponse(BoxScoreExporter.export(export_format=export_format, query_params=request.GET),
+                                     content_type=BoxScoreExporter.content_types[export_format])
+    response['Content-Disposition'] = 'attachment; filename="box_scores.{0}"'.format(export_format)
+    return response
+
+
+def metrics(request):
+    if not getattr(settings, 'INSTRUMENTATION', {}).get('ENABLED', False):
+        raise Http404('Instrumentation is disabled')
+
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4')
@@ -64,7 +64,54 @@ REST_FRAMEWORK = {
     )
 }
 
+# Responses from the NBA stats API are cached on disk, timeouts are in seconds and None caches forever
+NBA_DATA_CACHE = {
+    'DIRECTORY': os.path.join(os.path.dirname(BASE_DIR), '.nba_data_cache'),
+    'MAX_SIZE': 1024 * 1024 * 1024,
+    'REPLAY_ONLY': False,
+    'TIMEOUTS': {
+        'players_for_season': 60 * 60 * 24,
+        'player_info': 60 * 60 * 24 * 7,
+        'games_for_season': 60 * 60 * 6,
+        'games_for_date': 60 * 60,
+        'traditional_box_score': 60 * 60,
+    },
+}
+
+# Live box scores are polled for the games of a date from its window start until the next day's window end, in TIME_ZONE.
+# Intervals are in seconds, a live game that stops changing backs off to MAX_LIVE_INTERVAL and is final after FINAL_AFTER
+LIVE_BOX_SCORES = {
+    'TIME_ZONE': 'US/Eastern',
+    'WINDOW_START_HOUR': 12,
+    'WINDOW_END_HOUR': 3,
+    'SCHEDULED_INTERVAL': 60 * 2,
+    'LIVE_INTERVAL': 10,
+    'MAX_LIVE_INTERVAL': 60,
+    'FINAL_AFTER': 60 * 30,
+    'IDLE_INTERVAL': 60 * 5,
+}
+
+# Rendered API responses are cached per data version, which the ingestion commands bump after writing. Every cached request
+# still reads the data version, so only enable it with CACHE_ALIAS pointing at a cache shared by the web processes, such as
+# memcached. The default local memory cache holds a separate copy of every response in each process
+API_RESPONSE_CACHE = {
+    'ENABLED': False,
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': 60 * 60 * 24,
+    'PATH_PREFIXES': ('/players/', '/teams/', '/positions/', '/seasons/', '/games/', '/box_scores/',
+                      '/daily_fantasy_sports_sites/', '/player_salaries/'),
+}
+
+# Per view latency, query, serialization and render histograms served at /metrics/, slow requests are logged with their SQL
+INSTRUMENTATION = {
+    'ENABLED': False,
+    'SLOW_REQUEST_SECONDS': 1.0,
+    'EXCLUDED_PATHS': ('/metrics/', '/static/', '/admin/'),
+}
+
 MIDDLEWARE_CLASSES = [
+    'data.middleware.InstrumentationMiddleware',
+    'data.middleware.ResponseCacheMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -19,7 +19,7 @@ from django.contrib import admin
 from rest_framework import routers
 
 import settings
-from data.views import TeamViewSet, PositionViewSet, SeasonViewSet, GameViewSet, BoxScoreViewSet, PlayerViewSet, DailyFantasySportsSiteViewSet, PlayerSalaryViewSet
+from data.views import TeamViewSet, PositionViewSet, SeasonViewSet, GameViewSet, BoxScoreViewSet, PlayerViewSet, DailyFantasySportsSiteViewSet, PlayerSalaryViewSet, export_box_scores, metrics
 
 team_list = TeamViewSet.as_view({
     'get': 'list'
@@ -99,10 +99,12 @@ urlpatterns = [
     url(r'^games/(?P<pk>[0-9]+)/$', game_detail, name='game-detail'),
     url(r'^box_scores/$', box_score_list, name='boxscore-list'),
     url(r'^box_scores/(?P<pk>[0-9]+)/$', box_score_detail, name='boxscore-detail'),
+    url(r'^box_scores/export/$', export_box_scores, name='boxscore-export'),
     url(r'^daily_fantasy_sports_sites/$', daily_fantasy_sports_site_list, name='dailyfantasysportssite-list'),
     url(r'^daily_fantasy_sports_sites/(?P<pk>[0-9]+)/$', daily_fantasy_sports_site_detail, name='dailyfantasysportssite-detail'),
     url(r'^player_salaries/$', player_salary_list, name='player_salary-list'),
     url(r'^player_salaries/(?P<pk>[0-9]+)/$', player_salary_detail, name='player_salary-detail'),
+    url(r'^metrics/$', metrics, name='metrics'),
     url(r'^admin/', admin.site.urls),
     url(r'^', include(router.urls)),
     url(r'^static/(?P<path>.*)$', 'django.views.static.serve', {'document_root': settings.STATIC_ROOT}),
@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "nba_persistence.settings")
 
 application = get_wsgi_application()
+
+from data.reference_data import warm_reference_data
+
+warm_reference_data()